@@ -0,0 +1,373 @@
+# Benchmarks for the FlashLet data layer, card selection, export and full page runs
+# How to run:
+#   python benchmark.py                                  all sizes (1k, 10k, 100k, 1M terms), both stores
+#   python benchmark.py --sizes 1000,10000 --storage files --repeat 3
+#   python benchmark.py --out bench.jsonl                append the results to a history file
+#   python benchmark.py --baseline bench.jsonl           exit 1 if a median got slower than --tolerance
+#
+# Every (storage, size) pair runs in its own process on a synthetic list written to a temp
+# directory, with a copy of streamlit_app.py next to it. Results are JSON lines on stdout:
+#   {"name": "load_table", "variant": "warm", "storage": "files", "size": 10000,
+#    "median": 0.0123, "min": 0.0119, "runs": 5, "unit": "s", "commit": "...", ...}
+# The `memory` benchmark is in MB (unit "MB"): what a fresh DataManager keeps once a list has
+# been studied, and the peak while getting there. --baseline checks it like the timings.
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+HERE = Path(__file__).parent
+APP = HERE / "streamlit_app.py"
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+STORAGES = ["files", "sqlite"]
+PAGES = ["Accueil", "Réviser", "Parcourir", "Éditer"]
+STEM = "Bench"
+SYLLABLES = ["ba", "co", "di", "fu", "ga", "li", "mo", "ne", "pa", "ri", "so", "ta", "vu", "zé", "ch", "ou"]
+
+
+# -----------------------------
+# Synthetic lists
+# -----------------------------
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def generate(base: Path, size: int, seed: int = 0):
+    """Liste/Bench.txt with `size` terms, a definition for each, progress for 60% of them"""
+    rng = random.Random(seed)
+    now = int(time.time())
+    for d in ("Liste", "Definitions", "Save", "Logo"):
+        (base / d).mkdir(parents=True, exist_ok=True)
+    terms = [f"{_word(rng)} {i}" for i in range(size)]
+    with open(base / "Liste" / f"{STEM}.txt", "w", encoding="utf-8") as f:
+        f.write("# Liste: Bench\n\n")
+        f.writelines(t + "\n" for t in terms)
+    definitions = {t: " ".join(_word(rng) for _ in range(rng.randint(2, 6))) for t in terms}
+    with open(base / "Definitions" / f"{STEM}_definitions.json", "w", encoding="utf-8") as f:
+        json.dump({"list_path": str(base / "Liste" / f"{STEM}.txt"), "definitions": definitions}, f, ensure_ascii=False)
+    scores = {}
+    for t in rng.sample(terms, int(size * 0.6)):
+        entry = {"score": rng.randint(0, 5), "is_difficult": rng.random() < 0.1}
+        if rng.random() < 0.5:
+            entry.update(due=now + rng.randint(-5, 30) * 86400, interval=float(rng.randint(1, 30)), ease=2.5, reps=rng.randint(1, 5))
+        scores[t] = entry
+    with open(base / "Save" / f"{STEM}_progress.json", "w", encoding="utf-8") as f:
+        json.dump({"list_path": str(base / "Liste" / f"{STEM}.txt"), "scores": scores}, f, ensure_ascii=False)
+    return terms
+
+
+def load_app(base: Path):
+    """Import a copy of the app living in `base`, so its default DataManager works on the synthetic list"""
+    shutil.copy2(APP, base / "streamlit_app.py")
+    for folder in ("Logo", "components"):
+        if (HERE / folder).is_dir():
+            shutil.copytree(HERE / folder, base / folder, dirs_exist_ok=True)
+    # importing runs the script once outside of a server: silence the bare-mode warnings
+    logging.disable(logging.WARNING)
+    spec = importlib.util.spec_from_file_location("streamlit_app", base / "streamlit_app.py")
+    app = importlib.util.module_from_spec(spec)
+    sys.modules["streamlit_app"] = app
+    spec.loader.exec_module(app)
+    return app
+
+
+# -----------------------------
+# Timing
+# -----------------------------
+def measure(fn, repeat: int, setup=None, inner: int = 1) -> list:
+    """Seconds per call of `fn`, `repeat` samples of `inner` calls; `setup` runs untimed before each sample"""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(inner):
+            fn()
+        times.append((time.perf_counter() - start) / inner)
+    return times
+
+
+def measure_memory(fn) -> tuple:
+    """(retained, peak) MB allocated by `fn`, with its result still alive"""
+    tracemalloc.start()
+    try:
+        kept = fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current / 2**20, peak / 2**20
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True, timeout=10)
+        return out.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+class Recorder:
+    def __init__(self, storage: str, size: int, only=None):
+        self.storage = storage
+        self.size = size
+        self.only = only
+        self.context = {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "time": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def wanted(self, name: str) -> bool:
+        return not self.only or name in self.only
+
+    def emit(self, name: str, variant: str, times: list, **extra):
+        record = {
+            "name": name, "variant": variant, "storage": self.storage, "size": self.size,
+            "median": statistics.median(times), "min": min(times), "runs": len(times), "unit": "s",
+            **extra, **self.context,
+        }
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+
+
+# -----------------------------
+# One (storage, size) pair
+# -----------------------------
+def run_worker(storage: str, size: int, repeat: int, only=None, pages: bool = True):
+    rec = Recorder(storage, size, only)
+    base = Path(tempfile.mkdtemp(prefix="flashlet-bench-"))
+    try:
+        start = time.perf_counter()
+        terms = generate(base, size)
+        rec.emit("generate", "", [time.perf_counter() - start])
+        os.environ["FLASHLET_STORAGE"] = storage
+        os.environ["FLASHLET_DB"] = str(base / "flashlet.db")
+        os.chdir(base)
+        start = time.perf_counter()
+        app = load_app(base)
+        # first import in a fresh process: module imports plus one bare run of the script
+        rec.emit("import", "", [time.perf_counter() - start])
+        _bench_data_layer(app, rec, base, terms, repeat)
+        if pages and rec.wanted("page"):
+            _bench_pages(rec, base, repeat)
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def _fresh_manager(app, base: Path, storage: str):
+    """What a newly started server sees: empty caches, no watcher left running"""
+    dm = app.DataManager(base, storage)
+    if dm.watcher is not None:
+        dm.watcher.stop()
+    return dm
+
+
+def _study_once(dm, list_path: Path):
+    """What the first study of a list loads and keeps: its stats, card table and definitions"""
+    dm.calculate_progress(list_path)
+    cards = dm.cards(list_path)
+    dm.get_definitions(list_path, cards.terms[:cards.listed])
+    return dm
+
+
+def _bench_data_layer(app, rec: Recorder, base: Path, terms: list, repeat: int):
+    storage = rec.storage
+    list_path = base / "Liste" / f"{STEM}.txt"
+    dm = app.DataManager(base, storage)
+    app.DM = dm
+    rng = random.Random(1)
+
+    if rec.wanted("memory"):
+        retained, peak = measure_memory(lambda: _study_once(_fresh_manager(app, base, storage), list_path))
+        rec.emit("memory", "retained", [retained], unit="MB")
+        rec.emit("memory", "peak", [peak], unit="MB")
+
+    if rec.wanted("load_table"):
+        rec.emit("load_table", "cold", measure(lambda: _fresh_manager(app, base, storage).load_table(list_path), repeat))
+        dm.load_table(list_path)
+        rec.emit("load_table", "warm", measure(lambda: dm.load_table(list_path), repeat))
+
+    if rec.wanted("calculate_progress"):
+        rec.emit("calculate_progress", "cold", measure(lambda: _fresh_manager(app, base, storage).calculate_progress(list_path), repeat))
+        dm.calculate_progress(list_path)
+        rec.emit("calculate_progress", "warm", measure(lambda: dm.calculate_progress(list_path), repeat))
+
+    if rec.wanted("preload"):
+        rec.emit("preload", "", measure(lambda: _fresh_manager(app, base, storage).preload(), repeat))
+
+    if rec.wanted("pick_next_term"):
+        cards = dm.cards(list_path)
+        rec.emit("pick_next_term", "rebuild", measure(lambda: app.pick_next_term(cards), repeat))
+        sampler = app.WeightedSampler(cards.terms[:cards.listed], app.card_weights(cards))
+        rec.emit("pick_next_term", "sampler", measure(lambda: app.pick_next_term(cards, sampler=sampler), repeat, inner=1000))
+
+    if rec.wanted("next_card"):
+        app.st.session_state.clear()
+        rec.emit("next_card", "first", measure(lambda: app.next_card(list_path), 1))
+        rec.emit("next_card", "steady", measure(lambda: app.next_card(list_path), repeat, inner=200))
+
+    if rec.wanted("update_progress"):
+        def grade():
+            term = rng.choice(terms)
+            info = app.schedule_review(dm.get_term_progress(list_path, term), app.QUALITY_KNOWN)
+            dm.update_progress(list_path, term, info)
+        rec.emit("update_progress", "", measure(grade, repeat, inner=100))
+
+        def grade_batch():
+            changes = {}
+            for term in rng.sample(terms, app.STUDY_BATCH):
+                changes[term] = app.schedule_review(dm.get_term_progress(list_path, term), app.QUALITY_KNOWN)
+            dm.update_progress_many(list_path, changes)
+        rec.emit("update_progress", f"batch of {app.STUDY_BATCH}", measure(grade_batch, repeat, inner=10))
+
+    if rec.wanted("search"):
+        df = dm.load_table(list_path)
+        query = terms[len(terms) // 2].split()[0][:4]
+        rec.emit("search", "build", measure(lambda: app.SearchIndex(df["Terme"].tolist(), df["Définition"].tolist()), repeat))
+        index = app.get_search_index(list_path, df)
+        rec.emit("search", "contains", measure(lambda: index.search(query), repeat, inner=10))
+        rec.emit("search", "fuzzy", measure(lambda: index.fuzzy(query + "x"), repeat, inner=10))
+
+    if rec.wanted("save_table"):
+        rows = dm.load_table(list_path)
+
+        def edit_one():
+            rows.iat[rng.randrange(len(rows)), rows.columns.get_loc("Définition")] = _word(rng)
+
+        rec.emit("save_table", "edit_one", measure(lambda: dm.save_table(list_path, rows), repeat, setup=edit_one))
+
+        def append_one():
+            rows.loc[len(rows)] = [f"{_word(rng)} n{len(rows)}", _word(rng), 0, False]
+
+        rec.emit("save_table", "append_one", measure(lambda: dm.save_table(list_path, rows), repeat, setup=append_one))
+
+    if rec.wanted("export"):
+        for fmt in app.EXPORT_FORMATS:
+            rec.emit("export", fmt, measure(lambda: app.export_file(list_path, fmt), repeat))
+
+    if dm.watcher is not None:
+        dm.watcher.stop()
+
+
+def _bench_pages(rec: Recorder, base: Path, repeat: int):
+    """Full headless script runs: `cold` is a new session, `warm` its next rerun"""
+    from streamlit.testing.v1 import AppTest
+
+    for page in PAGES:
+        cold, warm, error = [], [], None
+        for _ in range(repeat):
+            at = AppTest.from_file(str(base / "streamlit_app.py"), default_timeout=900)
+            at.session_state["nav_page"] = page
+            at.session_state["current_list"] = STEM
+            for times in (cold, warm):
+                start = time.perf_counter()
+                at.run()
+                times.append(time.perf_counter() - start)
+            if at.exception:
+                error = str(at.exception[0].message)
+                break
+        extra = {"error": error} if error else {}
+        rec.emit("page", f"{page}/cold", cold, **extra)
+        rec.emit("page", f"{page}/warm", warm, **extra)
+
+
+# -----------------------------
+# Driver
+# -----------------------------
+def _key(record: dict):
+    return record["name"], record["variant"], record["storage"], record["size"]
+
+
+def load_medians(path: Path) -> dict:
+    """Latest median per benchmark in a results file"""
+    medians = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                medians[_key(record)] = record["median"]
+            except (ValueError, KeyError):
+                continue
+    return medians
+
+
+def compare(records: list, previous: dict, tolerance: float) -> list:
+    """(key, ratio) for every median more than `tolerance` times its baseline"""
+    slower = []
+    for record in records:
+        old = previous.get(_key(record))
+        # sub-millisecond timings are mostly noise; generate is the harness itself
+        if old and record["name"] != "generate" and record["median"] > 1e-3 and record["median"] / old > tolerance:
+            slower.append((_key(record), record["median"] / old))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the FlashLet data layer and pages on synthetic lists")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="comma separated term counts")
+    parser.add_argument("--storage", default=",".join(STORAGES), help="files, sqlite or both")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per measurement")
+    parser.add_argument("--only", default="", help="comma separated benchmark names (load_table, page, ...)")
+    parser.add_argument("--no-pages", action="store_true", help="skip the headless page runs")
+    parser.add_argument("--out", type=Path, help="append the JSON lines to this file")
+    parser.add_argument("--baseline", type=Path, help="earlier results to compare medians against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="slowdown ratio that counts as a regression")
+    parser.add_argument("--worker", nargs=2, metavar=("STORAGE", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    only = {name for name in args.only.split(",") if name}
+
+    if args.worker:
+        run_worker(args.worker[0], int(args.worker[1]), args.repeat, only, not args.no_pages)
+        return 0
+
+    # read before running: --baseline and --out may be the same history file
+    previous = load_medians(args.baseline) if args.baseline else None
+    records = []
+    out = open(args.out, "a", encoding="utf-8") if args.out else None
+    try:
+        for storage in args.storage.split(","):
+            for size in map(int, args.sizes.split(",")):
+                cmd = [sys.executable, str(Path(__file__).resolve()), "--worker", storage, str(size),
+                       "--repeat", str(args.repeat), "--only", args.only]
+                if args.no_pages:
+                    cmd.append("--no-pages")
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True, encoding="utf-8")
+                for line in proc.stdout:
+                    if not line.startswith("{"):
+                        continue  # stray output of the app itself
+                    sys.stdout.write(line)
+                    sys.stdout.flush()
+                    if out:
+                        out.write(line)
+                        out.flush()
+                    records.append(json.loads(line))
+                if proc.wait():
+                    print(f"benchmark worker {storage}/{size} failed with exit code {proc.returncode}", file=sys.stderr)
+                    return proc.returncode
+    finally:
+        if out:
+            out.close()
+
+    if previous is not None:
+        slower = compare(records, previous, args.tolerance)
+        for (name, variant, storage, size), ratio in slower:
+            print(f"slower: {name} {variant} {storage} {size} x{ratio:.2f}", file=sys.stderr)
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
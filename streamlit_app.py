@@ -4,186 +4,2192 @@
 #        source /Users/diegoclaes/Code/FlashLet/flashlet_py_v3_2/.venv/bin/activate
 #   2) pip install -U streamlit pandas
 #   3) streamlit run /Users/diegoclaes/Code/FlashLet/GPT/WEB/streamlit_app.py
+#
+# Options (environment variables):
+#   FLASHLET_STORAGE=sqlite   store everything in one SQLite file instead of Liste/Save/Definitions
+#                             (existing lists are copied over on first start)
+#   FLASHLET_DB=/path/to.db   SQLite file, defaults to flashlet.db next to this script
+#   FLASHLET_JOURNAL_MAX=200  graded cards kept in Save/*_progress.journal before it is
+#                             folded back into the *_progress.json snapshot
+#   FLASHLET_DURABILITY=group every save is a temp file + atomic rename; "fsync" also syncs
+#                             each write to disk, "group" syncs the temp file and batches the
+#                             rest (renames, journal appends), "none" never syncs
+#   FLASHLET_GROUP_COMMIT_MS=200  batch window for FLASHLET_DURABILITY=group
+#   FLASHLET_WRITE_BEHIND_MS=300  grades are saved by a background thread this long after the click
+#                             (also on page change and shutdown); 0 saves them before answering
+#   FLASHLET_CACHE_MB=256     memory for list terms, definitions and search indexes shared by all
+#                             sessions; least recently used lists are dropped first
+#   FLASHLET_WATCH=auto       watch Liste/, Save/ and Definitions/ for outside edits (watchdog when
+#                             installed, else polling) instead of checking every file on each read;
+#                             "poll" forces polling, "off" goes back to a stat per read
+#   FLASHLET_PRELOAD=1        load every list, each user's progress and the search indexes on a thread
+#                             pool in the background, started by the first run of the server process;
+#                             pages load what they need themselves until it is done
+#                             (with server.scriptHealthCheckEnabled, /_stcore/script-health-check starts it)
+#   FLASHLET_PRELOAD_WORKERS=8  threads for FLASHLET_PRELOAD
+#   FLASHLET_THEME=static     the theme is components/theme/theme.css, linked once per browser session;
+#                             "inline" sends it minified in a <style> block on every rerun instead
+#   FLASHLET_PROFILE=1        time DataManager calls, page sections and file I/O of every rerun;
+#                             shown in a sidebar panel and appended to FLASHLET_PROFILE_LOG
+#                             (profile.jsonl next to this script)
+
+from __future__ import annotations
 
 import streamlit as st
 import streamlit.components.v1 as components
 from pathlib import Path
 import json
+import logging
 import random
 from datetime import datetime
-import pandas as pd
 import math
 import html as html_lib
-import base64
-import mimetypes
 import re
-from string import Template
+import os
+import threading
+import sqlite3
+import atexit
+import shutil
+import heapq
+import time
+import functools
+import itertools
+import csv
+import io
+import bisect
+import unicodedata
+import copy
+import contextlib
+import cProfile
+import marshal
+import hashlib
+import importlib
+import concurrent.futures
+import pstats
+from collections import OrderedDict
+
+
+class _LazyModule:
+    """Imports the module on first attribute access; attributes are then kept on the proxy"""
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr):
+        value = getattr(importlib.import_module(self._name), attr)
+        setattr(self, attr, value)
+        return value
+
+
+_log = logging.getLogger(__name__)
+
+# pandas only serves Parcourir, Éditer and the exports, numpy the card tables and the search:
+# keep both off the startup path
+pd = _LazyModule("pandas")
+np = _LazyModule("numpy")
+try:
+    import fcntl
+except ImportError:  # Windows: locks only cover the threads of one server
+    fcntl = None
+try:
+    from watchdog.observers import Observer
+except ImportError:  # optional: _FsWatcher falls back to polling
+    Observer = None
 
 # -----------------------------
-# Data layer (unchanged)
+# Data layer
 # -----------------------------
-class DataManager:
+class _FileCache:
+    """Parsed file contents keyed on (path, mtime, size).
+
+    Once `watched`, stamps are kept in memory until a watcher reports the file (see forget),
+    so a cache hit costs no system call.
+    """
+
     def __init__(self):
-        base_dir = Path(__file__).parent
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._stamps = {}
+        self._generation = 0
+        self._local = threading.local()
+        self.watched = False
+
+    @staticmethod
+    def _stat(path: Path):
+        try:
+            info = os.stat(path)
+        except OSError:
+            return None
+        return (info.st_mtime_ns, info.st_size)
+
+    def stamp(self, path: Path):
+        if not self.watched:
+            return self._stat(path)
+        key = str(path)
+        with self._lock:
+            generation = self._generation
+            if not getattr(self._local, "fresh", 0) and key in self._stamps:
+                return self._stamps[key]
+        stamp = self._stat(path)
+        with self._lock:
+            # a change reported while we were stat-ing may be newer than what we saw
+            if generation == self._generation:
+                self._stamps[key] = stamp
+        return stamp
+
+    def forget(self, *paths):
+        """Drop the remembered stamps of `paths` and of their directories"""
+        with self._lock:
+            self._generation += 1
+            for path in paths:
+                self._stamps.pop(str(path), None)
+                self._stamps.pop(str(Path(path).parent), None)
+
+    @contextlib.contextmanager
+    def fresh(self):
+        """Stat for real inside the block: other server processes write without telling our watcher in time"""
+        self._local.fresh = getattr(self._local, "fresh", 0) + 1
+        try:
+            yield
+        finally:
+            self._local.fresh -= 1
+
+    def get(self, path: Path, parse, *extra: Path, key: str | None = None):
+        """`extra` files (e.g. a journal) take part in the stamp but are read by `parse` itself;
+        `key` lets a second view of the same file (e.g. a set of its lines) live next to the first"""
+        key = key or str(path)
+        stamp = tuple(self.stamp(p) for p in (path, *extra))
+        with self._lock:
+            hit = self._entries.get(key)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+        _PROFILER.io("read", path, *extra)
+        value = parse(path)
+        with self._lock:
+            self._entries[key] = (stamp, value)
+        return value
+
+    def put(self, path: Path, value, *extra: Path):
+        """Record a value the caller just wrote, so the next get() skips the re-parse"""
+        self.forget(path, *extra)
+        stamp = tuple(self.stamp(p) for p in (path, *extra))
+        with self._lock:
+            self._entries[str(path)] = (stamp, value)
+
+    def invalidate(self, *paths):
+        self.forget(*paths)
+        with self._lock:
+            for path in paths:
+                self._entries.pop(str(path), None)
+                self._entries.pop(f"{path}#set", None)
+
+
+class _FsWatcher:
+    """Reports files created, changed, moved or deleted under `dirs` to `on_change(paths)`.
+
+    mode "auto" uses watchdog (inotify, FSEvents, ...) when it is installed and falls back to
+    scanning the directories every `interval` seconds; "poll" always scans.
+    """
+
+    def __init__(self, dirs, on_change, mode: str = "auto", interval: float = 0.5):
+        if mode not in ("auto", "poll"):
+            raise ValueError(f"Unknown watch mode: {mode}")
+        self.dirs = [Path(d) for d in dirs]
+        self.on_change = on_change
+        self.mode = mode
+        self.interval = interval
+        self._observer = None
+        self._stop = threading.Event()
+        # watchdog may report resolved paths (e.g. /private/var on macOS): map them back
+        self._aliases = [(str(d.resolve()), str(d)) for d in self.dirs if str(d.resolve()) != str(d)]
+
+    def start(self):
+        if self.mode == "auto" and Observer is not None:
+            try:
+                observer = Observer()
+                for d in self.dirs:
+                    observer.schedule(self, str(d), recursive=True)
+                observer.daemon = True
+                observer.start()
+                self._observer = observer
+                return self
+            except OSError:
+                pass  # e.g. out of inotify watches
+        snapshot = self._scan()
+        threading.Thread(target=self._poll, args=(snapshot,), name="flashlet-watch", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+
+    def dispatch(self, event):
+        """watchdog event handler"""
+        paths = [p for p in (event.src_path, getattr(event, "dest_path", "")) if p]
+        paths = [os.fsdecode(p) for p in paths]
+        for real, given in self._aliases:
+            paths = [given + p[len(real):] if p.startswith(real) else p for p in paths]
+        if any(not Path(p).name.startswith(".") for p in paths):
+            self.on_change(paths)
+
+    def _scan(self) -> dict:
+        """{path: (mtime, size)} of every visible file and directory under `dirs`"""
+        found = {}
+        pending = [str(d) for d in self.dirs]
+        while pending:
+            directory = pending.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                # skips our own temp and lock files
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    info = entry.stat()
+                except OSError:
+                    continue
+                found[entry.path] = (info.st_mtime_ns, info.st_size)
+                if entry.is_dir():
+                    pending.append(entry.path)
+        return found
+
+    def _poll(self, previous: dict):
+        while not self._stop.wait(self.interval):
+            current = self._scan()
+            changed = [p for p in previous.keys() | current.keys() if previous.get(p) != current.get(p)]
+            previous = current
+            if changed:
+                self.on_change(changed)
+
+
+class _LRUCache:
+    """Size-bounded map shared by every session of the server process, least recently used out first.
+
+    Entries carry a version stamp: a lookup with another stamp is a miss.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, stamp):
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None or hit[0] != stamp:
+                return None
+            self._entries.move_to_end(key)
+            return hit[1]
+
+    def put(self, key, stamp, value, size: int):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[2]
+            if size <= self.max_bytes:
+                self._entries[key] = (stamp, value, size)
+                self.size += size
+            while self.size > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+        return value
+
+    def fetch(self, key, stamp, build, sizeof):
+        value = self.get(key, stamp)
+        if value is None:
+            value = build()
+            self.put(key, stamp, value, sizeof(value))
+        return value
+
+    def peek(self, key):
+        """Cached value whatever its stamp, without refreshing its place in the LRU order"""
+        with self._lock:
+            hit = self._entries.get(key)
+            return None if hit is None else hit[1]
+
+    def pop(self, key):
+        with self._lock:
+            hit = self._entries.pop(key, None)
+            if hit is not None:
+                self.size -= hit[2]
+
+    def discard(self, prefix, keep=None):
+        """Drop every entry whose key tuple starts with `prefix`, except those stamped `keep`"""
+        with self._lock:
+            for key in [k for k, hit in self._entries.items() if k[0] == prefix and (keep is None or hit[0] != keep)]:
+                self.size -= self._entries.pop(key)[2]
+
+
+def _text_size(items) -> int:
+    """Rough in-memory size of a list of strings or a str -> str dict"""
+    if isinstance(items, dict):
+        return sum(len(k) + len(v) + 160 for k, v in items.items())
+    return sum(len(t) + 60 for t in items)
+
+
+class _DurableWriter:
+    """Crash-safe writes: full files go through a temp file and an atomic rename.
+
+    mode "fsync" syncs every write before returning. "group" still syncs a temp file before
+    its rename, so a crash leaves the old file or the new one, never a torn one; the renames
+    themselves and journal appends are synced from a background thread every `interval_ms`,
+    so a crash can lose that window's writes. "none" leaves it all to the OS.
+    """
+
+    MODES = ("fsync", "group", "none")
+
+    def __init__(self, mode: str = "group", interval_ms: int = 200):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown durability mode: {mode}")
+        self.mode = mode
+        self.interval = max(1, interval_ms) / 1000
+        self._pending = set()  # appended files, their data not synced yet
+        self._dirs = set()  # directories with a rename not synced yet
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        if mode == "group":
+            atexit.register(self.flush)
+
+    def write_text(self, path: Path, text: str):
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                if self.mode != "none":
+                    os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise
+        _PROFILER.io("write", path, text=text)
+        self._synced(path, data=False)
+
+    def append_text(self, path: Path, text: str, truncate: bool = False):
+        with open(path, "w" if truncate else "a", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            if self.mode == "fsync":
+                os.fsync(f.fileno())
+        _PROFILER.io("write", path, text=text)
+        self._synced(path)
+
+    def _synced(self, path: Path, data: bool = True):
+        if self.mode == "fsync":
+            self._fsync_dir(path.parent)
+        elif self.mode == "group":
+            with self._lock:
+                if data:
+                    self._pending.add(path)
+                self._dirs.add(path.parent)
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="flashlet-group-commit", daemon=True)
+                    self._thread.start()
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            # Let the writes of the next interval pile up into the same commit
+            threading.Event().wait(self.interval)
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, set()
+            dirs, self._dirs = self._dirs, set()
+        for path in pending:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue  # renamed or deleted since
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        for directory in dirs:
+            self._fsync_dir(directory)
+
+    @staticmethod
+    def _fsync_dir(directory: Path):
+        # Makes the rename itself durable; not supported on Windows
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+class _WriteBehind:
+    """Progress updates queued per (user, list) and written by a background thread.
+
+    Grades of the same card coalesce; the thread writes everything `interval_ms` after the
+    first queued update, `flush` does it right away (page change, bulk writes, shutdown).
+    `flush` takes the store's list lock under its own: never call it with a list lock held.
+    """
+
+    def __init__(self, interval_ms: int = 300):
+        self.interval = max(1, interval_ms) / 1000
+        self._pending = {}  # (user, stem) -> (manager, list_path, {term: info})
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def put(self, manager: "DataManager", list_path: Path, changes: dict):
+        with self._lock:
+            entry = self._pending.setdefault((manager.user, Path(list_path).stem), (manager, list_path, {}))
+            entry[2].update(changes)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="flashlet-write-behind", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def pending(self, manager: "DataManager", list_path: Path) -> dict:
+        """Updates of `manager`'s user on this list that are not written yet"""
+        with self._lock:
+            entry = self._pending.get((manager.user, Path(list_path).stem))
+            return dict(entry[2]) if entry else {}
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            # Let the grades of the next interval pile up into the same write
+            threading.Event().wait(self.interval)
+            try:
+                self.flush()
+            except Exception:
+                self._wake.set()  # kept queued, tried again after the next interval
+
+    def flush(self, list_path: Path | None = None):
+        """Write what is queued, for every user of `list_path` or for all lists"""
+        stem = None if list_path is None else Path(list_path).stem
+        with self._flush_lock:
+            with self._lock:
+                keys = [k for k in self._pending if stem is None or k[1] == stem]
+            for key in keys:
+                with self._lock:
+                    manager, path, changes = self._pending[key]
+                    batch = dict(changes)
+                manager._flush_progress(path, batch)
+                with self._lock:
+                    # Drop what was written, unless the card was graded again in the meantime
+                    for term, info in batch.items():
+                        if changes.get(term) is info:
+                            del changes[term]
+                    if not changes:
+                        del self._pending[key]
+
+
+class _ListLock:
+    """Re-entrant lock held across threads (RLock) and server processes (flock on a lock file)"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except OSError:
+                if self._fd is not None:
+                    os.close(self._fd)
+                self._fd = None
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+        self._lock.release()
+        return False
+
+
+def _user_namespace(name: str) -> str:
+    """Directory- and key-safe form of a user name; "" is the shared, pre-multi-user progress"""
+    return re.sub(r"[^\w.-]+", "_", (name or "").strip()).strip("._")[:64]
+
+
+class StorageBackend:
+    """Storage interface behind DataManager; lists are addressed by their Liste/*.txt path.
+
+    Loaders may hand out cached objects, callers must copy before mutating.
+    Terms and definitions are shared; progress belongs to `user` (see for_user).
+    """
+
+    user = ""
+
+    def for_user(self, user: str) -> "StorageBackend":
+        """The same store with its progress methods bound to `user`; caches, locks and connections are shared"""
+        view = copy.copy(self)
+        view.user = _user_namespace(user)
+        return view
+
+    def locked(self, list_path: Path):
+        """Context manager serializing read-modify-write cycles on one list"""
+        return contextlib.nullcontext()
+
+    def table_stamp(self, list_path: Path):
+        """Changes whenever the terms or definitions are written, by anyone; used for optimistic saves"""
+        return self.terms_stamp(list_path)
+
+    def list_available_lists(self) -> list[Path]:
+        raise NotImplementedError
+
+    def list_users(self) -> list[str]:
+        """Every user with progress stored, "" (the shared progress) first"""
+        return [""]
+
+    def list_exists(self, list_path: Path) -> bool:
+        raise NotImplementedError
+
+    def terms_stamp(self, list_path: Path):
+        """Changes whenever the term list is modified behind DataManager's back"""
+        return None
+
+    def progress_stamp(self, list_path: Path):
+        """Same for the progress data"""
+        return None
+
+    def has_term(self, list_path: Path, term: str) -> bool:
+        return term in self.load_terms_from_list_file(list_path)
+
+    def load_terms_from_list_file(self, list_path: Path) -> list:
+        raise NotImplementedError
+
+    def save_terms_to_list_file(self, list_path: Path, terms: list[str]):
+        raise NotImplementedError
+
+    def load_progress(self, list_path: Path) -> dict:
+        raise NotImplementedError
+
+    def save_progress(self, list_path: Path, progress: dict):
+        raise NotImplementedError
+
+    def update_progress(self, list_path: Path, term: str, info: dict):
+        raise NotImplementedError
+
+    def update_progress_many(self, list_path: Path, changes: dict):
+        """Several cards at once; a None value drops the card's progress"""
+        if any(info is None for info in changes.values()):
+            self.save_progress(list_path, _apply_changes(self.load_progress(list_path), changes))
+        else:
+            for term, info in changes.items():
+                self.update_progress(list_path, term, info)
+
+    def get_term_progress(self, list_path: Path, term: str):
+        return self.load_progress(list_path).get(term)
+
+    def load_stats(self, list_path: Path):
+        """Persisted aggregates (see compute_list_stats), or None when missing or out of date"""
+        return None
+
+    def save_stats(self, list_path: Path, stats: dict):
+        pass
+
+    def load_all_stats(self) -> dict:
+        """{stem: load_stats} of every list whose persisted aggregates are current, read in one go
+        where the store can; the home page sums them"""
+        stats = {}
+        for list_path in self.list_available_lists():
+            found = self.load_stats(list_path)
+            if found is not None:
+                stats[list_path.stem] = found
+        return stats
+
+    def load_definitions(self, list_path: Path) -> dict:
+        raise NotImplementedError
+
+    def save_definitions(self, list_path: Path, definitions: dict):
+        raise NotImplementedError
+
+    def update_definitions(self, list_path: Path, changes: dict):
+        """Set the given definitions, None removes one"""
+        self.save_definitions(list_path, _apply_changes(self.load_definitions(list_path), changes))
+
+    def append_terms(self, list_path: Path, terms: list[str]):
+        self.save_terms_to_list_file(list_path, [*self.load_terms_from_list_file(list_path), *terms])
+
+    def forget_terms(self, list_path: Path, terms):
+        """Drop the progress every user has on terms removed from the list"""
+        known = self.load_progress(list_path)
+        dropped = {t: None for t in terms if t in known}
+        if dropped:
+            self.update_progress_many(list_path, dropped)
+
+    def rename_terms(self, list_path: Path, renamed: dict):
+        """Move the progress every user has on each old term of `renamed` ({new: old}) to the new one,
+        unless they already have some on the new term"""
+        known = self.load_progress(list_path)
+        moved = {new: known[old] for new, old in renamed.items() if old in known and new not in known}
+        if moved:
+            self.update_progress_many(list_path, moved)
+
+    def apply_table_changes(self, list_path: Path, terms=None, appended=(), definitions=None, progress=None, removed=(), renamed=None):
+        """Write a save_table diff: `terms` is the new term order when it changed other than by
+        `appended` terms at the end, `definitions`/`progress` hold only the changed entries,
+        `renamed` ({new: old}) the terms edited in place and `removed` the terms whose progress
+        goes for everyone"""
+        if terms is not None:
+            self.save_terms_to_list_file(list_path, terms)
+        elif appended:
+            self.append_terms(list_path, appended)
+        if definitions:
+            self.update_definitions(list_path, definitions)
+        if renamed:
+            self.rename_terms(list_path, renamed)
+        if progress:
+            self.update_progress_many(list_path, progress)
+        if removed:
+            self.forget_terms(list_path, removed)
+
+    def get_definitions(self, list_path: Path, terms) -> dict:
+        definitions = self.load_definitions(list_path)
+        return {t: definitions.get(t, "") for t in terms}
+
+    # Streaming readers, used by exports; backends that do not hold everything in memory override them
+    def iter_rows(self, list_path: Path):
+        """(term, definition, score, is_difficult) in table order, each term once"""
+        return _table_rows(
+            self.load_terms_from_list_file(list_path), self.load_definitions(list_path), self.load_progress(list_path)
+        )
+
+    def iter_terms(self, list_path: Path):
+        yield from self.load_terms_from_list_file(list_path)
+
+    def iter_definitions(self, list_path: Path):
+        yield from self.load_definitions(list_path).items()
+
+    def iter_progress(self, list_path: Path):
+        yield from self.load_progress(list_path).items()
+
+    def rename_list(self, old_stem: str, new_stem: str):
+        raise NotImplementedError
+
+    def delete_list(self, stem: str):
+        raise NotImplementedError
+
+    def wipe_progress(self, list_path: Path):
+        raise NotImplementedError
+
+
+def _normalize_entry(value) -> dict:
+    if not isinstance(value, dict):
+        return {"score": int(value), "is_difficult": False}
+    out = {
+        "score": int(value.get("score", 0)),
+        "is_difficult": bool(value.get("is_difficult", False)),
+    }
+    # Scheduler fields only exist once the card has been reviewed in scheduled mode
+    if value.get("due") is not None:
+        out["due"] = int(value["due"])
+        out["interval"] = float(value.get("interval", 0))
+        out["ease"] = float(value.get("ease", 2.5))
+        out["reps"] = int(value.get("reps", 0))
+    return out
+
+
+def _table_rows(terms, defs: dict, prog: dict):
+    """Listed terms first, then terms that only have a definition or progress, each once"""
+    seen = set()
+    for t in itertools.chain(terms, defs, prog):
+        if t in seen:
+            continue
+        seen.add(t)
+        info = prog.get(t) or {}
+        yield t, defs.get(t, ""), int(info.get("score", 0)), bool(info.get("is_difficult", False))
+
+
+class CardLayout:
+    """Rows every user of a list shares: its distinct terms, then terms that only have a definition"""
+
+    __slots__ = ("terms", "index", "definitions", "listed")
+
+    def __init__(self, terms, definitions: dict):
+        index = dict.fromkeys(terms)
+        self.listed = len(index)
+        index.update(dict.fromkeys(definitions))
+        self.terms = list(index)
+        self.index = {t: i for i, t in enumerate(self.terms)}
+        self.definitions = [definitions.get(t, "") for t in self.terms]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.terms) * 120 + _text_size(self.terms) + _text_size(self.definitions)
+
+
+class CardTable:
+    """One user's cards as parallel columns over a shared CardLayout.
+
+    Rows follow load_table: the layout's rows, then terms that only have this user's progress.
+    Cards without progress have `known` False and the default values.
+    """
+
+    __slots__ = ("layout", "extra", "extra_index", "known", "score", "difficult", "due", "interval", "ease", "reps")
+
+    def __init__(self, layout: CardLayout, progress: dict):
+        self.layout = layout
+        self.extra = [t for t in progress if t not in layout.index]
+        self.extra_index = {t: len(layout.terms) + i for i, t in enumerate(self.extra)}
+        n = len(layout.terms) + len(self.extra)
+        self.known = np.zeros(n, dtype=bool)
+        self.score = np.zeros(n, dtype=np.int16)
+        self.difficult = np.zeros(n, dtype=bool)
+        self.due = np.zeros(n, dtype=np.int64)  # 0: never reviewed in scheduled mode
+        self.interval = np.zeros(n)
+        self.ease = np.full(n, 2.5)
+        self.reps = np.zeros(n, dtype=np.int32)
+        if progress:
+            count = len(progress)
+            infos = progress.values()
+            rows = np.fromiter(map(self.row, progress), np.int64, count)
+            self.known[rows] = True
+            self.score[rows] = np.fromiter((i.get("score", 0) for i in infos), np.int16, count)
+            self.difficult[rows] = np.fromiter((i.get("is_difficult", False) for i in infos), bool, count)
+            self.due[rows] = np.fromiter((i.get("due") or 0 for i in infos), np.int64, count)
+            self.interval[rows] = np.fromiter((i.get("interval", 0) for i in infos), float, count)
+            self.ease[rows] = np.fromiter((i.get("ease", 2.5) for i in infos), float, count)
+            self.reps[rows] = np.fromiter((i.get("reps", 0) for i in infos), np.int32, count)
+
+    def __len__(self) -> int:
+        return len(self.known)
+
+    @property
+    def listed(self) -> int:
+        """The first `listed` rows are the list's own terms"""
+        return self.layout.listed
+
+    @property
+    def terms(self) -> list:
+        return self.layout.terms + self.extra if self.extra else self.layout.terms
+
+    @property
+    def nbytes(self) -> int:
+        columns = (self.known, self.score, self.difficult, self.due, self.interval, self.ease, self.reps)
+        return sum(c.nbytes for c in columns) + len(self.extra) * 120 + _text_size(self.extra)
+
+    def row(self, term):
+        i = self.layout.index.get(term)
+        return self.extra_index.get(term) if i is None else i
+
+    def info(self, term) -> dict | None:
+        """Progress entry of `term` as the stores hold it, None if it has none"""
+        i = self.row(term)
+        if i is None or not self.known[i]:
+            return None
+        info = {"score": int(self.score[i]), "is_difficult": bool(self.difficult[i])}
+        if self.due[i]:
+            info.update(due=int(self.due[i]), interval=float(self.interval[i]), ease=float(self.ease[i]), reps=int(self.reps[i]))
+        return info
+
+    def set(self, term, info: dict) -> bool:
+        """Patch one card in place; False when `term` has no row and the table must be rebuilt"""
+        i = self.row(term)
+        if i is None:
+            return False
+        self.known[i] = True
+        self.score[i] = info.get("score", 0)
+        self.difficult[i] = info.get("is_difficult", False)
+        self.due[i] = info.get("due") or 0
+        self.interval[i] = info.get("interval", 0)
+        self.ease[i] = info.get("ease", 2.5)
+        self.reps[i] = info.get("reps", 0)
+        return True
+
+    def stats(self) -> dict:
+        return column_stats(self.score[:self.listed], self.difficult[:self.listed])
+
+    def frame(self) -> pd.DataFrame:
+        """The pages' own copy, columns Terme, Définition, Score, Difficile"""
+        definitions = self.layout.definitions + [""] * len(self.extra) if self.extra else self.layout.definitions
+        return pd.DataFrame({
+            "Terme": self.terms,
+            "Définition": definitions,
+            "Score": self.score.astype(np.int64),
+            "Difficile": self.difficult.copy(),
+        })
+
+
+def _normalize_progress(raw: dict) -> dict:
+    return {term: _normalize_entry(value) for term, value in raw.items()}
+
+
+def _apply_changes(base: dict, changes: dict) -> dict:
+    """Copy of `base` with `changes` merged in, None values deleting their key"""
+    out = dict(base)
+    for key, value in changes.items():
+        if value is None:
+            out.pop(key, None)
+        else:
+            out[key] = value
+    return out
+
+
+MASTERED_SCORE = -2
+
+
+def compute_list_stats(terms, progress: dict) -> dict:
+    """Aggregates behind calculate_progress: distinct terms, mastered, difficult, score histogram"""
+    seen = set()
+    mastered = difficult = 0
+    histogram = {}
+    for t in terms:
+        if t in seen:
+            continue
+        seen.add(t)
+        info = progress.get(t) or {}
+        score = int(info.get("score", 0))
+        histogram[score] = histogram.get(score, 0) + 1
+        mastered += score <= MASTERED_SCORE
+        difficult += bool(info.get("is_difficult", False))
+    return {"total": len(seen), "mastered": mastered, "difficult": difficult, "histogram": histogram}
+
+
+def column_stats(scores, difficult) -> dict:
+    """compute_list_stats over score and difficulty columns of distinct terms"""
+    scores = np.asarray(scores, dtype=np.int64)
+    values, counts = np.unique(scores, return_counts=True)
+    return {
+        "total": len(scores),
+        "mastered": int((scores <= MASTERED_SCORE).sum()),
+        "difficult": int(np.count_nonzero(difficult)),
+        "histogram": {int(v): int(c) for v, c in zip(values, counts)},
+    }
+
+
+def _progress_summary(stats: dict):
+    """calculate_progress from aggregates: (percent, mastered, total, difficult)"""
+    total = stats["total"]
+    if not total:
+        return 0, 0, 0, 0
+    mastered = stats["mastered"]
+    return int((mastered / total) * 100), mastered, total, stats["difficult"]
+
+
+def apply_stats_delta(stats: dict, old: dict | None, new: dict) -> dict:
+    """Stats after one term of the list went from `old` to `new` progress"""
+    old = old or {}
+    old_score, new_score = int(old.get("score", 0)), int(new.get("score", 0))
+    histogram = dict(stats["histogram"])
+    histogram[old_score] = histogram.get(old_score, 0) - 1
+    if not histogram[old_score]:
+        del histogram[old_score]
+    histogram[new_score] = histogram.get(new_score, 0) + 1
+    return {
+        "total": stats["total"],
+        "mastered": stats["mastered"] - (old_score <= MASTERED_SCORE) + (new_score <= MASTERED_SCORE),
+        "difficult": stats["difficult"] - bool(old.get("is_difficult", False)) + bool(new.get("is_difficult", False)),
+        "histogram": histogram,
+    }
+
+
+def _stats_from_json(data) -> dict | None:
+    if not isinstance(data, dict):
+        return None
+    try:
+        return {
+            "total": int(data["total"]),
+            "mastered": int(data["mastered"]),
+            "difficult": int(data["difficult"]),
+            "histogram": {int(k): int(v) for k, v in data["histogram"].items()},
+        }
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+
+
+class FileBackend(StorageBackend):
+    """Original layout: Liste/*.txt, Save/*_progress.json, Definitions/*_definitions.json
+
+    Single-card grades are appended to Save/*_progress.journal (one compact JSON line each)
+    and folded back into the snapshot once the journal reaches `journal_max` entries.
+    Save/list_stats.jsonl keeps the aggregates of every list for the home page.
+    """
+
+    def __init__(self, base_dir: Path, journal_max: int = 200, writer: _DurableWriter | None = None):
+        self._cache = _FileCache()
+        self._writer = writer or _DurableWriter()
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._summary_lock = threading.Lock()
+        self.journal_max = journal_max
         self.save_dir = base_dir / "Save"
         self.definitions_dir = base_dir / "Definitions"
         self.liste_dir = base_dir / "Liste"
-        self.logo_dir = base_dir / "Logo"
         self.save_dir.mkdir(exist_ok=True)
         self.definitions_dir.mkdir(exist_ok=True)
         self.liste_dir.mkdir(exist_ok=True)
+
+    # --- Paths ---
+    def get_list_file_path(self, list_name_stem: str) -> Path:
+        return self.liste_dir / f"{list_name_stem}.txt"
+
+    def get_save_file_path(self, list_path_or_stem) -> Path:
+        stem = Path(list_path_or_stem).stem
+        return self._user_dir() / f"{stem}_progress.json"
+
+    def _user_dir(self) -> Path:
+        return self.save_dir / "users" / self.user if self.user else self.save_dir
+
+    def _progress_dirs(self):
+        """Every progress namespace: the shared Save/ and one Save/users/<name>/ per user"""
+        users = self.save_dir / "users"
+        return [self.save_dir, *sorted(p for p in users.iterdir() if p.is_dir())] if users.is_dir() else [self.save_dir]
+
+    def list_users(self):
+        return ["", *(p.name for p in self._progress_dirs()[1:])]
+
+    @contextlib.contextmanager
+    def locked(self, list_path: Path):
+        stem = Path(list_path).stem
+        with self._locks_guard:
+            lock = self._locks.get(stem)
+            if lock is None:
+                lock = self._locks[stem] = _ListLock(self.save_dir / f".{stem}.lock")
+        with lock, self._cache.fresh():
+            yield
+
+    def watch(self, on_change=None, mode: str = "auto") -> _FsWatcher:
+        """Trust remembered file stamps from now on and let a watcher drop them when a file changes;
+        `on_change(stems)` hears about lists whose terms or definitions changed"""
+        def changed(paths):
+            self._cache.forget(*paths)
+            stems = set()
+            for p in map(Path, paths):
+                if p.parent == self.liste_dir and p.suffix == ".txt":
+                    stems.add(p.stem)
+                elif p.parent == self.definitions_dir and p.name.endswith("_definitions.json"):
+                    stems.add(p.name[: -len("_definitions.json")])
+            if stems and on_change is not None:
+                on_change(stems)
+
+        watcher = _FsWatcher([self.liste_dir, self.definitions_dir, self.save_dir], changed, mode).start()
+        self._cache.watched = True
+        return watcher
+
+    def table_stamp(self, list_path: Path):
+        return self.terms_stamp(list_path), self._cache.stamp(self.get_definitions_file_path(list_path))
+
+    def get_definitions_file_path(self, list_path_or_stem) -> Path:
+        stem = Path(list_path_or_stem).stem
+        return self.definitions_dir / f"{stem}_definitions.json"
+
+    def get_journal_file_path(self, list_path_or_stem) -> Path:
+        return self.get_save_file_path(list_path_or_stem).with_suffix(".journal")
+
+    # --- Lists ---
+    def list_available_lists(self):
+        # the directory's own stamp moves whenever a list is created, renamed or deleted
+        return list(self._cache.get(self.liste_dir, lambda d: sorted(d.glob("*.txt"))))
+
+    def list_exists(self, list_path: Path) -> bool:
+        return self.terms_stamp(list_path) is not None
+
+    def terms_stamp(self, list_path: Path):
+        return self._cache.stamp(self.get_list_file_path(Path(list_path).stem))
+
+    def progress_stamp(self, list_path: Path):
+        p = self.get_save_file_path(list_path)
+        return self._cache.stamp(p), self._cache.stamp(p.with_suffix(".journal"))
+
+    def has_term(self, list_path: Path, term: str) -> bool:
+        path = self.get_list_file_path(Path(list_path).stem)
+        return term in self._cache.get(path, lambda p: frozenset(self._parse_terms(p)), key=f"{path}#set")
+
+    def load_terms_from_list_file(self, list_path: Path):
+        return self._read(self.get_list_file_path(Path(list_path).stem), self._parse_terms)
+
+    @staticmethod
+    def _read(path: Path, parse, *extra: Path):
+        """Parse without keeping the result: DataManager holds the parsed lists once, as a CardLayout/CardTable"""
+        _PROFILER.io("read", path, *extra)
+        return parse(path)
+
+    @staticmethod
+    def _parse_terms(list_path: Path) -> list:
+        try:
+            with open(list_path, "r", encoding="utf-8") as f:
+                return [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+        except Exception:
+            return []
+
+    def save_terms_to_list_file(self, list_path: Path, terms: list[str]):
+        list_path = self.get_list_file_path(Path(list_path).stem)
+        list_path.parent.mkdir(parents=True, exist_ok=True)
+        title = list_path.stem.replace("_", " ").title()
+        header = [
+            f"# Liste: {title}",
+            "# Ajoutez vos termes ci-dessous, un par ligne",
+            "# Les lignes commençant par # sont des commentaires",
+            "",
+        ]
+        lines = header + [t.strip() for t in terms if t.strip()]
+        self._writer.write_text(list_path, "\n".join(lines) + "\n")
+        self._cache.invalidate(list_path)
+
+    def _append_terms(self, list_path: Path, terms: list[str]):
+        path = self.get_list_file_path(Path(list_path).stem)
+        terms = [t.strip() for t in terms if t.strip()]
+        if not path.exists():
+            return self.save_terms_to_list_file(list_path, terms)
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            sep = ""
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                sep = "" if f.read(1) == b"\n" else "\n"
+        self._writer.append_text(path, sep + "".join(t + "\n" for t in terms))
+        self._cache.invalidate(path)
+
+    # --- Progress ---
+    def load_progress(self, list_path: Path) -> dict:
+        p = self.get_save_file_path(list_path)
+        return self._read(p, self._parse_progress, p.with_suffix(".journal"))[0]
+
+    def _journal_state(self, list_path: Path):
+        """(journal_id, journal_entries, snapshot) of the snapshot and its journal, all a grade needs;
+        `snapshot` keeps the header fields of the JSON file (stats, terms_stamp)"""
+        p = self.get_save_file_path(list_path)
+        return self._cache.get(p, lambda p: self._parse_progress(p)[1:], p.with_suffix(".journal"))
+
+    def _parse_progress(self, p: Path):
+        progress, journal_id, snapshot = {}, None, {}
+        if p.exists():
+            try:
+                with open(p, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                progress = _normalize_progress(data.get("scores", {}))
+                journal_id = data.get("journal_id")
+                snapshot = {"stats": data.get("stats"), "terms_stamp": data.get("terms_stamp")}
+            except Exception:
+                self._keep_corrupt(p)
+                return {}, None, 0, {}
+        entries = 0
+        try:
+            with open(p.with_suffix(".journal"), "r", encoding="utf-8") as f:
+                header = json.loads(f.readline() or "{}")
+                # A journal left over from an older snapshot was already folded in
+                if header.get("journal_id") == journal_id:
+                    for line in f:
+                        try:
+                            rec = json.loads(line)
+                        except ValueError:
+                            break  # torn last line from an interrupted append
+                        progress[rec["t"]] = self._from_record(rec)
+                        entries += 1
+        except (OSError, ValueError):
+            pass
+        return progress, journal_id, entries, snapshot
+
+    def save_progress(self, list_path: Path, progress: dict):
+        p = self.get_save_file_path(list_path)
+        with self.locked(list_path):
+            p.parent.mkdir(parents=True, exist_ok=True)
+            terms_stamp = self.terms_stamp(list_path)
+            payload = {
+                "list_path": str(list_path),
+                "scores": progress,
+                "last_updated": datetime.now().isoformat(timespec="seconds"),
+                "journal_id": os.urandom(8).hex(),
+                "stats": compute_list_stats(self.load_terms_from_list_file(list_path), progress),
+                "terms_stamp": list(terms_stamp) if terms_stamp else None,
+            }
+            self._writer.write_text(p, json.dumps(payload, ensure_ascii=False, indent=2))
+            self._unlink(p.with_suffix(".journal"))
+            self._cache.invalidate(p, p.with_suffix(".journal"))
+
+    def update_progress(self, list_path: Path, term: str, info: dict):
+        self.update_progress_many(list_path, {term: info})
+
+    def update_progress_many(self, list_path: Path, changes: dict):
+        if any(info is None for info in changes.values()):
+            # The journal has no tombstones: deletions go through a snapshot
+            with self.locked(list_path):
+                return super().update_progress_many(list_path, changes)
+        p = self.get_save_file_path(list_path)
+        journal = p.with_suffix(".journal")
+        new = {term: _normalize_entry(info) for term, info in changes.items()}
+        with self.locked(list_path):
+            p.parent.mkdir(parents=True, exist_ok=True)
+            journal_id, entries, snapshot = self._journal_state(list_path)
+            if entries + len(new) >= self.journal_max:
+                self.save_progress(list_path, {**self.load_progress(list_path), **new})
+                return
+            lines = "".join(
+                json.dumps(self._to_record(term, info), ensure_ascii=False, separators=(",", ":")) + "\n"
+                for term, info in new.items()
+            )
+            if entries:
+                self._writer.append_text(journal, lines)
+            else:
+                # First entry for this snapshot: start over, dropping any stale journal
+                header = json.dumps({"journal_id": journal_id}) + "\n"
+                self._writer.append_text(journal, header + lines, truncate=True)
+            self._cache.put(p, (journal_id, entries + len(new), snapshot), journal)
+
+    def load_stats(self, list_path: Path):
+        _, entries, snapshot = self._journal_state(list_path)
+        stats = _stats_from_json(snapshot.get("stats"))
+        terms_stamp = self.terms_stamp(list_path)
+        # Only trustworthy if neither the journal nor the .txt moved since the snapshot
+        if stats is None or entries or snapshot.get("terms_stamp") != (list(terms_stamp) if terms_stamp else None):
+            return None
+        return stats
+
+    # Aggregates of every list, appended to Save/[users/<name>/]list_stats.jsonl as they are
+    # computed, so the home page needs one read instead of one progress file per list.
+    # The last line per list wins if the list's files still have the stamps it recorded.
+    def _summary_path(self) -> Path:
+        return self._user_dir() / "list_stats.jsonl"
+
+    def _summary_stamp(self, list_path: Path) -> list:
+        # as it reads back from JSON
+        return json.loads(json.dumps([self.terms_stamp(list_path), self.progress_stamp(list_path)]))
+
+    def save_stats(self, list_path: Path, stats: dict):
+        path = self._summary_path()
+        if not path.parent.is_dir():
+            return  # no progress saved for this user yet: nothing slow to spare
+        line = json.dumps({"l": Path(list_path).stem, "s": self._summary_stamp(list_path), "stats": stats}, ensure_ascii=False)
+        with self._summary_lock:
+            self._writer.append_text(path, line + "\n")
+
+    def load_all_stats(self) -> dict:
+        path = self._summary_path()
+        with self._summary_lock:
+            entries, lines = self._cache.get(path, self._parse_summary)
+            if lines > 2 * len(entries) + 64:
+                # compact: keep the last line per list
+                self._writer.write_text(path, "".join(
+                    json.dumps({"l": stem, "s": stamp, "stats": stats}, ensure_ascii=False) + "\n"
+                    for stem, (stamp, stats) in entries.items()
+                ))
+                self._cache.put(path, (entries, len(entries)))
+        current = {}
+        for stem, (stamp, stats) in entries.items():
+            if stamp == self._summary_stamp(self.get_list_file_path(stem)):
+                current[stem] = stats
+        return current
+
+    @staticmethod
+    def _parse_summary(path: Path):
+        """({stem: (stamp, stats)}, line count)"""
+        entries, lines = {}, 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        rec = json.loads(line)
+                        stats = _stats_from_json(rec["stats"])
+                    except (ValueError, KeyError, TypeError):
+                        continue  # torn line from an interrupted append
+                    if stats is not None:
+                        entries[rec["l"]] = (rec["s"], stats)
+        except OSError:
+            pass
+        return entries, lines
+
+    @staticmethod
+    def _to_record(term: str, info: dict) -> dict:
+        record = {"t": term, "s": info["score"], "d": int(info["is_difficult"])}
+        if "due" in info:
+            record.update(u=info["due"], i=info["interval"], e=info["ease"], n=info["reps"])
+        return record
+
+    @staticmethod
+    def _from_record(rec: dict) -> dict:
+        return _normalize_entry({
+            "score": rec["s"], "is_difficult": rec["d"],
+            "due": rec.get("u"), "interval": rec.get("i", 0), "ease": rec.get("e", 2.5), "reps": rec.get("n", 0),
+        })
+
+    def wipe_progress(self, list_path: Path):
+        p = self.get_save_file_path(list_path)
+        with self.locked(list_path):
+            self._unlink(p)
+            self._unlink(p.with_suffix(".journal"))
+            self._cache.invalidate(p, p.with_suffix(".journal"))
+
+    @staticmethod
+    def _keep_corrupt(p: Path):
+        """Copy an unreadable file aside before the next save replaces it"""
+        try:
+            stamp = datetime.fromtimestamp(p.stat().st_mtime).strftime("%Y%m%d-%H%M%S")
+            backup = p.with_name(f"{p.name}.corrupt-{stamp}")
+            if not backup.exists():
+                shutil.copy2(p, backup)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _unlink(p: Path):
+        try:
+            if p.exists():
+                p.unlink()
+        except Exception:
+            pass
+
+    # --- Definitions ---
+    def load_definitions(self, list_path: Path) -> dict:
+        return self._read(self.get_definitions_file_path(list_path), self._parse_definitions)
+
+    def _parse_definitions(self, p: Path) -> dict:
+        if not p.exists():
+            return {}
+        try:
+            with open(p, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data.get("definitions", {})
+        except Exception:
+            self._keep_corrupt(p)
+            return {}
+
+    def save_definitions(self, list_path: Path, definitions: dict):
+        p = self.get_definitions_file_path(list_path)
+        payload = {
+            "list_path": str(list_path),
+            "definitions": definitions,
+            "last_updated": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._writer.write_text(p, json.dumps(payload, ensure_ascii=False, indent=2))
+        self._cache.invalidate(p)
+
+    def update_definitions(self, list_path: Path, changes: dict):
+        with self.locked(list_path):
+            definitions = _apply_changes(self.load_definitions(list_path), changes)
+            self.save_definitions(list_path, definitions)
+
+    def append_terms(self, list_path: Path, terms: list[str]):
+        with self.locked(list_path):
+            self._append_terms(list_path, terms)
+
+    def apply_table_changes(self, list_path: Path, terms=None, appended=(), definitions=None, progress=None, removed=(), renamed=None):
+        with self.locked(list_path):
+            super().apply_table_changes(list_path, terms, appended, definitions, progress, removed, renamed)
+
+    def rename_terms(self, list_path: Path, renamed: dict):
+        with self.locked(list_path):
+            for save_dir in self._progress_dirs():
+                user = "" if save_dir == self.save_dir else save_dir.name
+                StorageBackend.rename_terms(self.for_user(user), list_path, renamed)
+
+    def forget_terms(self, list_path: Path, terms):
+        with self.locked(list_path):
+            for save_dir in self._progress_dirs():
+                user = "" if save_dir == self.save_dir else save_dir.name
+                StorageBackend.forget_terms(self.for_user(user), list_path, terms)
+
+    # --- List management ---
+    def rename_list(self, old_stem: str, new_stem: str):
+        # both names locked (in a fixed order) so no journal append recreates the old files mid-move
+        with contextlib.ExitStack() as stack:
+            for stem in sorted({old_stem, new_stem}):
+                stack.enter_context(self.locked(self.get_list_file_path(stem)))
+            return self._rename_list(old_stem, new_stem)
+
+    def _rename_list(self, old_stem: str, new_stem: str):
+        old_txt = self.get_list_file_path(old_stem)
+        new_txt = self.get_list_file_path(new_stem)
+        if not old_txt.exists():
+            raise FileNotFoundError("Source list not found")
+        if new_txt.exists():
+            raise FileExistsError("Target name already exists")
+        old_txt.rename(new_txt)
+        self._cache.invalidate(old_txt, new_txt)
+        old_def = self.get_definitions_file_path(old_stem)
+        new_def = self.get_definitions_file_path(new_stem)
+        if old_def.exists():
+            old_def.rename(new_def)
+        self._cache.invalidate(old_def, new_def)
+        # every user's progress follows the list
+        for save_dir in self._progress_dirs():
+            old_pro = save_dir / f"{old_stem}_progress.json"
+            new_pro = save_dir / f"{new_stem}_progress.json"
+            if old_pro.exists():
+                old_pro.rename(new_pro)
+            old_jnl = old_pro.with_suffix(".journal")
+            if old_jnl.exists():
+                old_jnl.rename(new_pro.with_suffix(".journal"))
+            self._cache.invalidate(old_pro, new_pro, old_jnl, new_pro.with_suffix(".journal"))
+        return new_txt
+
+    def delete_list(self, stem: str):
+        p_txt = self.get_list_file_path(stem)
+        p_def = self.get_definitions_file_path(stem)
+        with self.locked(p_txt):
+            for p in [p_txt, p_def]:
+                self._unlink(p)
+            self._cache.invalidate(p_txt, p_def)
+            for save_dir in self._progress_dirs():
+                p_pro = save_dir / f"{stem}_progress.json"
+                self._unlink(p_pro)
+                self._unlink(p_pro.with_suffix(".journal"))
+                self._cache.invalidate(p_pro, p_pro.with_suffix(".journal"))
+            self._unlink(self.save_dir / f".{stem}.lock")
+        with self._locks_guard:
+            self._locks.pop(stem, None)
+
+
+class SQLiteBackend(StorageBackend):
+    """Single-file store: one row per term, so grading a card is a one-row upsert"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS lists (
+            id INTEGER PRIMARY KEY,
+            stem TEXT NOT NULL UNIQUE,
+            last_updated TEXT,
+            version INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS terms (
+            list_id INTEGER NOT NULL REFERENCES lists(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            term TEXT NOT NULL,
+            PRIMARY KEY (list_id, position)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS terms_by_term ON terms(list_id, term);
+        CREATE TABLE IF NOT EXISTS definitions (
+            list_id INTEGER NOT NULL REFERENCES lists(id) ON DELETE CASCADE,
+            term TEXT NOT NULL,
+            definition TEXT NOT NULL,
+            PRIMARY KEY (list_id, term)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS progress (
+            list_id INTEGER NOT NULL REFERENCES lists(id) ON DELETE CASCADE,
+            user TEXT NOT NULL DEFAULT '',
+            term TEXT NOT NULL,
+            score INTEGER NOT NULL DEFAULT 0,
+            is_difficult INTEGER NOT NULL DEFAULT 0,
+            due INTEGER,
+            interval REAL,
+            ease REAL,
+            reps INTEGER,
+            PRIMARY KEY (list_id, user, term)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS list_stats (
+            list_id INTEGER NOT NULL REFERENCES lists(id) ON DELETE CASCADE,
+            user TEXT NOT NULL DEFAULT '',
+            stats TEXT NOT NULL,
+            PRIMARY KEY (list_id, user)
+        ) WITHOUT ROWID;
+    """
+    # Columns added after the first release of the schema, with their declarations
+    ADDED_COLUMNS = {
+        "progress": {"due": "INTEGER", "interval": "REAL", "ease": "REAL", "reps": "INTEGER"},
+        "lists": {"version": "INTEGER NOT NULL DEFAULT 0"},
+    }
+
+    def __init__(self, db_path: Path, liste_dir: Path, durability: str = "group"):
+        self.db_path = db_path
+        self.liste_dir = liste_dir
+        self._lock = threading.RLock()
+        # Streamlit runs each session's script on its own thread; the lock serializes access
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL only syncs at checkpoints, the SQLite flavour of group commit
+        self._conn.execute("PRAGMA synchronous=FULL" if durability == "fsync" else "PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._set_aside_single_user_progress()
+        self._conn.executescript(self.SCHEMA)
+        for table, columns in self.ADDED_COLUMNS.items():
+            existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            for column, decl in columns.items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+        self._restore_single_user_progress()
+
+    # Databases from before per-user progress key it on (list_id, term): the old table is moved
+    # aside so SCHEMA can create the new one, then copied back as the shared ("") progress
+    def _set_aside_single_user_progress(self):
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(progress)")}
+        if columns and "user" not in columns:
+            self._conn.execute("ALTER TABLE progress RENAME TO progress_single_user")
+
+    def _restore_single_user_progress(self):
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(progress_single_user)")]
+        if not columns:
+            return
+        shared = ", ".join(c for c in columns if c != "user")
+        with self._transaction():
+            self._conn.execute(f"INSERT OR IGNORE INTO progress ({shared}) SELECT {shared} FROM progress_single_user")
+            self._conn.execute("DROP TABLE progress_single_user")
+
+    def _transaction(self):
+        return _SQLiteTransaction(self._conn, self._lock)
+
+    def locked(self, list_path: Path):
+        # BEGIN IMMEDIATE also holds off writers in other processes
+        return self._transaction()
+
+    def table_stamp(self, list_path: Path):
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM lists WHERE stem = ?", (Path(list_path).stem,)).fetchone()
+        return row[0] if row else None
+
+    def _list_id(self, list_path, create: bool = False):
+        stem = Path(list_path).stem
+        row = self._conn.execute("SELECT id FROM lists WHERE stem = ?", (stem,)).fetchone()
+        if row:
+            return row[0]
+        if not create:
+            return None
+        cur = self._conn.execute(
+            "INSERT INTO lists (stem, last_updated) VALUES (?, ?)",
+            (stem, datetime.now().isoformat(timespec="seconds")),
+        )
+        return cur.lastrowid
+
+    def _touch(self, list_id: int, content: bool = False):
+        # Bulk writes also drop the stored aggregates (every user's when the terms change);
+        # DataManager recomputes them on demand
+        self._conn.execute(
+            "UPDATE lists SET last_updated = ?, version = version + ? WHERE id = ?",
+            (datetime.now().isoformat(timespec="seconds"), int(content), list_id),
+        )
+        if content:
+            self._conn.execute("DELETE FROM list_stats WHERE list_id = ?", (list_id,))
+        else:
+            self._conn.execute("DELETE FROM list_stats WHERE list_id = ? AND user = ?", (list_id, self.user))
+
+    # --- Lists ---
+    def list_available_lists(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT stem FROM lists ORDER BY stem").fetchall()
+        return [self.liste_dir / f"{stem}.txt" for (stem,) in rows]
+
+    def list_users(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT user FROM progress WHERE user != '' ORDER BY user").fetchall()
+        return ["", *(u for (u,) in rows)]
+
+    def list_exists(self, list_path: Path) -> bool:
+        with self._lock:
+            return self._list_id(list_path) is not None
+
+    def load_terms_from_list_file(self, list_path: Path):
+        with self._lock:
+            list_id = self._list_id(list_path)
+            if list_id is None:
+                return []
+            rows = self._conn.execute(
+                "SELECT term FROM terms WHERE list_id = ? ORDER BY position", (list_id,)
+            ).fetchall()
+        return [t for (t,) in rows]
+
+    def save_terms_to_list_file(self, list_path: Path, terms: list[str]):
+        with self._transaction():
+            list_id = self._list_id(list_path, create=True)
+            self._conn.execute("DELETE FROM terms WHERE list_id = ?", (list_id,))
+            self._conn.executemany(
+                "INSERT INTO terms (list_id, position, term) VALUES (?, ?, ?)",
+                [(list_id, i, t.strip()) for i, t in enumerate(t for t in terms if t.strip())],
+            )
+            self._touch(list_id, content=True)
+
+    def append_terms(self, list_path: Path, terms: list[str]):
+        with self._transaction():
+            list_id = self._list_id(list_path, create=True)
+            (last,) = self._conn.execute(
+                "SELECT COALESCE(MAX(position), -1) FROM terms WHERE list_id = ?", (list_id,)
+            ).fetchone()
+            self._conn.executemany(
+                "INSERT INTO terms (list_id, position, term) VALUES (?, ?, ?)",
+                [(list_id, last + 1 + i, t.strip()) for i, t in enumerate(t for t in terms if t.strip())],
+            )
+            self._touch(list_id, content=True)
+
+    # --- Progress ---
+    def load_progress(self, list_path: Path) -> dict:
+        with self._lock:
+            list_id = self._list_id(list_path)
+            if list_id is None:
+                return {}
+            rows = self._conn.execute(
+                "SELECT term, score, is_difficult, due, interval, ease, reps FROM progress WHERE list_id = ? AND user = ?",
+                (list_id, self.user),
+            ).fetchall()
+        return {
+            t: _normalize_entry({"score": s, "is_difficult": d, "due": due, "interval": iv, "ease": ef, "reps": n})
+            for t, s, d, due, iv, ef, n in rows
+        }
+
+    def _progress_params(self, list_id: int, term: str, info: dict) -> tuple:
+        return (
+            list_id, self.user, term, info["score"], int(info["is_difficult"]),
+            info.get("due"), info.get("interval"), info.get("ease"), info.get("reps"),
+        )
+
+    def save_progress(self, list_path: Path, progress: dict):
+        progress = _normalize_progress(progress)
+        with self._transaction():
+            list_id = self._list_id(list_path, create=True)
+            self._conn.execute("DELETE FROM progress WHERE list_id = ? AND user = ?", (list_id, self.user))
+            self._conn.executemany(
+                "INSERT INTO progress (list_id, user, term, score, is_difficult, due, interval, ease, reps) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._progress_params(list_id, t, i) for t, i in progress.items()],
+            )
+            self._touch(list_id)
+
+    def update_progress(self, list_path: Path, term: str, info: dict):
+        self.update_progress_many(list_path, {term: info})
+
+    def update_progress_many(self, list_path: Path, changes: dict):
+        with self._transaction():
+            list_id = self._list_id(list_path, create=True)
+            self._conn.executemany(
+                "DELETE FROM progress WHERE list_id = ? AND user = ? AND term = ?",
+                [(list_id, self.user, t) for t, info in changes.items() if info is None],
+            )
+            self._conn.executemany(
+                "INSERT INTO progress (list_id, user, term, score, is_difficult, due, interval, ease, reps) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (list_id, user, term) DO UPDATE SET score = excluded.score, is_difficult = excluded.is_difficult, "
+                "due = excluded.due, interval = excluded.interval, ease = excluded.ease, reps = excluded.reps",
+                [self._progress_params(list_id, t, _normalize_entry(info)) for t, info in changes.items() if info is not None],
+            )
+            # Out of date now; DataManager saves them again when it has them patched
+            self._conn.execute("DELETE FROM list_stats WHERE list_id = ? AND user = ?", (list_id, self.user))
+
+    def get_term_progress(self, list_path: Path, term: str):
+        with self._lock:
+            list_id = self._list_id(list_path)
+            if list_id is None:
+                return None
+            row = self._conn.execute(
+                "SELECT score, is_difficult, due, interval, ease, reps FROM progress WHERE list_id = ? AND user = ? AND term = ?",
+                (list_id, self.user, term),
+            ).fetchone()
+        if row is None:
+            return None
+        s, d, due, iv, ef, n = row
+        return _normalize_entry({"score": s, "is_difficult": d, "due": due, "interval": iv, "ease": ef, "reps": n})
+
+    def wipe_progress(self, list_path: Path):
+        with self._transaction():
+            list_id = self._list_id(list_path)
+            if list_id is not None:
+                self._conn.execute("DELETE FROM progress WHERE list_id = ? AND user = ?", (list_id, self.user))
+                self._touch(list_id)
+
+    # --- Streaming reads ---
+    # Keyset pagination: the lock is only held per page, so an abandoned generator blocks nobody
+    PAGE_SIZE = 2000
+
+    def _pages(self, list_path: Path, sql: str, start):
+        with self._lock:
+            list_id = self._list_id(list_path)
+        if list_id is None:
+            return
+        after = start
+        while True:
+            with self._lock:
+                params = {"list_id": list_id, "after": after, "limit": self.PAGE_SIZE, "user": self.user}
+                rows = self._conn.execute(sql, params).fetchall()
+            yield from rows
+            if len(rows) < self.PAGE_SIZE:
+                return
+            after = rows[-1][0]
+
+    def iter_rows(self, list_path: Path):
+        listed = self._pages(list_path, """
+            SELECT t.position, t.term, COALESCE(d.definition, ''), COALESCE(p.score, 0), COALESCE(p.is_difficult, 0)
+            FROM terms t
+            LEFT JOIN definitions d ON d.list_id = t.list_id AND d.term = t.term
+            LEFT JOIN progress p ON p.list_id = t.list_id AND p.user = :user AND p.term = t.term
+            WHERE t.list_id = :list_id AND t.position > :after
+              AND NOT EXISTS (SELECT 1 FROM terms t2 WHERE t2.list_id = t.list_id AND t2.term = t.term AND t2.position < t.position)
+            ORDER BY t.position LIMIT :limit
+        """, -1)
+        # Definitions and progress of terms that are not (or no longer) in the list
+        defined = self._pages(list_path, """
+            SELECT d.term, d.term, d.definition, COALESCE(p.score, 0), COALESCE(p.is_difficult, 0)
+            FROM definitions d
+            LEFT JOIN progress p ON p.list_id = d.list_id AND p.user = :user AND p.term = d.term
+            WHERE d.list_id = :list_id AND d.term > :after
+              AND NOT EXISTS (SELECT 1 FROM terms t WHERE t.list_id = d.list_id AND t.term = d.term)
+            ORDER BY d.term LIMIT :limit
+        """, "")
+        scored = self._pages(list_path, """
+            SELECT p.term, p.term, '', p.score, p.is_difficult
+            FROM progress p
+            WHERE p.list_id = :list_id AND p.user = :user AND p.term > :after
+              AND NOT EXISTS (SELECT 1 FROM terms t WHERE t.list_id = p.list_id AND t.term = p.term)
+              AND NOT EXISTS (SELECT 1 FROM definitions d WHERE d.list_id = p.list_id AND d.term = p.term)
+            ORDER BY p.term LIMIT :limit
+        """, "")
+        for _, t, d, score, diff in itertools.chain(listed, defined, scored):
+            yield t, d, int(score), bool(diff)
+
+    def iter_terms(self, list_path: Path):
+        for _, t in self._pages(
+            list_path, "SELECT position, term FROM terms WHERE list_id = :list_id AND position > :after ORDER BY position LIMIT :limit", -1
+        ):
+            yield t
+
+    def iter_definitions(self, list_path: Path):
+        yield from self._pages(
+            list_path, "SELECT term, definition FROM definitions WHERE list_id = :list_id AND term > :after ORDER BY term LIMIT :limit", ""
+        )
+
+    def iter_progress(self, list_path: Path):
+        for t, s, d, due, iv, ef, n in self._pages(list_path, """
+            SELECT term, score, is_difficult, due, interval, ease, reps FROM progress
+            WHERE list_id = :list_id AND user = :user AND term > :after ORDER BY term LIMIT :limit
+        """, ""):
+            yield t, _normalize_entry({"score": s, "is_difficult": d, "due": due, "interval": iv, "ease": ef, "reps": n})
+
+    def has_term(self, list_path: Path, term: str) -> bool:
+        with self._lock:
+            list_id = self._list_id(list_path)
+            return list_id is not None and self._conn.execute(
+                "SELECT 1 FROM terms WHERE list_id = ? AND term = ? LIMIT 1", (list_id, term)
+            ).fetchone() is not None
+
+    def load_stats(self, list_path: Path):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT s.stats FROM list_stats s JOIN lists l ON l.id = s.list_id WHERE l.stem = ? AND s.user = ?",
+                (Path(list_path).stem, self.user),
+            ).fetchone()
+        if not row:
+            return None
+        return _stats_from_json(json.loads(row[0]))
+
+    def save_stats(self, list_path: Path, stats: dict):
+        with self._transaction():
+            list_id = self._list_id(list_path)
+            if list_id is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO list_stats (list_id, user, stats) VALUES (?, ?, ?)",
+                    (list_id, self.user, json.dumps(stats)),
+                )
+
+    def load_all_stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT l.stem, s.stats FROM list_stats s JOIN lists l ON l.id = s.list_id WHERE s.user = ?",
+                (self.user,),
+            ).fetchall()
+        stats = {}
+        for stem, data in rows:
+            found = _stats_from_json(json.loads(data))
+            if found is not None:
+                stats[stem] = found
+        return stats
+
+    # --- Definitions ---
+    def load_definitions(self, list_path: Path) -> dict:
+        with self._lock:
+            list_id = self._list_id(list_path)
+            if list_id is None:
+                return {}
+            rows = self._conn.execute(
+                "SELECT term, definition FROM definitions WHERE list_id = ?", (list_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def get_definitions(self, list_path: Path, terms) -> dict:
+        terms = list(terms)
+        out = {t: "" for t in terms}
+        with self._lock:
+            list_id = self._list_id(list_path)
+            if list_id is None or not terms:
+                return out
+            marks = ",".join("?" * len(terms))
+            rows = self._conn.execute(
+                f"SELECT term, definition FROM definitions WHERE list_id = ? AND term IN ({marks})",
+                (list_id, *terms),
+            ).fetchall()
+        out.update(rows)
+        return out
+
+    def save_definitions(self, list_path: Path, definitions: dict):
+        with self._transaction():
+            list_id = self._list_id(list_path, create=True)
+            self._conn.execute("DELETE FROM definitions WHERE list_id = ?", (list_id,))
+            self._conn.executemany(
+                "INSERT INTO definitions (list_id, term, definition) VALUES (?, ?, ?)",
+                [(list_id, t, str(d)) for t, d in definitions.items()],
+            )
+            self._touch(list_id, content=True)
+
+    def update_definitions(self, list_path: Path, changes: dict):
+        with self._transaction():
+            list_id = self._list_id(list_path, create=True)
+            self._conn.executemany(
+                "DELETE FROM definitions WHERE list_id = ? AND term = ?",
+                [(list_id, t) for t, d in changes.items() if d is None],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO definitions (list_id, term, definition) VALUES (?, ?, ?)",
+                [(list_id, t, str(d)) for t, d in changes.items() if d is not None],
+            )
+            self._touch(list_id, content=True)
+
+    def apply_table_changes(self, list_path: Path, terms=None, appended=(), definitions=None, progress=None, removed=(), renamed=None):
+        with self._transaction():
+            super().apply_table_changes(list_path, terms, appended, definitions, progress, removed, renamed)
+
+    def rename_terms(self, list_path: Path, renamed: dict):
+        with self._transaction():
+            list_id = self._list_id(list_path)
+            if list_id is not None:
+                # OR IGNORE: users with progress on the new term keep it, forget_terms drops the old row
+                self._conn.executemany(
+                    "UPDATE OR IGNORE progress SET term = ? WHERE list_id = ? AND term = ?",
+                    [(new, list_id, old) for new, old in renamed.items()],
+                )
+                self._conn.execute("DELETE FROM list_stats WHERE list_id = ?", (list_id,))
+
+    def forget_terms(self, list_path: Path, terms):
+        with self._transaction():
+            list_id = self._list_id(list_path)
+            if list_id is not None:
+                self._conn.executemany(
+                    "DELETE FROM progress WHERE list_id = ? AND term = ?", [(list_id, t) for t in terms]
+                )
+                self._conn.execute("DELETE FROM list_stats WHERE list_id = ?", (list_id,))
+
+    # --- List management ---
+    def rename_list(self, old_stem: str, new_stem: str):
+        with self._transaction():
+            if self._list_id(old_stem) is None:
+                raise FileNotFoundError("Source list not found")
+            if self._list_id(new_stem) is not None:
+                raise FileExistsError("Target name already exists")
+            self._conn.execute("UPDATE lists SET stem = ? WHERE stem = ?", (new_stem, old_stem))
+        return self.liste_dir / f"{new_stem}.txt"
+
+    def delete_list(self, stem: str):
+        with self._transaction():
+            self._conn.execute("DELETE FROM lists WHERE stem = ?", (stem,))
+
+    # --- Migration ---
+    def migrate_from(self, files: FileBackend) -> int:
+        """Copy every list of the file layout once, with each user's progress (journals replayed
+        by load_progress); returns the number of lists imported"""
+        imported = 0
+        if not self._migrated("migrated_from_files"):
+            for p in files.list_available_lists():
+                if self.list_exists(p):
+                    continue
+                with self._transaction():
+                    self.save_terms_to_list_file(p, files.load_terms_from_list_file(p))
+                    self.save_definitions(p, files.load_definitions(p))
+                    self.save_progress(p, files.load_progress(p))
+                imported += 1
+            self._mark_migrated("migrated_from_files")
+        # Save/users/ was left behind by databases migrated before per-user progress: copy it once too
+        if not self._migrated("migrated_users_from_files"):
+            for user in files.list_users()[1:]:
+                source, target = files.for_user(user), self.for_user(user)
+                for p in files.list_available_lists():
+                    progress = source.load_progress(p)
+                    if progress and self.list_exists(p) and not target.load_progress(p):
+                        target.save_progress(p, progress)
+            self._mark_migrated("migrated_users_from_files")
+        return imported
+
+    def _migrated(self, key: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone() is not None
+
+    def _mark_migrated(self, key: str):
+        with self._transaction():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (key, datetime.now().isoformat(timespec="seconds")),
+            )
+
+
+class _SQLiteTransaction:
+    """Re-entrant BEGIN/COMMIT: nested blocks join the outermost transaction"""
+
+    def __init__(self, conn, lock):
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self):
+        self.lock.acquire()
+        self.outer = not self.conn.in_transaction
+        if self.outer:
+            self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self.outer:
+                self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
+        return False
+
+
+class TableConflictError(RuntimeError):
+    """The list was saved by someone else since the caller loaded it"""
+
+
+class DataManager:
+    # Streamlit reruns the script as a new module while this object is cached: catch the class
+    # through the instance (DM.TableConflictError), not the rerun's own global
+    TableConflictError = TableConflictError
+
+    def __init__(self, base_dir: Path | None = None, storage: str | None = None):
+        base_dir = Path(base_dir) if base_dir else Path(__file__).parent
+        self.liste_dir = base_dir / "Liste"
+        self.logo_dir = base_dir / "Logo"
         self.logo_dir.mkdir(exist_ok=True)
+        durability = os.environ.get("FLASHLET_DURABILITY", "group")
+        writer = _DurableWriter(durability, int(os.environ.get("FLASHLET_GROUP_COMMIT_MS", 200)))
+        files = FileBackend(base_dir, journal_max=int(os.environ.get("FLASHLET_JOURNAL_MAX", 200)), writer=writer)
+        storage = storage or os.environ.get("FLASHLET_STORAGE", "files")
+        if storage == "sqlite":
+            db_path = Path(os.environ.get("FLASHLET_DB") or base_dir / "flashlet.db")
+            self.store = SQLiteBackend(db_path, self.liste_dir, durability)
+            self.store.migrate_from(files)
+        else:
+            self.store = files
+        self._versions = {}
+        self._content_versions = {}
+        self._versions_lock = threading.Lock()
+        self._stats = {}
+        write_behind = int(os.environ.get("FLASHLET_WRITE_BEHIND_MS", 300))
+        self._writes = _WriteBehind(write_behind) if write_behind > 0 else None
+        self._patch_lock = threading.RLock()
+        # Terms and definitions are the same for every session and user: parse them once per process
+        self.shared = _LRUCache(int(os.environ.get("FLASHLET_CACHE_MB", 256)) * 2**20)
+        self.user = ""
+        self._views = {"": self}
+        watch = os.environ.get("FLASHLET_WATCH", "auto")
+        self.watcher = files.watch(self._lists_changed, watch) if self.store is files and watch != "off" else None
+
+    def for_user(self, user: str) -> "DataManager":
+        """Same lists, with `user`'s own progress; list versions are shared, aggregates are per user"""
+        user = _user_namespace(user)
+        if user == self.user:
+            return self
+        with self._versions_lock:
+            view = self._views.get(user)
+            if view is None:
+                view = copy.copy(self)
+                view.user = user
+                view.store = self.store.for_user(user)
+                view._stats = {}
+                self._views[user] = view
+        return view
 
     # --- Paths ---
     def get_list_file_path(self, list_name_stem: str) -> Path:
         return self.liste_dir / f"{list_name_stem}.txt"
 
-    def get_save_file_path(self, list_path_or_stem) -> Path:
-        stem = Path(list_path_or_stem).stem
-        return self.save_dir / f"{stem}_progress.json"
+    # --- Versions ---
+    def list_version(self, list_path: Path):
+        """Bumped by every bulk write; single-card grades keep it so derived state can be patched in place"""
+        stem = Path(list_path).stem
+        return self._versions.get(stem, 0), self.store.terms_stamp(list_path)
 
-    def get_definitions_file_path(self, list_path_or_stem) -> Path:
-        stem = Path(list_path_or_stem).stem
-        return self.definitions_dir / f"{stem}_definitions.json"
+    def content_version(self, list_path: Path):
+        """Changes whenever the terms or definitions do, through this process or behind its back"""
+        stem = Path(list_path).stem
+        return self._content_versions.get(stem, 0), self.store.table_stamp(list_path)
+
+    def table_token(self, list_path: Path):
+        """Pass back to save_table(expected=...) to refuse a save over someone else's edits"""
+        return self.store.table_stamp(list_path)
+
+    def _bump(self, *lists, content: bool = False):
+        with self._versions_lock:
+            for list_path in lists:
+                stem = Path(list_path).stem
+                self._versions[stem] = self._versions.get(stem, 0) + 1
+                if content:
+                    self._content_versions[stem] = self._content_versions.get(stem, 0) + 1
+        if content:
+            for list_path in lists:
+                self.shared.discard(Path(list_path).stem)
+
+    def _lists_changed(self, stems):
+        """Watcher callback: free what the shared cache holds for lists edited on disk"""
+        for stem in stems:
+            self.shared.discard(stem, keep=self.content_version(self.get_list_file_path(stem)))
+
+    def _layout(self, list_path: Path) -> CardLayout:
+        """Shared, read-only terms and definitions: the only parsed copy of them this process keeps"""
+        return self.shared.fetch(
+            (Path(list_path).stem, "layout"), self.content_version(list_path),
+            lambda: CardLayout(self.store.load_terms_from_list_file(list_path), self.store.load_definitions(list_path)),
+            lambda layout: layout.nbytes,
+        )
+
+    def _cards_key(self, list_path: Path):
+        return self._stats_key(list_path), self.content_version(list_path)
+
+    def cards(self, list_path: Path) -> CardTable:
+        """This user's cards, read-only; grades patch them in place, other writes rebuild them"""
+        key, stamp = (Path(list_path).stem, "cards", self.user), self._cards_key(list_path)
+        table = self.shared.get(key, stamp)
+        if table is None:
+            table = CardTable(self._layout(list_path), self._progress(list_path))
+            with self._patch_lock:
+                # grades queued while the table was being built
+                for term, info in self._pending_progress(list_path).items():
+                    table.set(term, info)
+                self.shared.put(key, stamp, table, table.nbytes)
+        return table
 
     # --- Lists ---
     def list_available_lists(self):
-        return sorted(self.liste_dir.glob("*.txt"))
+        return self.store.list_available_lists()
+
+    def list_exists(self, list_path: Path) -> bool:
+        return self.store.list_exists(list_path)
 
     def load_terms_from_list_file(self, list_path: Path):
-        try:
-            with open(list_path, "r", encoding="utf-8") as f:
-                return [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
-        except Exception:
-            return []
+        layout = self._layout(list_path)
+        return layout.terms[:layout.listed]
 
     def save_terms_to_list_file(self, list_path: Path, terms: list[str]):
-        list_path.parent.mkdir(parents=True, exist_ok=True)
-        title = list_path.stem.replace("_", " ").title()
-        header = [
-            f"# Liste: {title}",
-            "# Ajoutez vos termes ci-dessous, un par ligne",
-            "# Les lignes commençant par # sont des commentaires",
-            "",
-        ]
-        lines = header + [t.strip() for t in terms if t.strip()]
-        with open(list_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(lines) + "\n")
+        self.store.save_terms_to_list_file(list_path, terms)
+        self._bump(list_path, content=True)
 
     # --- Progress ---
+    def _pending_progress(self, list_path: Path) -> dict:
+        return self._writes.pending(self, list_path) if self._writes is not None else {}
+
+    def _progress(self, list_path: Path) -> dict:
+        """Stored progress with this user's queued grades on top"""
+        pending = self._pending_progress(list_path)
+        progress = self.store.load_progress(list_path)
+        return {**progress, **pending} if pending else progress
+
+    def flush_progress(self, list_path: Path | None = None):
+        """Write the queued grades now, of every user, for `list_path` or for all lists"""
+        if self._writes is not None:
+            self._writes.flush(list_path)
+
     def load_progress(self, list_path: Path) -> dict:
-        p = self.get_save_file_path(list_path)
-        if not p.exists():
-            return {}
-        try:
-            with open(p, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            raw = data.get("scores", {})
-            out = {}
-            for term, value in raw.items():
-                if isinstance(value, dict):
-                    out[term] = {
-                        "score": int(value.get("score", 0)),
-                        "is_difficult": bool(value.get("is_difficult", False)),
-                    }
-                else:
-                    out[term] = {"score": int(value), "is_difficult": False}
-            return out
-        except Exception:
-            return {}
+        return {t: dict(info) for t, info in self._progress(list_path).items()}
 
     def save_progress(self, list_path: Path, progress: dict):
-        p = self.get_save_file_path(list_path)
-        payload = {
-            "list_path": str(list_path),
-            "scores": progress,
-            "last_updated": datetime.now().isoformat(timespec="seconds"),
-        }
-        with open(p, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+        self.flush_progress(list_path)
+        self.store.save_progress(list_path, progress)
+        self._bump(list_path)
+
+    def update_progress(self, list_path: Path, term: str, info: dict):
+        self.update_progress_many(list_path, {term: info})
+
+    def update_progress_many(self, list_path: Path, changes: dict):
+        """Several grades in one store write: a single journal append or transaction"""
+        if self._writes is not None:
+            self._queue_progress(list_path, changes)
+            return
+        # held across the write and the cache patches, so concurrent grades patch one after the other
+        with self.store.locked(list_path):
+            self._write_progress(list_path, changes, patch=True)
+
+    def _queue_progress(self, list_path: Path, changes: dict):
+        """Write-behind: what this process serves is patched now, the store is written later"""
+        stem = Path(list_path).stem
+        key = self._stats_key(list_path)
+        listed = self._listed(list_path, changes)
+        with self._patch_lock:
+            table = self.shared.peek((stem, "cards", self.user))
+            old = {term: table.info(term) for term in listed} if table is not None else None
+            self._writes.put(self, list_path, changes)
+            if table is not None and not all([table.set(term, info) for term, info in changes.items()]):
+                self.shared.pop((stem, "cards", self.user))
+            hit = self._stats.get(stem)
+            if old is None or hit is None or hit[0] != key:
+                self._stats.pop(stem, None)
+                return
+            stats = hit[1]
+            for term in listed:
+                stats = apply_stats_delta(stats, old[term], changes[term])
+            self._stats[stem] = (key, stats)
+
+    def _flush_progress(self, list_path: Path, changes: dict):
+        """Write-behind thread: queued grades go to the store, cached state moves to the new stamps"""
+        with self.store.locked(list_path):
+            self._write_progress(list_path, changes, patch=False)
+
+    def _write_progress(self, list_path: Path, changes: dict, patch: bool):
+        stem = Path(list_path).stem
+        before = self._stats_key(list_path)
+        before_cards = self._cards_key(list_path)
+        # the cards are the read copy of the progress: no need to parse the store's for the old values
+        cards = self.cards(list_path) if patch else None
+        old = {term: cards.info(term) for term in changes} if patch else {}
+        listed = self._listed(list_path, changes) if patch else []
+        self.store.update_progress_many(list_path, changes)
+        after, after_cards = self._stats_key(list_path), self._cards_key(list_path)
+        with self._patch_lock:
+            table = self.shared.get((stem, "cards", self.user), before_cards)
+            if table is not None and all([table.set(term, info) for term, info in changes.items() if patch]):
+                self.shared.put((stem, "cards", self.user), after_cards, table, table.nbytes)
+            hit = self._stats.get(stem)
+            if hit is None or hit[0] != before:
+                self._stats.pop(stem, None)
+                return
+            stats = hit[1]
+            for term in listed:
+                stats = apply_stats_delta(stats, old[term], changes[term])
+            self._stats[stem] = (after, stats)
+        if listed or not patch:
+            self.store.save_stats(list_path, stats)
+
+    def get_term_progress(self, list_path: Path, term: str) -> dict:
+        return self.cards(list_path).info(term) or {"score": 0, "is_difficult": False}
 
     # --- Definitions ---
     def load_definitions(self, list_path: Path) -> dict:
-        p = self.get_definitions_file_path(list_path)
-        if not p.exists():
-            return {}
-        try:
-            with open(p, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data.get("definitions", {})
-        except Exception:
-            return {}
+        layout = self._layout(list_path)
+        return {t: d for t, d in zip(layout.terms, layout.definitions) if d}
 
     def save_definitions(self, list_path: Path, definitions: dict):
-        p = self.get_definitions_file_path(list_path)
-        payload = {
-            "list_path": str(list_path),
-            "definitions": definitions,
-            "last_updated": datetime.now().isoformat(timespec="seconds"),
-        }
-        with open(p, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+        self.store.save_definitions(list_path, definitions)
+        self._bump(list_path, content=True)
+
+    def get_definitions(self, list_path: Path, terms) -> dict:
+        layout = self._layout(list_path)
+        return {t: layout.definitions[layout.index[t]] if t in layout.index else "" for t in terms}
+
+    def _listed(self, list_path: Path, terms) -> list:
+        """The `terms` that are in the list's own term file"""
+        layout = self._layout(list_path)
+        return [t for t in terms if layout.index.get(t, layout.listed) < layout.listed]
 
     # --- Unified table helpers ---
-    def load_table(self, list_path: Path):
-        terms = self.load_terms_from_list_file(list_path)
-        defs = self.load_definitions(list_path)
-        prog = self.load_progress(list_path)
-        union = []
-        seen = set()
-        for t in terms:
-            if t not in seen:
-                union.append(t)
-                seen.add(t)
-        for t in list(defs.keys()) + list(prog.keys()):
-            if t not in seen:
-                union.append(t)
-                seen.add(t)
-        rows = []
-        for t in union:
-            info = prog.get(t, {"score": 0, "is_difficult": False})
-            rows.append({
-                "Terme": t,
-                "Définition": defs.get(t, ""),
-                "Score": int(info.get("score", 0)),
-                "Difficile": bool(info.get("is_difficult", False)),
-            })
-        return rows
+    def load_table(self, list_path: Path) -> pd.DataFrame:
+        """Shared terms and definitions joined with this user's progress, as a fresh DataFrame"""
+        return self.cards(list_path).frame()
 
-    def save_table(self, list_path: Path, rows: list[dict]):
+    def iter_table(self, list_path: Path, chunk_size: int = 1000):
+        """Same rows as load_table as (term, definition, score, is_difficult) tuples, `chunk_size` at a time"""
+        self.flush_progress(list_path)
+        rows = self.store.iter_rows(list_path)
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def iter_terms(self, list_path: Path):
+        return self.store.iter_terms(list_path)
+
+    def iter_definitions(self, list_path: Path):
+        return self.store.iter_definitions(list_path)
+
+    def iter_progress(self, list_path: Path):
+        self.flush_progress(list_path)
+        return self.store.iter_progress(list_path)
+
+    def save_table(self, list_path: Path, rows, expected=None):
+        """Write the edited table (a DataFrame like load_table's, or row dicts); with `expected`
+        (a table_token), raise TableConflictError instead if the terms or definitions changed
+        since that token was taken"""
+        self.flush_progress(list_path)
+        with self.store.locked(list_path):
+            if expected is not None and self.table_token(list_path) != expected:
+                raise self.TableConflictError(Path(list_path).stem)
+            self._save_table(list_path, rows)
+
+    @staticmethod
+    def _table_columns(rows):
+        """(term, definition, difficult, score) per row of a DataFrame or of row dicts"""
+        if isinstance(rows, pd.DataFrame):
+            return zip(*(rows[c].tolist() if c in rows else [None] * len(rows) for c in ("Terme", "Définition", "Difficile", "Score")))
+        return ((r.get("Terme"), r.get("Définition"), r.get("Difficile"), r.get("Score", 0)) for r in rows)
+
+    def _save_table(self, list_path: Path, rows):
         cleaned = []
         seen = set()
-        for r in rows:
-            t = _as_str(r.get("Terme"))
+        for t, d, diff, score in self._table_columns(rows):
+            t = _as_str(t)
             if not t or t in seen:
                 continue
             seen.add(t)
-            cleaned.append({
-                "Terme": t,
-                "Définition": _as_str(r.get("Définition")),
-                "Difficile": _as_bool(r.get("Difficile")),
-                "Score": _as_int(r.get("Score", 0), 0),
-            })
-        # write .txt
-        self.save_terms_to_list_file(list_path, [r["Terme"] for r in cleaned])
-        # write definitions
-        defs = {r["Terme"]: r["Définition"] for r in cleaned if r["Définition"]}
-        self.save_definitions(list_path, defs)
-        # reconcile progress
-        old = self.load_progress(list_path)
-        new = {}
-        for r in cleaned:
-            t = r["Terme"]
-            info = old.get(t, {"score": 0, "is_difficult": False})
-            info["is_difficult"] = _as_bool(r.get("Difficile", info.get("is_difficult", False)))
-            info["score"] = _as_int(r.get("Score", info.get("score", 0)), 0)
-            new[t] = {"score": int(info.get("score", 0)), "is_difficult": bool(info.get("is_difficult", False))}
-        self.save_progress(list_path, new)
+            cleaned.append((t, _as_str(d), _as_bool(diff), _as_int(score, 0)))
+        # diff against what is stored, so only the changed rows get written
+        old_terms = self.store.load_terms_from_list_file(list_path)
+        old_defs = self.store.load_definitions(list_path)
+        old_prog = self.store.load_progress(list_path)
+        old_rows = [t for t, *_ in self.store.iter_rows(list_path)]
+        new_terms = [t for t, *_ in cleaned]
+        kept, known = set(new_terms), set(old_rows)
+        # a row whose term was edited in place keeps its progress under the new name
+        renamed = {new: old for old, new in zip(old_rows, new_terms) if old not in kept and new not in known}
+        defs, prog = {}, {}
+        for t, definition, difficult, score in cleaned:
+            if (old_defs.get(t) or None) != (definition or None):
+                defs[t] = definition or None
+            current = old_prog.get(t)
+            base = current if current is not None else old_prog.get(renamed.get(t))
+            info = _normalize_entry({**(base or {}), "score": score, "is_difficult": difficult})
+            # a new card at the default score needs no progress entry
+            if info != current and (base is not None or info["score"] or info["is_difficult"]):
+                prog[t] = info
+        defs.update((t, None) for t in old_defs if t not in kept)
+        # removed cards lose their progress for every user, not only this one
+        removed = [t for t in old_rows if t not in kept]
+        if new_terms[:len(old_terms)] == old_terms:
+            terms, appended = None, new_terms[len(old_terms):]
+        else:
+            terms, appended = new_terms, []
+        if terms is None and not (appended or defs or prog or removed):
+            return
+        self.store.apply_table_changes(list_path, terms, appended, defs, prog, removed, renamed)
+        self._bump(list_path, content=True)
+        # The rows are all in hand: refresh the aggregates without reading anything back
+        stats = column_stats([c[3] for c in cleaned], [c[2] for c in cleaned])
+        self.store.save_stats(list_path, stats)
+        self._stats[Path(list_path).stem] = (self._stats_key(list_path), stats)
+
+    def import_terms(self, list_path: Path, terms: list[str], definitions: dict):
+        """Append already-deduplicated terms and their definitions, creating the list if needed"""
+        # created before taking the store lock: everywhere the write-behind flush comes first
+        if not self.list_exists(list_path):
+            try:
+                self.create_list(Path(list_path).stem)
+            except FileExistsError:
+                pass  # another session created it in the meantime
+        with self.store.locked(list_path):
+            self.store.apply_table_changes(list_path, appended=terms, definitions=definitions)
+        self._bump(list_path, content=True)
 
     # --- List management ---
     def create_list(self, stem: str, initial_terms: list[str] | None = None):
         path = self.get_list_file_path(stem)
-        if path.exists():
+        if self.list_exists(path):
             raise FileExistsError("List already exists")
         self.save_terms_to_list_file(path, initial_terms or [])
         self.save_definitions(path, {})
@@ -191,33 +2197,15 @@ class DataManager:
         return path
 
     def rename_list(self, old_stem: str, new_stem: str):
-        old_txt = self.get_list_file_path(old_stem)
-        new_txt = self.get_list_file_path(new_stem)
-        if not old_txt.exists():
-            raise FileNotFoundError("Source list not found")
-        if new_txt.exists():
-            raise FileExistsError("Target name already exists")
-        old_txt.rename(new_txt)
-        old_def = self.get_definitions_file_path(old_stem)
-        new_def = self.get_definitions_file_path(new_stem)
-        if old_def.exists():
-            old_def.rename(new_def)
-        old_pro = self.get_save_file_path(old_stem)
-        new_pro = self.get_save_file_path(new_stem)
-        if old_pro.exists():
-            old_pro.rename(new_pro)
-        return new_txt
+        self.flush_progress(self.get_list_file_path(old_stem))
+        new_path = self.store.rename_list(old_stem, new_stem)
+        self._bump(old_stem, new_stem, content=True)
+        return new_path
 
     def delete_list(self, stem: str):
-        p_txt = self.get_list_file_path(stem)
-        p_def = self.get_definitions_file_path(stem)
-        p_pro = self.get_save_file_path(stem)
-        for p in [p_txt, p_def, p_pro]:
-            try:
-                if p.exists():
-                    p.unlink()
-            except Exception:
-                pass
+        self.flush_progress(self.get_list_file_path(stem))
+        self.store.delete_list(stem)
+        self._bump(stem, content=True)
 
     # --- Reset helpers ---
     def reset_scores(self, list_path: Path, reset_difficult: bool = False):
@@ -230,27 +2218,226 @@ class DataManager:
         self.save_progress(list_path, new)
 
     def wipe_progress(self, list_path: Path):
-        p = self.get_save_file_path(list_path)
-        try:
-            if p.exists():
-                p.unlink()
-        except Exception:
-            pass
+        self.flush_progress(list_path)
+        self.store.wipe_progress(list_path)
+        self._bump(list_path)
 
     # --- Progress summary ---
+    def _stats_key(self, list_path: Path):
+        return self.list_version(list_path), self.store.progress_stamp(list_path)
+
+    def list_stats(self, list_path: Path, stored: dict | None = None) -> dict:
+        """Cached aggregates; grades patch them in place, bulk writes recompute them once.
+        `stored` is what store.load_all_stats returned, to use before asking the store again"""
+        stem = Path(list_path).stem
+        key = self._stats_key(list_path)
+        hit = self._stats.get(stem)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+        # with grades still queued the stored aggregates are behind: count them from the cards
+        pending = self._pending_progress(list_path)
+        if pending:
+            stats = None
+        elif stored is not None and stem in stored:
+            stats = stored[stem]
+        else:
+            stats = self.store.load_stats(list_path)
+        if stats is None:
+            stats = self.cards(list_path).stats()
+            if not pending:
+                self.store.save_stats(list_path, stats)
+        self._stats[stem] = (key, stats)
+        return stats
+
     def calculate_progress(self, list_path: Path):
-        terms = self.load_terms_from_list_file(list_path)
-        if not terms:
-            return 0, 0, 0, 0
-        prog = self.load_progress(list_path)
-        mastered = sum(1 for t in terms if prog.get(t, {}).get("score", 0) <= -2)
-        difficult = sum(1 for t in terms if prog.get(t, {}).get("is_difficult", False))
-        total = len(terms)
-        percent = int((mastered / total) * 100) if total else 0
-        return percent, mastered, total, difficult
+        return _progress_summary(self.list_stats(list_path))
+
+    def overview(self, lists) -> tuple[int, int]:
+        """(terms, average percent) over `lists`; lists not in memory yet come from the
+        store's aggregates of every list, read once instead of once per list"""
+        stored = None
+        terms = percents = 0
+        for list_path in lists:
+            hit = self._stats.get(list_path.stem)
+            if stored is None and (hit is None or hit[0] != self._stats_key(list_path)):
+                stored = self.store.load_all_stats()
+            percent, _, total, _ = _progress_summary(self.list_stats(list_path, stored))
+            terms += total
+            percents += percent
+        return terms, percents // len(lists) if lists else 0
+
+    # --- Warm start ---
+    def preload(self, workers: int = 8, extra=None) -> dict:
+        """Parse every list on a thread pool and fill the shared caches with its terms, definitions
+        and every user's cards and aggregates; `extra(list_path)` runs after each list. Returns timings"""
+        start = time.perf_counter()
+        lists = self.list_available_lists()
+        views = [self.for_user(user) for user in self.store.list_users()]
+
+        def load(list_path):
+            t0 = time.perf_counter()
+            for view in views:
+                view.cards(list_path)
+                view.list_stats(list_path)
+            if extra is not None:
+                extra(list_path)
+            return time.perf_counter() - t0
+
+        failed = 0
+        slowest = 0.0
+        with concurrent.futures.ThreadPoolExecutor(max(1, workers), thread_name_prefix="flashlet-preload") as pool:
+            for future in [pool.submit(load, p) for p in lists]:
+                try:
+                    slowest = max(slowest, future.result())
+                except Exception:
+                    # a broken list is loaded (and reported) when someone opens it
+                    failed += 1
+        return {
+            "lists": len(lists), "users": len(views), "failed": failed, "workers": workers,
+            "seconds": round(time.perf_counter() - start, 3), "slowest": round(slowest, 3),
+        }
+
+
+# -----------------------------
+# Instrumentation (FLASHLET_PROFILE=1)
+# -----------------------------
+class _Profiler:
+    """Timings of the rerun running on the current thread: calls, page sections, file reads and writes.
+
+    Disabled unless FLASHLET_PROFILE is set; every hook is then a single attribute check.
+    """
+
+    def __init__(self, enabled: bool, log_path: Path):
+        self.enabled = enabled
+        self.log_path = log_path
+        self._local = threading.local()
+        self._log_lock = threading.Lock()
+
+    @property
+    def current(self):
+        return getattr(self._local, "run", None)
+
+    def begin(self, cprofile: bool = False):
+        """Start a rerun; one cut short by st.rerun() or st.stop() is logged up to its last lap"""
+        if not self.enabled:
+            return
+        if self.current is not None:
+            self.end(interrupted=True)
+        now = time.perf_counter()
+        run = {"start": now, "lap": now, "sections": {}, "calls": {}, "io": dict.fromkeys(("reads", "read_bytes", "writes", "write_bytes"), 0), "profile": None}
+        if cprofile:
+            run["profile"] = cProfile.Profile()
+            try:
+                run["profile"].enable()
+            except ValueError:  # another profiler already holds this interpreter
+                run["profile"] = None
+        self._local.run = run
+
+    def lap(self, section: str):
+        """Charge the time since the previous lap to `section`"""
+        run = self.current
+        if run is None:
+            return
+        now = time.perf_counter()
+        run["sections"][section] = run["sections"].get(section, 0.0) + now - run["lap"]
+        run["lap"] = now
+
+    def io(self, kind: str, *paths, text: str | None = None):
+        """Count one read or write of `paths`: `text` is what was written, else their size on disk"""
+        if not self.enabled or self.current is None:
+            return
+        counters = self.current["io"]
+        counters[f"{kind}s"] += 1
+        if text is not None:
+            counters[f"{kind}_bytes"] += len(text.encode("utf-8"))
+            return
+        for p in paths:
+            try:
+                counters[f"{kind}_bytes"] += os.path.getsize(p)
+            except OSError:
+                pass
+
+    def timed(self, name: str, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            run = self.current
+            if run is None:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                entry = run["calls"].setdefault(name, [0, 0.0])
+                entry[0] += 1
+                entry[1] += time.perf_counter() - start
+        return wrapper
+
+    def wrap(self, target, prefix: str):
+        """`target` with each public method call timed as `prefix.method`"""
+        return _TimedProxy(target, prefix, self) if self.enabled else target
+
+    def end(self, **info) -> dict | None:
+        """Close the rerun, append it to the JSON log and return it"""
+        run = self.current
+        if run is None:
+            return None
+        self._local.run = None
+        total = (run["lap"] if info.get("interrupted") else time.perf_counter()) - run["start"]
+        record = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            **info,
+            "total": round(total, 6),
+            "sections": {k: round(v, 6) for k, v in run["sections"].items()},
+            "calls": {k: {"n": n, "s": round(t, 6)} for k, (n, t) in sorted(run["calls"].items(), key=lambda kv: -kv[1][1])},
+            "io": run["io"],
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        if run["profile"] is not None:
+            run["profile"].disable()
+            out = io.StringIO()
+            pstats.Stats(run["profile"], stream=out).sort_stats("cumulative").print_stats(40)
+            run["profile"].create_stats()
+            record["cprofile"] = {"text": out.getvalue(), "data": marshal.dumps(run["profile"].stats)}
+        try:
+            with self._log_lock, open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError:
+            pass
+        return record
+
+
+class _TimedProxy:
+    """Forwards to the wrapped object; method calls are timed by the profiler"""
+
+    def __init__(self, target, prefix: str, profiler: _Profiler):
+        self._target = target
+        self._prefix = prefix
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        if callable(value) and not isinstance(value, type) and not name.startswith("_"):
+            return self._profiler.timed(f"{self._prefix}.{name}", value)
+        return value
+
+
+# Shared by every rerun: the cached DataManager still calls the hooks of the rerun that created it
+@st.cache_resource(show_spinner=False)
+def _get_profiler() -> _Profiler:
+    log_path = Path(os.environ.get("FLASHLET_PROFILE_LOG") or Path(__file__).parent / "profile.jsonl")
+    return _Profiler(os.environ.get("FLASHLET_PROFILE", "") not in ("", "0"), log_path)
+
 
+_PROFILER = _get_profiler()
+_PROFILER.begin(cprofile=st.session_state.pop("_cprofile_next", False))
 
-DM = DataManager()
+# One DataManager per server process so its read cache survives reruns
+@st.cache_resource(show_spinner=False)
+def _get_data_manager() -> DataManager:
+    return DataManager()
+
+
+DM = _get_data_manager()
 
 # -----------------------------
 # Coercion helpers (unchanged)
@@ -293,568 +2480,678 @@ if "invert_mode" not in st.session_state:
     st.session_state.invert_mode = False
 if "difficult_only" not in st.session_state:
     st.session_state.difficult_only = False
-if "current_term" not in st.session_state:
-    st.session_state.current_term = None
-if "show_secondary" not in st.session_state:
-    st.session_state.show_secondary = False
 if "nav_page" not in st.session_state:
     st.session_state.nav_page = "Accueil"
 if "show_create_modal" not in st.session_state:
     st.session_state.show_create_modal = False
 if "dark_mode" not in st.session_state:
     st.session_state.dark_mode = False
+if "scheduled_mode" not in st.session_state:
+    st.session_state.scheduled_mode = True
+if "browser_study" not in st.session_state:
+    st.session_state.browser_study = False
+if "user_name" not in st.session_state:
+    st.session_state.user_name = _user_namespace(st.query_params.get("user", ""))
+
+# Each student reviews with their own progress; terms and definitions stay shared
+DM = _PROFILER.wrap(DM.for_user(st.session_state.user_name), "DM")
+
+# Redirect requested by buttons before building widgets
+if "_goto" in st.session_state:
+    st.session_state.nav_page = st.session_state.pop("_goto")
+
+# Scoring rules
+
+def score_known(s: int) -> int:
+    return max(-5, s - (2 if s < 4 else 4))
+
+def score_unknown(s: int) -> int:
+    return min(10, s + 2)
+
+# Next term picker
+
+def term_weight(info: dict, difficult_only: bool = False) -> int:
+    score = info.get("score", 0)
+    if score <= -2:
+        return 0
+    if difficult_only and not info.get("is_difficult", False):
+        return 0
+    return max(1, score + 3)
+
+
+def card_weights(cards: CardTable, difficult_only: bool = False) -> list:
+    """term_weight of the list's own cards, in row order"""
+    score = cards.score[:cards.listed].astype(np.int64)
+    weights = np.where(score <= -2, 0, np.maximum(1, score + 3))
+    if difficult_only:
+        weights[~cards.difficult[:cards.listed]] = 0
+    return weights.tolist()
+
+
+class WeightedSampler:
+    """Fenwick tree over term weights: O(log n) draws and single-term updates"""
+
+    def __init__(self, terms, weights):
+        self.terms = []
+        self.index = {}
+        self.weights = []
+        for t, w in zip(terms, weights):
+            if t not in self.index:
+                self.index[t] = len(self.terms)
+                self.terms.append(t)
+                self.weights.append(w)
+        n = len(self.terms)
+        self.tree = [0] + self.weights
+        for i in range(1, n + 1):
+            j = i + (i & -i)
+            if j <= n:
+                self.tree[j] += self.tree[i]
+        self.total = sum(self.weights)
+
+    def set(self, term, weight: int):
+        i = self.index.get(term)
+        if i is None:
+            return
+        delta = weight - self.weights[i]
+        if not delta:
+            return
+        self.weights[i] = weight
+        self.total += delta
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def sample(self, rng=random):
+        if self.total <= 0:
+            return None
+        target = rng.randrange(self.total)
+        pos = 0
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(self.tree) and self.tree[nxt] <= target:
+                pos = nxt
+                target -= self.tree[nxt]
+            step >>= 1
+        return self.terms[pos]
+
+
+def pick_next_term(cards: CardTable, difficult_only=False, sampler=None):
+    if sampler is None:
+        sampler = WeightedSampler(cards.terms[:cards.listed], card_weights(cards, difficult_only))
+    return sampler.sample()
+
+
+def get_term_sampler(list_path: Path, difficult_only=False) -> WeightedSampler:
+    """Per-list sampler kept in session state, rebuilt only when the list itself changes"""
+    samplers = st.session_state.setdefault("_samplers", {})
+    key = (difficult_only, DM.list_version(list_path))
+    cached = samplers.get(list_path.stem)
+    if cached is None or cached[0] != key:
+        cards = DM.cards(list_path)
+        sampler = WeightedSampler(cards.terms[:cards.listed], card_weights(cards, difficult_only))
+        samplers[list_path.stem] = cached = (key, sampler)
+    return cached[1]
+
+# Spaced repetition (SM-2)
+
+QUALITY_KNOWN = 4
+QUALITY_UNKNOWN = 1
+RELEARN_DELAY = 10 * 60  # a failed card comes back after 10 minutes
+SKIP_DELAY = 60
+
+
+def schedule_review(info: dict, quality: int, now: float | None = None) -> dict:
+    """One SM-2 step (quality 0-5); returns a copy of `info` with due/interval/ease/reps updated"""
+    now = int(time.time() if now is None else now)
+    ease = float(info.get("ease", 2.5))
+    reps = int(info.get("reps", 0))
+    interval = float(info.get("interval", 0))
+    if quality < 3:
+        reps = 0
+        interval = 0.0
+        due = now + RELEARN_DELAY
+    else:
+        reps += 1
+        if reps == 1:
+            interval = 1.0
+        elif reps == 2:
+            interval = 6.0
+        else:
+            interval = round(interval * ease, 2)
+        due = now + int(interval * 86400)
+    ease = max(1.3, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return {**info, "due": due, "interval": interval, "ease": round(ease, 3), "reps": reps}
+
+
+def card_due(info: dict, difficult_only: bool = False):
+    """Due timestamp used by the queue (0 for never-reviewed cards), None if filtered out.
+    Cards mastered before they were ever scheduled stay out until a grade schedules them"""
+    if difficult_only and not info.get("is_difficult", False):
+        return None
+    due = info.get("due") or 0
+    if not due and info.get("score", 0) <= MASTERED_SCORE:
+        return None
+    return due
+
+
+def card_dues(cards: CardTable, difficult_only: bool = False) -> list:
+    """card_due of the list's own cards, in row order"""
+    n = cards.listed
+    due = cards.due[:n]
+    keep = (due > 0) | (cards.score[:n] > MASTERED_SCORE)
+    if difficult_only:
+        keep &= cards.difficult[:n]
+    return [d if k else None for d, k in zip(due.tolist(), keep.tolist())]
+
+
+class DueQueue:
+    """Min-heap of (due, position, term) with lazy deletion of outdated entries"""
+
+    def __init__(self, terms, dues):
+        self.position = {}
+        self.due = {}
+        heap = []
+        for t, d in zip(terms, dues):
+            if t in self.position:
+                continue
+            self.position[t] = len(self.position)
+            if d is not None:
+                self.due[t] = d
+                heap.append((d, self.position[t], t))
+        heapq.heapify(heap)
+        self.heap = heap
+
+    def update(self, term, due):
+        """Reschedule `term`; a due of None takes it out of the queue"""
+        if term not in self.position:
+            return
+        if due is None:
+            self.due.pop(term, None)
+            return
+        self.due[term] = due
+        heapq.heappush(self.heap, (due, self.position[term], term))
+
+    def peek(self):
+        while self.heap:
+            due, _, term = self.heap[0]
+            if self.due.get(term) == due:
+                return term, due
+            heapq.heappop(self.heap)
+        return None
+
+    def next_due(self, now: float | None = None):
+        head = self.peek()
+        if head is None or head[1] > (time.time() if now is None else now):
+            return None
+        return head[0]
+
+    def take_due(self, k: int, now: float | None = None, exclude=()) -> list:
+        """Up to `k` due terms in due order, leaving the queue unchanged"""
+        now = time.time() if now is None else now
+        taken, popped = [], []
+        while self.heap and len(taken) < k:
+            entry = heapq.heappop(self.heap)
+            due, _, term = entry
+            if self.due.get(term) != due:
+                continue
+            if due > now:
+                heapq.heappush(self.heap, entry)
+                break
+            popped.append(entry)
+            if term not in exclude:
+                taken.append(term)
+        for entry in popped:
+            heapq.heappush(self.heap, entry)
+        return taken
+
+
+def get_due_queue(list_path: Path, difficult_only=False) -> DueQueue:
+    """Per-list due queue kept in session state next to the sampler"""
+    queues = st.session_state.setdefault("_due_queues", {})
+    key = (difficult_only, DM.list_version(list_path))
+    cached = queues.get(list_path.stem)
+    if cached is None or cached[0] != key:
+        cards = DM.cards(list_path)
+        queue = DueQueue(cards.terms[:cards.listed], card_dues(cards, difficult_only))
+        queues[list_path.stem] = cached = (key, queue)
+    return cached[1]
+
+# Card prefetch
+
+PREFETCH_SIZE = 8
+
+
+def _fsize_class(txt: str) -> str:
+    n = len(txt or "")
+    if n <= 20:
+        return 'base'
+    elif n <= 90:
+        return 'med'
+    else:
+        return 'long'
+
+
+def render_card_faces(term: str, definition: str, invert: bool = False) -> dict:
+    primary = definition if invert else term
+    secondary = term if invert else definition
+    return {
+        "term": term,
+        "front_cls": _fsize_class(primary),
+        "back_cls": _fsize_class(secondary or ''),
+        "front_html": html_lib.escape(primary or "").replace("\n", "<br>"),
+        "back_html": html_lib.escape(secondary or "❓ Aucune définition").replace("\n", "<br>"),
+    }
+
+
+def pick_next_terms(sampler: WeightedSampler, due_queue: DueQueue, k: int, exclude=(), scheduled=True) -> list:
+    """Up to `k` distinct terms: due cards first when scheduled, then weighted draws without replacement"""
+    picked = due_queue.take_due(k, exclude=exclude) if scheduled else []
+    saved = {}
+    for t in [*exclude, *picked]:
+        if t in sampler.index and t not in saved:
+            saved[t] = sampler.weights[sampler.index[t]]
+            sampler.set(t, 0)
+    while len(picked) < k:
+        t = sampler.sample()
+        if t is None:
+            break
+        picked.append(t)
+        saved.setdefault(t, sampler.weights[sampler.index[t]])
+        sampler.set(t, 0)
+    for t, w in saved.items():
+        sampler.set(t, w)
+    if not picked and exclude:
+        # Only the excluded card is left: show it again rather than nothing
+        return pick_next_terms(sampler, due_queue, k, (), scheduled)
+    return picked
+
+
+def next_card(list_path: Path, invert=False, difficult_only=False, scheduled=True, exclude=()):
+    """Pop the next prefetched card; an empty queue is refilled with PREFETCH_SIZE picks at once"""
+    key = (list_path.stem, invert, difficult_only, scheduled, DM.list_version(list_path))
+    state = st.session_state.get("_prefetch")
+    if state is None or state["key"] != key:
+        state = st.session_state._prefetch = {"key": key, "cards": []}
+    if not state["cards"]:
+        sampler = get_term_sampler(list_path, difficult_only)
+        due_queue = get_due_queue(list_path, difficult_only)
+        picked = pick_next_terms(sampler, due_queue, PREFETCH_SIZE, exclude, scheduled)
+        definitions = DM.get_definitions(list_path, picked)
+        state["cards"] = [render_card_faces(t, definitions.get(t, ""), invert) for t in picked]
+    return state["cards"].pop(0) if state["cards"] else None
+
+# Browser study session: a chunk of cards is flipped, picked and graded in the page,
+# grades come back in batches instead of one rerun per click
+
+STUDY_CHUNK = 50
+STUDY_BATCH = 10
+STUDY_FLUSH_MS = 15_000
+
+_study_component = components.declare_component("flashlet_study", path=str(Path(__file__).parent / "components" / "study"))
+
+
+def study_chunk(list_path: Path, invert=False, difficult_only=False, scheduled=True, exclude=()) -> list:
+    """Up to STUDY_CHUNK cards with what the page needs to grade them: faces, score, flag, due"""
+    sampler = get_term_sampler(list_path, difficult_only)
+    due_queue = get_due_queue(list_path, difficult_only)
+    picked = pick_next_terms(sampler, due_queue, STUDY_CHUNK, exclude, scheduled)
+    definitions = DM.get_definitions(list_path, picked)
+    cards = DM.cards(list_path)
+    now = time.time()
+    chunk = []
+    for t in picked:
+        info = cards.info(t) or {}
+        due = due_queue.due.get(t)
+        chunk.append({
+            **render_card_faces(t, definitions.get(t, ""), invert),
+            "score": int(info.get("score", 0)),
+            "difficult": bool(info.get("is_difficult", False)),
+            "due": scheduled and due is not None and due <= now,
+        })
+    return chunk
+
+
+def apply_study_events(list_path: Path, events: list, difficult_only=False) -> int:
+    """Replay the page's grades the way the Réviser buttons do, in one write; returns how many cards changed"""
+    cards = DM.cards(list_path)
+    due_queue = get_due_queue(list_path, difficult_only)
+    changes = {}
+    for event in events:
+        term = event.get("term")
+        if cards.row(term) is None:
+            continue  # deleted since the chunk was sent
+        info = changes.get(term) or cards.info(term) or {"score": 0, "is_difficult": False}
+        grade = event.get("grade")
+        if grade == "known":
+            info = schedule_review(info, QUALITY_KNOWN)
+            info["score"] = score_known(int(info.get("score", 0)))
+        elif grade == "unknown":
+            info = schedule_review(info, QUALITY_UNKNOWN)
+            info["score"] = score_unknown(int(info.get("score", 0)))
+        elif grade == "flag":
+            info = {**info, "is_difficult": bool(event.get("difficult"))}
+        else:
+            if grade == "skip" and term in due_queue.due:
+                due_queue.update(term, max(due_queue.due[term], int(time.time()) + SKIP_DELAY))
+            continue
+        changes[term] = info
+    if changes:
+        DM.update_progress_many(list_path, changes)
+        sampler = get_term_sampler(list_path, difficult_only)
+        for term, info in changes.items():
+            sampler.set(term, term_weight(info, difficult_only))
+            due_queue.update(term, card_due(info, difficult_only))
+    return len(changes)
+
+
+def study_session(list_path: Path, invert=False, difficult_only=False, scheduled=True) -> dict:
+    """Apply the grades the page sent since the last rerun and refill its chunk once used up"""
+    key = (list_path.stem, invert, difficult_only, scheduled, DM.list_version(list_path))
+    state = st.session_state.get("_study")
+    if state is None:
+        # a new id per session state: batches still in the frame from before a student switch are ignored
+        state = st.session_state._study = {"key": None, "session": os.urandom(6).hex(), "chunk": 0, "cards": [], "acked": 0}
+    value = st.session_state.get("study_component") or {}
+    if value.get("session") != state["session"]:
+        value = {}
+    fresh = [e for e in value.get("events", []) if isinstance(e, dict) and int(e.get("n", 0)) > state["acked"]]
+    if fresh:
+        apply_study_events(list_path, fresh, difficult_only)
+        state["acked"] = max(int(e["n"]) for e in fresh)
+    refill = value.get("refill") and value.get("chunk") == state["chunk"]
+    if state["key"] != key or refill or not state["cards"]:
+        exclude = tuple(t for t in [value.get("last")] if t)
+        state.update(key=key, chunk=state["chunk"] + 1, cards=study_chunk(list_path, invert, difficult_only, scheduled, exclude))
+    return state
+
+
+def render_study_session(state: dict, difficult_only=False):
+    _study_component(
+        session=state["session"], chunk=state["chunk"], cards=state["cards"], acked=state["acked"], difficult_only=difficult_only,
+        batch=STUDY_BATCH, flush_ms=STUDY_FLUSH_MS, key="study_component", default=None,
+    )
+
+# Study deck: what the Réviser card area shows, kept in session state so the area can rerun alone
+
+class StudyDeck:
+    """The session's card on screen over a plain dict in session state.
+
+    Rebuilt on every rerun, so its methods always reach this run's DM and helpers.
+    """
+
+    def __init__(self, state: dict):
+        self.state = state
+
+    @property
+    def term(self):
+        return self.state.get("term")
+
+    @property
+    def face(self):
+        return self.state.get("face")
+
+    @property
+    def show_back(self) -> bool:
+        return self.state.get("show_back", False)
+
+    def reset(self):
+        """Draw a new card on the next sync"""
+        self.state.update(term=None, face=None, show_back=False)
+
+    def sync(self, list_path: Path, invert=False, difficult_only=False, scheduled=True):
+        """Face of the card to show for these settings, None once everything is mastered"""
+        key = (list_path.stem, invert, difficult_only, DM.list_version(list_path))
+        term = self.term
+        if term is not None and self.state.get("key") != key:
+            # List edited or display toggled: re-render the card we are on if it still exists
+            if term in get_term_sampler(list_path, difficult_only).index:
+                self.state["face"] = render_card_faces(term, DM.get_definitions(list_path, [term])[term], invert)
+            else:
+                self.reset()
+        self.state.update(key=key, list_path=list_path, difficult_only=difficult_only)
+        if self.term is None:
+            face = next_card(list_path, invert, difficult_only, scheduled, exclude=tuple(t for t in [self.state.get("last_term")] if t))
+            self.state.update(term=face["term"] if face else None, face=face, show_back=False)
+        return self.face
+
+    def info(self) -> dict:
+        return DM.get_term_progress(self.state["list_path"], self.term)
+
+    def flip(self):
+        self.state["show_back"] = not self.show_back
+
+    def grade(self, quality: int):
+        info = schedule_review(self.info(), quality)
+        score = int(info.get("score", 0))
+        info["score"] = score_known(score) if quality >= 3 else score_unknown(score)
+        self._record(info)
+        self._advance()
+
+    def skip(self):
+        """Step past the card without saving anything"""
+        due_queue = get_due_queue(self.state["list_path"], self.state["difficult_only"])
+        if self.term in due_queue.due:
+            due_queue.update(self.term, max(due_queue.due[self.term], int(time.time()) + SKIP_DELAY))
+        self._advance()
+
+    def toggle_difficult(self):
+        info = self.info()
+        info["is_difficult"] = not bool(info.get("is_difficult", False))
+        self._record(info)
+
+    def _record(self, info: dict):
+        list_path, difficult_only = self.state["list_path"], self.state["difficult_only"]
+        DM.update_progress(list_path, self.term, info)
+        get_term_sampler(list_path, difficult_only).set(self.term, term_weight(info, difficult_only))
+        get_due_queue(list_path, difficult_only).update(self.term, card_due(info, difficult_only))
+
+    def _advance(self):
+        self.state["last_term"] = self.term
+        self.reset()
+
+
+def get_study_deck() -> StudyDeck:
+    return StudyDeck(st.session_state.setdefault("_deck", {}))
+
+# Search
+
+_COMBINING_MARKS = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]")
+
+
+def fold_text(text) -> str:
+    """Casefolded, accent-free form used on both sides of a search"""
+    text = str(text).casefold()
+    if text.isascii():
+        return text
+    return _COMBINING_MARKS.sub("", unicodedata.normalize("NFKD", text))
+
+
+def _trigrams(text: str):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """Folded term/definition columns with trigram inverted indexes over the same row order as load_table"""
+
+    def __init__(self, terms, definitions):
+        terms = [fold_text(t) for t in terms]
+        definitions = [fold_text(d) for d in definitions]
+        self.terms = pd.Series(terms, dtype=object)
+        self.definitions = pd.Series(definitions, dtype=object)
+        self.size = len(terms)
+        self._term_postings, self._term_counts = self._build_postings(terms)
+        self._def_postings, self._def_counts = self._build_postings(definitions)
+        order = sorted(range(self.size), key=terms.__getitem__)
+        self._sorted_terms = [terms[i] for i in order]
+        self._sorted_rows = np.array(order, dtype=np.int32)
+        # rough footprint, for the shared cache
+        self.nbytes = 2 * (_text_size(terms) + _text_size(definitions)) + sum(
+            a.nbytes + 120 for postings in (self._term_postings, self._def_postings) for a in postings.values()
+        )
+
+    def _build_postings(self, texts):
+        """Trigram -> sorted row ids, plus the number of distinct trigrams per row.
+        Texts are padded so word edges weigh in fuzzy scores; every plain trigram is still there for substring search"""
+        grams, counts = [], []
+        for text in texts:
+            row_grams = _trigrams(f"  {text} ")
+            grams.extend(row_grams)
+            counts.append(len(row_grams))
+        # one stable sort groups the (trigram, row) pairs into sorted posting lists
+        codes, uniques = pd.factorize(pd.Series(grams, dtype=object))
+        rows = np.repeat(np.arange(self.size, dtype=np.int32), counts)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1]
+        return dict(zip(uniques, np.split(rows[order], bounds))), np.array(counts, dtype=np.int32)
+
+    @staticmethod
+    def _intersect(postings: dict, grams):
+        lists = sorted((postings.get(g) for g in grams), key=lambda a: -1 if a is None else len(a))
+        if lists[0] is None:
+            return np.empty(0, dtype=np.int32)
+        rows = lists[0]
+        for other in lists[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+            if not len(rows):
+                break
+        return rows
+
+    def _candidates(self, q: str):
+        """Rows whose term or definition holds every trigram of q, or None when q is too short to use the index"""
+        grams = _trigrams(q)
+        if not grams:
+            return None
+        return np.union1d(self._intersect(self._term_postings, grams), self._intersect(self._def_postings, grams))
+
+    def search(self, query: str, prefix: bool = False) -> np.ndarray:
+        """Boolean mask of the rows whose term (prefix=True) starts with, or whose term or definition contains, query"""
+        q = fold_text(query).strip()
+        mask = np.zeros(self.size, dtype=bool)
+        if not q:
+            mask[:] = True
+        elif prefix:
+            lo = bisect.bisect_left(self._sorted_terms, q)
+            hi = bisect.bisect_left(self._sorted_terms, q + "\U0010ffff")
+            mask[self._sorted_rows[lo:hi]] = True
+        else:
+            rows = self._candidates(q)
+            if rows is None:
+                terms, definitions = self.terms, self.definitions
+            else:
+                terms, definitions = self.terms.iloc[rows], self.definitions.iloc[rows]
+            hits = terms.str.contains(q, regex=False) | definitions.str.contains(q, regex=False)
+            mask[hits.index[hits.to_numpy(dtype=bool)]] = True
+        return mask
 
-# Redirect requested by buttons before building widgets
-if "_goto" in st.session_state:
-    st.session_state.nav_page = st.session_state.pop("_goto")
+    def _similarity(self, postings: dict, counts: np.ndarray, grams) -> np.ndarray:
+        """Trigram Jaccard similarity of every row to a query, counted from the posting lists only"""
+        found = [postings[g] for g in grams if g in postings]
+        if not found:
+            return np.zeros(self.size)
+        shared = np.bincount(np.concatenate(found), minlength=self.size)
+        return shared / (len(grams) + counts - shared)
 
-# Scoring rules
+    def fuzzy(self, query: str, threshold: float = 0.3, limit: int = 50, definitions: bool = True):
+        """Rows ranked by trigram similarity to query, best first, as (rows, scores)"""
+        q = fold_text(query).strip()
+        if not q or not self.size:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+        grams = _trigrams(f"  {q} ")
+        scores = self._similarity(self._term_postings, self._term_counts, grams)
+        if definitions:
+            scores = np.maximum(scores, self._similarity(self._def_postings, self._def_counts, grams))
+        rows = np.flatnonzero(scores >= threshold)
+        rows = rows[np.argsort(-scores[rows], kind="stable")][:limit]
+        return rows, scores[rows]
 
-def score_known(s: int) -> int:
-    return max(-5, s - (2 if s < 4 else 4))
 
-def score_unknown(s: int) -> int:
-    return min(10, s + 2)
+def get_search_index(list_path: Path, df: pd.DataFrame) -> SearchIndex:
+    """Per-list search index shared by all sessions, rebuilt when the terms or definitions change"""
+    # rows that only exist in a user's progress come after the list's own: they are part of the key,
+    # so users without any share one index and the others do not evict it
+    listed = DM._layout(list_path).listed
+    extra = tuple(df["Terme"].iloc[listed:])
+    key = (list_path.stem, "search", extra)
+    version = DM.content_version(list_path)
+    index = DM.shared.get(key, version)
+    if index is None or index.size != len(df):
+        index = SearchIndex(df["Terme"].tolist(), df["Définition"].tolist())
+        # a table shorter than the list is not one load_table made: keep it out of the cache
+        if len(df) >= listed:
+            DM.shared.put(key, version, index, index.nbytes)
+    return index
 
-# Next term picker
 
-def pick_next_term(terms, progress, definitions, difficult_only=False):
-    pool = []
-    for t in terms:
-        info = progress.get(t, {"score": 0, "is_difficult": False})
-        if info.get("score", 0) > -2:
-            if difficult_only and not info.get("is_difficult", False):
-                continue
-            pool.append((t, info))
-    if not pool:
+DUPLICATE_THRESHOLD = 0.5
+
+
+def possible_duplicates(list_path: Path, df: pd.DataFrame, term: str, limit: int = 5) -> list:
+    """Existing terms close enough to `term` to warn before adding it"""
+    rows, _ = get_search_index(list_path, df).fuzzy(term, DUPLICATE_THRESHOLD, limit, definitions=False)
+    return df["Terme"].iloc[rows].tolist()
+
+# -----------------------------
+# Warm start (FLASHLET_PRELOAD=1)
+# -----------------------------
+@st.cache_resource(show_spinner=False)
+def _preload() -> dict | None:
+    """Start loading every list on a background thread, once per process; pages load lazily
+    until it is done. The returned dict gets the timings under "report" when it finishes"""
+    if os.environ.get("FLASHLET_PRELOAD", "") in ("", "0"):
         return None
-    weights = [max(1, i[1].get("score", 0) + 3) for i in pool]
-    choice = random.choices(pool, weights=weights, k=1)[0][0]
-    return choice
+    manager = _get_data_manager()
+    status = {"report": None}
+
+    def index(list_path: Path):
+        # same index get_search_index builds for a user without progress-only rows
+        key, version = (list_path.stem, "search", ()), manager.content_version(list_path)
+        if manager.shared.get(key, version) is None:
+            layout = manager._layout(list_path)
+            search = SearchIndex(layout.terms, layout.definitions)
+            manager.shared.put(key, version, search, search.nbytes)
+
+    def run():
+        report = manager.preload(int(os.environ.get("FLASHLET_PRELOAD_WORKERS", 8)), extra=index)
+        status["report"] = report
+        _log.log(
+            logging.WARNING if report["failed"] else logging.INFO,
+            "%d list(s) x %d user(s) preloaded in %.2f s on %d threads, %d failed",
+            report["lists"], report["users"], report["seconds"], report["workers"], report["failed"],
+        )
+
+    threading.Thread(target=run, name="flashlet-preload", daemon=True).start()
+    return status
 
 # -----------------------------
 # Enhanced Theming with Modern Design
 # -----------------------------
 
+THEME_DIR = Path(__file__).parent / "components" / "theme"
+
+_theme_component = components.declare_component("flashlet_theme", path=str(THEME_DIR))
+
+
+@st.cache_resource(show_spinner=False)
+def _theme_css() -> tuple:
+    """(minified theme.css, content hash), read once per process"""
+    css = (THEME_DIR / "theme.css").read_text(encoding="utf-8")
+    version = hashlib.sha1(css.encode("utf-8")).hexdigest()[:12]
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};,>])\s*", r"\1", css).strip(), version
+
+
 def inject_theme_css():
     # Enhanced dark theme with modern design
     st.session_state.dark_mode = True
-    
-    css = """
-        <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-        
-        :root {
-          --bg: linear-gradient(135deg, #0f172a 0%, #1e293b 100%);
-          --card: rgba(30, 41, 59, 0.8);
-          --card-hover: rgba(51, 65, 85, 0.9);
-          --border: rgba(148, 163, 184, 0.1);
-          --border-hover: rgba(167, 139, 250, 0.3);
-          --text: #f1f5f9;
-          --text-muted: #94a3b8;
-          --accent: #a78bfa;
-          --accent2: #7c3aed;
-          --success: #10b981;
-          --warning: #f59e0b;
-          --error: #ef4444;
-          --shadow: 0 25px 50px -12px rgba(0, 0, 0, 0.25);
-          --shadow-card: 0 20px 25px -5px rgba(0, 0, 0, 0.1), 0 10px 10px -5px rgba(0, 0, 0, 0.04);
-          --border-radius: 16px;
-          --border-radius-lg: 24px;
-          --transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        }
-        
-        /* Base styles */
-        .block-container {
-          padding-top: 1rem;
-          padding-bottom: 2rem;
-          max-width: 1400px;
-        }
-        
-        body, .stApp {
-          background: var(--bg) !important;
-          color: var(--text);
-          font-family: 'Inter', system-ui, -apple-system, "Segoe UI", Roboto, Arial, sans-serif;
-          font-weight: 400;
-          line-height: 1.6;
-        }
-        
-        /* Enhanced Hero Section */
-        .hero {
-          padding: 3rem 2rem;
-          border-radius: var(--border-radius-lg);
-          background: linear-gradient(135deg, #1e293b 0%, #4c1d95 50%, #7c3aed 100%);
-          color: white;
-          box-shadow: var(--shadow);
-          position: relative;
-          overflow: hidden;
-          margin-bottom: 2rem;
-          backdrop-filter: blur(10px);
-        }
-        
-        .hero::before {
-          content: '';
-          position: absolute;
-          top: 0;
-          left: 0;
-          right: 0;
-          bottom: 0;
-          background: linear-gradient(45deg, transparent 30%, rgba(255,255,255,0.1) 50%, transparent 70%);
-          transform: translateX(-100%);
-          animation: shimmer 3s infinite;
-        }
-        
-        @keyframes shimmer {
-          0% { transform: translateX(-100%); }
-          100% { transform: translateX(100%); }
-        }
-        
-        .hero h2 {
-          margin: 0 0 0.5rem 0;
-          font-size: 2.5rem;
-          font-weight: 700;
-          letter-spacing: -0.025em;
-        }
-        
-        .hero .subtitle {
-          font-size: 1.125rem;
-          opacity: 0.9;
-          font-weight: 300;
-        }
-        
-        /* Enhanced Cards Grid */
-        .cards {
-          display: grid;
-          grid-template-columns: repeat(auto-fit, minmax(320px, 1fr));
-          gap: 1.5rem;
-          margin-top: 1.5rem;
-        }
-        
-        .card {
-          background: var(--card);
-          backdrop-filter: blur(20px);
-          border: 1px solid var(--border);
-          border-radius: var(--border-radius);
-          padding: 1.5rem;
-          box-shadow: var(--shadow-card);
-          transition: var(--transition);
-          position: relative;
-          overflow: hidden;
-        }
-        
-        .card::before {
-          content: '';
-          position: absolute;
-          top: 0;
-          left: 0;
-          right: 0;
-          height: 3px;
-          background: linear-gradient(90deg, var(--accent), var(--accent2));
-          transform: scaleX(0);
-          transition: var(--transition);
-        }
-        
-        .card:hover {
-          background: var(--card-hover);
-          border-color: var(--border-hover);
-          transform: translateY(-4px);
-          box-shadow: 0 32px 64px -12px rgba(0, 0, 0, 0.25);
-        }
-        
-        .card:hover::before {
-          transform: scaleX(1);
-        }
-        
-        .card h3 {
-          margin: 0 0 0.75rem 0;
-          font-size: 1.25rem;
-          font-weight: 600;
-          color: var(--text);
-        }
-        
-        .meta {
-          font-size: 0.875rem;
-          color: var(--text-muted);
-          margin-bottom: 1rem;
-          line-height: 1.5;
-        }
-        
-        .meta b {
-          color: var(--accent);
-          font-weight: 600;
-        }
-        
-        /* Enhanced Buttons */
-        .stButton > button {
-          border-radius: 12px;
-          padding: 0.75rem 1rem;
-          border: 1px solid var(--border);
-          background: var(--card);
-          backdrop-filter: blur(10px);
-          width: 100%;
-          color: var(--text);
-          font-weight: 500;
-          transition: var(--transition);
-          position: relative;
-          overflow: hidden;
-        }
-        
-        .stButton > button::before {
-          content: '';
-          position: absolute;
-          top: 0;
-          left: -100%;
-          width: 100%;
-          height: 100%;
-          background: linear-gradient(90deg, transparent, rgba(255,255,255,0.1), transparent);
-          transition: left 0.5s;
-        }
-        
-        .stButton > button:hover {
-          border-color: var(--accent);
-          background: rgba(167, 139, 250, 0.1);
-          transform: translateY(-1px);
-          box-shadow: 0 8px 25px rgba(167, 139, 250, 0.15);
-        }
-        
-        .stButton > button:hover::before {
-          left: 100%;
-        }
-        
-        .stButton > button:active {
-          transform: translateY(0);
-        }
-        
-        .stButton > button:disabled {
-          background: linear-gradient(135deg, var(--accent), var(--accent2));
-          color: white;
-          border: none;
-          box-shadow: var(--shadow-card);
-        }
-        
-        /* Enhanced FAB */
-        .fab {
-          position: fixed;
-          right: 2rem;
-          bottom: 2rem;
-          z-index: 1000;
-        }
-        
-        .fab .stButton > button {
-          width: 64px;
-          height: 64px;
-          border-radius: 50%;
-          padding: 0;
-          border: 0;
-          background: linear-gradient(135deg, var(--accent2), var(--accent));
-          color: white;
-          box-shadow: var(--shadow);
-          font-size: 1.5rem;
-          font-weight: 600;
-          position: relative;
-          overflow: hidden;
-        }
-        
-        .fab .stButton > button::after {
-          content: '';
-          position: absolute;
-          inset: 0;
-          border-radius: 50%;
-          background: radial-gradient(circle at center, rgba(255,255,255,0.2) 0%, transparent 70%);
-          opacity: 0;
-          transition: opacity 0.3s;
-        }
-        
-        .fab .stButton > button:hover::after {
-          opacity: 1;
-        }
-        
-        .fab .stButton > button:hover {
-          transform: scale(1.05) translateY(-2px);
-          box-shadow: 0 25px 50px rgba(124, 58, 237, 0.3);
-        }
-        
-        /* Enhanced Modal */
-        .modal-overlay {
-          position: fixed;
-          inset: 0;
-          background: rgba(0, 0, 0, 0.6);
-          backdrop-filter: blur(8px);
-          z-index: 1100;
-          display: flex;
-          align-items: center;
-          justify-content: center;
-          animation: fadeIn 0.3s ease;
-        }
-        
-        @keyframes fadeIn {
-          from { opacity: 0; }
-          to { opacity: 1; }
-        }
-        
-        .modal-card {
-          background: var(--card);
-          backdrop-filter: blur(20px);
-          color: inherit;
-          border-radius: var(--border-radius);
-          padding: 2rem;
-          width: min(560px, 90vw);
-          border: 1px solid var(--border);
-          box-shadow: var(--shadow);
-          animation: slideUp 0.3s ease;
-        }
-        
-        @keyframes slideUp {
-          from { 
-            opacity: 0;
-            transform: translateY(20px);
-          }
-          to { 
-            opacity: 1;
-            transform: translateY(0);
-          }
-        }
-        
-        /* Enhanced Flip Card */
-        .study {
-          max-width: 1200px;
-          margin: 0 auto;
-          padding: 0 1rem;
-        }
-        
-        .flip {
-          perspective: 1200px;
-          margin: 1rem auto;
-          width: 100%;
-          display: block;
-          cursor: pointer;
-        }
-        
-        .flip-inner {
-          position: relative;
-          width: 100%;
-          min-height: clamp(320px, 55vh, 720px);
-          transform-style: preserve-3d;
-          transition: transform 0.6s cubic-bezier(0.4, 0, 0.2, 1);
-        }
-        
-        .rev:checked + .flip .flip-inner {
-          transform: rotateY(180deg);
-        }
-        
-        .face {
-          position: absolute;
-          inset: 0;
-          border-radius: var(--border-radius-lg);
-          border: 1px solid var(--border);
-          padding: 2rem;
-          display: flex;
-          align-items: center;
-          justify-content: center;
-          text-align: center;
-          overflow: hidden;
-          backface-visibility: hidden;
-          -webkit-backface-visibility: hidden;
-          background: var(--card);
-          backdrop-filter: blur(20px);
-          color: var(--text);
-          box-shadow: var(--shadow-card);
-          transition: var(--transition);
-        }
-        
-        .face:hover {
-          box-shadow: var(--shadow);
-        }
-        
-        .face .content {
-          width: 100%;
-          word-break: keep-all;
-          overflow-wrap: break-word;
-          text-align: center;
-          position: relative;
-        }
-        
-        .content.base {
-          font-size: clamp(1.5rem, 6vw, 4.5rem);
-          font-weight: 600;
-          line-height: 1.2;
-        }
-        
-        .content.med {
-          font-size: clamp(1.125rem, 4.2vw, 3rem);
-          font-weight: 500;
-          line-height: 1.3;
-        }
-        
-        .content.long {
-          font-size: clamp(0.875rem, 3vw, 2rem);
-          font-weight: 400;
-          line-height: 1.4;
-        }
-        
-        .face.back {
-          transform: rotateY(180deg);
-        }
-        
-        /* Enhanced Control Buttons */
-        .btnrow .stButton > button, .smallctl .stButton > button {
-          height: clamp(72px, 10vh, 104px);
-          border-radius: var(--border-radius);
-          background: var(--card);
-          backdrop-filter: blur(10px);
-          border: 1px solid var(--border);
-          font-size: clamp(2rem, 5vh, 3rem);
-          color: var(--text);
-          display: flex;
-          align-items: center;
-          justify-content: center;
-          transition: var(--transition);
-          position: relative;
-          overflow: hidden;
-        }
-        
-        .btnrow .stButton > button:hover, .smallctl .stButton > button:hover {
-          transform: translateY(-2px);
-          box-shadow: var(--shadow-card);
-          border-color: var(--accent);
-        }
-        
-        .smallctl, .btnrow {
-          max-width: 1200px;
-          margin: 1rem auto 0 auto;
-          padding: 0 1rem;
-        }
-        
-        .btnrow {
-          margin-top: 1.5rem;
-        }
-        
-        /* Enhanced Animations */
-        @keyframes slideIn {
-          from {
-            opacity: 0;
-            transform: translateX(24px);
-          }
-          to {
-            opacity: 1;
-            transform: translateX(0);
-          }
-        }
-        
-        .slide-enter {
-          animation: slideIn 0.3s ease;
-        }
-        
-        /* Enhanced Progress Bar */
-        .progress-bar {
-          width: 100%;
-          height: 8px;
-          background: rgba(148, 163, 184, 0.2);
-          border-radius: 4px;
-          overflow: hidden;
-          margin: 1rem 0;
-        }
-        
-        .progress-fill {
-          height: 100%;
-          background: linear-gradient(90deg, var(--accent), var(--accent2));
-          border-radius: 4px;
-          transition: width 0.5s ease;
-          position: relative;
-        }
-        
-        .progress-fill::after {
-          content: '';
-          position: absolute;
-          top: 0;
-          left: 0;
-          bottom: 0;
-          right: 0;
-          background: linear-gradient(45deg, transparent 30%, rgba(255,255,255,0.3) 50%, transparent 70%);
-          animation: progressShimmer 2s infinite;
-        }
-        
-        @keyframes progressShimmer {
-          0% { transform: translateX(-100%); }
-          100% { transform: translateX(100%); }
-        }
-        
-        /* Enhanced Sidebar */
-        .css-1d391kg {
-          background: rgba(15, 23, 42, 0.95) !important;
-          backdrop-filter: blur(20px);
-          border-right: 1px solid var(--border);
-        }
-        
-        /* Enhanced Data Editor */
-        .stDataFrame {
-          border-radius: var(--border-radius);
-          overflow: hidden;
-          border: 1px solid var(--border);
-          background: var(--card);
-          backdrop-filter: blur(20px);
-        }
-        
-        /* Responsive Design */
-        @media (max-width: 768px) {
-          .hero {
-            padding: 2rem 1rem;
-          }
-          
-          .hero h2 {
-            font-size: 2rem;
-          }
-          
-          .cards {
-            grid-template-columns: 1fr;
-            gap: 1rem;
-          }
-          
-          .card {
-            padding: 1rem;
-          }
-          
-          .fab {
-            right: 1rem;
-            bottom: 1rem;
-          }
-          
-          .fab .stButton > button {
-            width: 56px;
-            height: 56px;
-            font-size: 1.25rem;
-          }
-        }
-        
-        @media (max-height: 800px) {
-          .btnrow .stButton > button, .smallctl .stButton > button {
-            height: 72px;
-            font-size: 2rem;
-          }
-        }
-        
-        /* Dark scrollbar */
-        ::-webkit-scrollbar {
-          width: 8px;
-          height: 8px;
-        }
-        
-        ::-webkit-scrollbar-track {
-          background: rgba(15, 23, 42, 0.5);
-        }
-        
-        ::-webkit-scrollbar-thumb {
-          background: rgba(167, 139, 250, 0.3);
-          border-radius: 4px;
-        }
-        
-        ::-webkit-scrollbar-thumb:hover {
-          background: rgba(167, 139, 250, 0.5);
-        }
-        </style>
-        """
-    
-    st.markdown(css, unsafe_allow_html=True)
+    css, version = _theme_css()
+    if os.environ.get("FLASHLET_THEME", "static") == "inline":
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+    else:
+        # A small frame links theme.css into the page; the stylesheet itself is fetched once per browser
+        _theme_component(version=version, key="theme", default=None)
 
 # -----------------------------
 # Enhanced UI setup
@@ -867,12 +3164,15 @@ st.set_page_config(
 )
 
 # Enhanced theme
+_PROFILER.lap("setup")
 st.session_state.dark_mode = True
 inject_theme_css()
+_PROFILER.lap("css")
 
 # Navigation helpers
 
 def _goto(page: str, stem: str | None = None):
+    DM.flush_progress()
     if stem:
         st.session_state.current_list = stem
     st.session_state._goto = page
@@ -882,6 +3182,22 @@ def _goto(page: str, stem: str | None = None):
 st.sidebar.markdown("### 🧠 FlashLet")
 st.sidebar.markdown("---")
 
+def _switch_user():
+    """Another progress namespace: drop the session's state derived from the previous one"""
+    name = _user_namespace(st.session_state.user_name)
+    st.session_state.user_name = name
+    for key in ("_samplers", "_due_queues", "_prefetch", "_deck", "_study", "study_component"):
+        st.session_state.pop(key, None)
+    if name:
+        st.query_params["user"] = name
+    else:
+        st.query_params.pop("user", None)
+
+st.sidebar.text_input(
+    "👤 Élève", key="user_name", on_change=_switch_user, placeholder="Votre prénom",
+    help="Chaque élève a sa propre progression ; les cartes sont communes à tous",
+)
+
 # Home button with icon
 col1, col2 = st.sidebar.columns([1, 4])
 with col1:
@@ -889,10 +3205,24 @@ with col1:
 with col2:
     st.button("Accueil", use_container_width=True, key="navbtn_home", disabled=(st.session_state.nav_page=="Accueil"), on_click=_goto, args=("Accueil",))
 
+# Large collections are shown a slice at a time
+SIDEBAR_LIST_LIMIT = 15
+LISTS_PER_PAGE = 12
+
+
+def filter_lists(lists, query: str):
+    q = (query or "").strip().lower()
+    return [p for p in lists if q in p.stem.lower()] if q else lists
+
+
 _sidebar_lists = DM.list_available_lists()
 if _sidebar_lists:
     st.sidebar.markdown("### 📚 Vos Listes")
-    for p in _sidebar_lists:
+    if len(_sidebar_lists) > SIDEBAR_LIST_LIMIT:
+        _sidebar_query = st.sidebar.text_input("🔎 Filtrer", key="sidebar_filter", placeholder="Nom de liste...")
+        _sidebar_lists = filter_lists(_sidebar_lists, _sidebar_query)
+    _sidebar_limit = st.session_state.get("sidebar_limit", SIDEBAR_LIST_LIMIT)
+    for p in _sidebar_lists[:_sidebar_limit]:
         stem = p.stem
         percent, mastered, total, difficult = DM.calculate_progress(p)
         
@@ -909,6 +3239,10 @@ if _sidebar_lists:
             st.markdown(emoji)
         with col2:
             st.button(f"{stem} ({percent}%)", use_container_width=True, key=f"nav_list_{stem}", on_click=_goto, args=("Réviser", stem))
+    if len(_sidebar_lists) > _sidebar_limit:
+        if st.sidebar.button(f"⬇️ Afficher plus ({len(_sidebar_lists) - _sidebar_limit} restantes)", use_container_width=True, key="sidebar_more"):
+            st.session_state.sidebar_limit = _sidebar_limit + SIDEBAR_LIST_LIMIT
+            st.rerun()
 else:
     st.sidebar.info("🎯 Créez votre première liste avec le bouton ＋")
 
@@ -916,15 +3250,179 @@ st.sidebar.markdown("---")
 st.sidebar.markdown(f"**📋 Liste courante:** {st.session_state.current_list or '—'}")
 
 # Current page and list path
+_PROFILER.lap("sidebar")
 page = st.session_state.nav_page
 current_list_path = DM.get_list_file_path(st.session_state.current_list) if st.session_state.current_list else None
 
 # Enhanced helper functions
 
+EXPORT_COLUMNS = ["Terme", "Définition", "Score", "Difficile"]
+
 def build_export_df(list_path: Path) -> pd.DataFrame:
-    rows = DM.load_table(list_path)
-    df = pd.DataFrame(rows, columns=["Terme", "Définition", "Score", "Difficile"])
-    return df
+    return DM.load_table(list_path)
+
+# Streaming exports: rows come from the store chunk by chunk and are encoded as they go
+
+def iter_export_csv(list_path: Path, chunk_size: int = 1000):
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(EXPORT_COLUMNS)
+    for chunk in DM.iter_table(list_path, chunk_size):
+        writer.writerows(chunk)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+def iter_export_jsonl(list_path: Path, chunk_size: int = 1000):
+    for chunk in DM.iter_table(list_path, chunk_size):
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n" for row in chunk
+        ).encode("utf-8")
+
+def _iter_json_block(name: str, items, opener: str, closer: str, chunk_size: int, last: bool = False):
+    yield f'  "{name}": {opener}'.encode("utf-8")
+    first = True
+    for batch in iter(lambda: list(itertools.islice(items, chunk_size)), []):
+        parts = []
+        for item in batch:
+            parts.append(("\n    " if first else ",\n    ") + item)
+            first = False
+        yield "".join(parts).encode("utf-8")
+    end = ("\n  " if not first else "") + closer + ("\n" if last else ",\n")
+    yield end.encode("utf-8")
+
+def iter_backup_json(list_path: Path, chunk_size: int = 1000):
+    """Full backup (terms, definitions, progress) in the same shape as before, written incrementally"""
+    dump = functools.partial(json.dumps, ensure_ascii=False)
+    yield "{\n".encode("utf-8")
+    yield f'  "list_name": {dump(list_path.stem)},\n'.encode("utf-8")
+    yield f'  "export_date": {dump(datetime.now().isoformat())},\n'.encode("utf-8")
+    yield from _iter_json_block("terms", (dump(t) for t in DM.iter_terms(list_path)), "[", "]", chunk_size)
+    yield from _iter_json_block(
+        "definitions", (f"{dump(t)}: {dump(d)}" for t, d in DM.iter_definitions(list_path)), "{", "}", chunk_size
+    )
+    yield from _iter_json_block(
+        "progress", (f"{dump(t)}: {dump(i)}" for t, i in DM.iter_progress(list_path)), "{", "}", chunk_size, last=True
+    )
+    yield b"}\n"
+
+EXPORT_FORMATS = {
+    "csv": iter_export_csv,
+    "jsonl": iter_export_jsonl,
+    "backup": iter_backup_json,
+}
+
+def export_file(list_path: Path, fmt: str = "csv") -> io.BytesIO:
+    """Download payload for st.download_button(data=functools.partial(export_file, ...)).
+
+    Streamlit keeps the finished file in memory anyway; streaming avoids the DataFrame
+    and intermediate copies on the way there.
+    """
+    out = io.BytesIO()
+    for chunk in EXPORT_FORMATS[fmt](list_path):
+        out.write(chunk)
+    return out
+
+# Bulk import, mirroring utils/csv.ts (sniffDelimiter / parseDelimited / mapRows) on streams
+
+IMPORT_DELIMITERS = [",", ";", "\t", "|"]
+IMPORT_ROLES = {"ignore": "Ignorer", "term": "Terme", "definition": "Définition", "list": "Liste", "tags": "Tags"}
+IMPORT_BATCH = 50_000
+
+def sniff_delimiter(lines, candidates=IMPORT_DELIMITERS) -> str:
+    """Delimiter that shows up the most, on the most lines, in the first ten lines"""
+    lines = [line.lstrip("\ufeff") for line in itertools.islice(lines, 10)]
+    best, best_score = ",", -1
+    for delim in candidates:
+        counts = [line.count(delim) for line in lines]
+        non_zero = sum(1 for c in counts if c)
+        score = -1 if not non_zero else sum(counts) + non_zero * 0.1
+        if score > best_score:
+            best, best_score = delim, score
+    return best
+
+def iter_delimited(stream, delimiter: str):
+    """Rows of a delimited text stream, quotes handled, blank lines dropped"""
+    for row in csv.reader(stream, delimiter=delimiter):
+        if row and row != [""]:
+            yield row
+
+def map_row(row: list, mapping: dict, default_list: str | None = None, tag_separators=",;") -> dict | None:
+    """One parsed row as {"term", "definition", "list", "tags"} following the column roles; None without a term"""
+    item = {"term": "", "list": default_list}
+    for col, role in mapping.items():
+        if role == "ignore" or col >= len(row):
+            continue
+        val = row[col].strip()
+        if not val:
+            continue
+        if role == "tags":
+            item.setdefault("tags", []).extend(t.strip() for t in re.split(f"[{re.escape(tag_separators)}]", val) if t.strip())
+        elif role.startswith("extra:"):
+            item[role[len("extra:"):].strip() or "extra"] = val
+        else:
+            item[role] = val
+    return item if item["term"] else None
+
+def _safe_stem(name: str) -> str:
+    return re.sub(r'[\\/:*?"<>|]+', "_", name).strip(" .")
+
+def import_rows(rows, mapping: dict, default_list: str, has_header: bool = True, batch_size: int = IMPORT_BATCH, on_batch=None) -> dict:
+    """Route mapped rows to their lists in one pass.
+
+    Terms already in a list, or seen earlier in the file, are skipped; new ones are
+    committed `batch_size` at a time per list. Tags have nowhere to go yet and are dropped.
+    """
+    stats = {"rows": 0, "imported": 0, "skipped": 0, "duplicates": 0, "lists": {}}
+    stems, seen, pending = {}, {}, {}
+
+    def commit(stem):
+        terms, definitions = pending.pop(stem)
+        DM.import_terms(DM.get_list_file_path(stem), terms, definitions)
+        stats["imported"] += len(terms)
+        stats["lists"][stem] = stats["lists"].get(stem, 0) + len(terms)
+        if on_batch:
+            on_batch(stats)
+
+    rows = iter(rows)
+    if has_header:
+        next(rows, None)
+    for row in rows:
+        stats["rows"] += 1
+        item = map_row(row, mapping, default_list)
+        name = (item["list"] or "") if item else ""
+        stem = stems.get(name)
+        if stem is None:
+            stem = stems[name] = _safe_stem(name)
+            if stem and stem not in seen:
+                list_path = DM.get_list_file_path(stem)
+                seen[stem] = set(DM.iter_terms(list_path)) if DM.list_exists(list_path) else set()
+        if not stem:
+            stats["skipped"] += 1
+            continue
+        # the list files hold one term per line
+        term = item["term"] if item["term"].isprintable() else " ".join(item["term"].split())
+        if term in seen[stem]:
+            stats["duplicates"] += 1
+            continue
+        seen[stem].add(term)
+        terms, definitions = pending.setdefault(stem, ([], {}))
+        terms.append(term)
+        if item.get("definition"):
+            definitions[term] = item["definition"]
+        if len(terms) >= batch_size:
+            commit(stem)
+    for stem in list(pending):
+        commit(stem)
+    return stats
+
+def open_import_source(uploaded=None, pasted: str = ""):
+    """Fresh text stream over the uploaded file (BOM dropped) or the pasted text"""
+    if uploaded is not None:
+        return io.TextIOWrapper(io.BytesIO(uploaded.getvalue()), encoding="utf-8-sig", errors="replace", newline="")
+    return io.StringIO(pasted, newline="")
 
 def render_enhanced_progress_bar(percent: int):
     """Render an enhanced progress bar with animation"""
@@ -973,18 +3471,112 @@ def render_list_card(p: Path):
         with col2:
             st.button("✏️ Éditer", key=f"edit_{stem}", on_click=_goto, args=("Éditer", stem), use_container_width=True)
             
-            # Export button
-            exp_df = build_export_df(p)
-            csv = exp_df.to_csv(index=False).encode("utf-8")
+            # Export button: the CSV is only built when the download is clicked
             st.download_button(
                 "💾 Export",
-                data=csv,
+                data=functools.partial(export_file, p, "csv"),
                 file_name=f"{stem}.csv",
                 mime="text/csv",
                 key=f"export_{stem}",
                 use_container_width=True
             )
 
+@st.fragment
+def study_area(list_path: Path):
+    """Metrics and card of Réviser: flips, grades and browser batches rerun only this part"""
+    profiled = _PROFILER.enabled and _PROFILER.current is None
+    if profiled:
+        _PROFILER.begin()
+    try:
+        _study_area(list_path)
+    finally:
+        if profiled:
+            _PROFILER.end(page="Réviser", fragment="study", user=st.session_state.user_name, list=list_path.stem)
+
+def _study_area(list_path: Path):
+    invert = st.session_state.invert_mode
+    difficult_only = st.session_state.difficult_only
+    if st.session_state.browser_study:
+        # Grades sent by the page since the last rerun count in the figures below
+        study = study_session(list_path, invert, difficult_only, st.session_state.scheduled_mode)
+
+    percent, mastered, total, difficult = DM.calculate_progress(list_path)
+    if not total:
+        st.info("📝 La liste est vide. Ajoutez des termes depuis l'éditeur.")
+        return
+
+    # Enhanced progress display
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("📈 Progression", f"{percent}%")
+    with col2:
+        st.metric("✅ Maîtrisés", f"{mastered}/{total}")
+    with col3:
+        st.metric("🚩 Difficiles", difficult)
+    with col4:
+        remaining = total - mastered
+        st.metric("⏳ Restants", remaining)
+
+    if st.session_state.browser_study:
+        if not study["cards"]:
+            st.success("🎉 Excellent ! Tout est maîtrisé pour les filtres actuels.")
+            st.balloons()
+        else:
+            render_study_session(study, difficult_only)
+        return
+
+    deck = get_study_deck()
+    face = deck.sync(list_path, invert, difficult_only, st.session_state.scheduled_mode)
+    if face is None:
+        st.success("🎉 Excellent ! Tout est maîtrisé pour les filtres actuels.")
+        st.balloons()
+        return
+
+    # Enhanced card HTML
+    checked = "checked" if deck.show_back else ""
+    card_html = f"""
+    <div class="study">
+      <input id="reveal" class="rev" type="checkbox" {checked} style="display: none;">
+      <label for="reveal" class="flip">
+        <div class="flip-inner">
+          <div class="face front">
+            <div class="content {face["front_cls"]}">
+              <b>{face["front_html"]}</b>
+            </div>
+          </div>
+          <div class="face back">
+            <div class="content {face["back_cls"]}">
+              {face["back_html"]}
+            </div>
+          </div>
+        </div>
+      </label>
+    </div>
+    """
+    st.markdown(card_html, unsafe_allow_html=True)
+
+    # Handlers run before the area reruns, so one click is one (fragment) rerun
+    st.markdown("<div class='btnrow'>", unsafe_allow_html=True)
+    c1, c2, c3, c4, c5 = st.columns([1,1,1,1,1])
+    with c1:
+        st.button("🔄", key="flip_btn", help="Retourner la carte", on_click=deck.flip)
+    with c2:
+        st.button("✅", key="know_btn", help="Je savais - Réduire la priorité", on_click=deck.grade, args=(QUALITY_KNOWN,))
+    with c3:
+        # Not saved: only step past the card for this session
+        st.button("≈", key="almost_btn", help="Presque - Passer sans modifier", on_click=deck.skip)
+    with c4:
+        st.button("❌", key="dont_btn", help="Je ne savais pas - Augmenter la priorité", on_click=deck.grade, args=(QUALITY_UNKNOWN,))
+    with c5:
+        flag_status = "🚩" if deck.info().get("is_difficult", False) else "🏳️"
+        st.button(flag_status, key="diff_btn", help="Basculer marqueur 'difficile'", on_click=deck.toggle_difficult)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+if _PROFILER.enabled:
+    for _name in ("build_export_df", "export_file", "import_rows", "next_card", "study_chunk", "apply_study_events", "get_term_sampler", "get_due_queue", "get_search_index", "possible_duplicates"):
+        globals()[_name] = _PROFILER.timed(_name, globals()[_name])
+_PROFILER.lap("helpers")
+
 # -------------- Enhanced Accueil --------------
 if page == "Accueil":
     st.markdown("""
@@ -1006,8 +3598,7 @@ if page == "Accueil":
     else:
         # Statistics overview
         total_lists = len(lists)
-        total_terms = sum(len(DM.load_terms_from_list_file(p)) for p in lists)
-        avg_progress = sum(DM.calculate_progress(p)[0] for p in lists) // total_lists if total_lists else 0
+        total_terms, avg_progress = DM.overview(lists)
         
         st.markdown("### 📊 Vue d'ensemble")
         col1, col2, col3 = st.columns(3)
@@ -1019,152 +3610,117 @@ if page == "Accueil":
             st.metric("📈 Progression moy.", f"{avg_progress}%")
         
         st.markdown("### 📋 Vos listes")
+        shown = lists
+        if len(lists) > LISTS_PER_PAGE:
+            query = st.text_input(
+                "🔎 Rechercher une liste", key="home_filter", placeholder="Nom de liste...",
+                on_change=lambda: st.session_state.update(home_page=0),
+            )
+            shown = filter_lists(lists, query)
+        pages = max(1, math.ceil(len(shown) / LISTS_PER_PAGE))
+        page_no = min(st.session_state.get("home_page", 0), pages - 1)
+
         st.markdown("<div class='cards'>", unsafe_allow_html=True)
-        for p in lists:
+        for p in shown[page_no * LISTS_PER_PAGE:(page_no + 1) * LISTS_PER_PAGE]:
             render_list_card(p)
         st.markdown("</div>", unsafe_allow_html=True)
 
+        if pages > 1:
+            pc1, pc2, pc3 = st.columns([1, 2, 1])
+            with pc1:
+                if st.button("⬅️ Précédentes", key="home_prev", disabled=page_no == 0, use_container_width=True):
+                    st.session_state.home_page = page_no - 1
+                    st.rerun()
+            with pc2:
+                st.markdown(f"<div style='text-align: center; color: var(--text-muted);'>Page {page_no + 1} / {pages}</div>", unsafe_allow_html=True)
+            with pc3:
+                if st.button("Suivantes ➡️", key="home_next", disabled=page_no >= pages - 1, use_container_width=True):
+                    st.session_state.home_page = page_no + 1
+                    st.rerun()
+
+    # Bulk import from CSV / TSV files or a spreadsheet paste
+    with st.expander("📥 Importer des termes (CSV / TSV)", expanded="import_result" in st.session_state):
+        if "import_result" in st.session_state:
+            st.success(st.session_state.pop("import_result"))
+        uploaded = st.file_uploader("📄 Fichier", type=["csv", "tsv", "txt"], key="import_file")
+        pasted = st.text_area("📋 Ou collez depuis Excel / Google Sheets", key="import_paste", height=100)
+        if uploaded is not None or pasted.strip():
+            ic1, ic2, ic3 = st.columns([1, 1, 2])
+            with ic1:
+                delim_choice = st.selectbox(
+                    "Séparateur", ["auto", *IMPORT_DELIMITERS], key="import_delim",
+                    format_func=lambda d: {"auto": "Auto", "\t": "Tabulation"}.get(d, d),
+                )
+            with ic2:
+                has_header = st.checkbox("En-têtes", value=True, key="import_header", help="La première ligne contient les noms des colonnes")
+            with ic3:
+                default_list = st.text_input("📚 Liste par défaut", value=st.session_state.current_list or "import", key="import_list", help="Pour les lignes sans colonne Liste")
+            delimiter = sniff_delimiter(open_import_source(uploaded, pasted)) if delim_choice == "auto" else delim_choice
+            sample = list(itertools.islice(iter_delimited(open_import_source(uploaded, pasted), delimiter), 6))
+            width = max((len(r) for r in sample), default=0)
+            st.dataframe(
+                pd.DataFrame([r + [""] * (width - len(r)) for r in sample], columns=[f"Colonne {i + 1}" for i in range(width)]),
+                use_container_width=True, hide_index=True,
+            )
+            # Same first guess as the React importer: term, then definition
+            role_cols = st.columns(max(width, 1))
+            mapping = {}
+            for i in range(width):
+                with role_cols[i]:
+                    mapping[i] = st.selectbox(
+                        f"Colonne {i + 1}", list(IMPORT_ROLES), index={0: 1, 1: 2}.get(i, 0),
+                        format_func=IMPORT_ROLES.get, key=f"import_role_{i}",
+                    )
+            if st.button("📥 Importer", type="primary", use_container_width=True, key="import_go", disabled="term" not in mapping.values()):
+                status = st.empty()
+                stats = import_rows(
+                    iter_delimited(open_import_source(uploaded, pasted), delimiter), mapping, default_list.strip(), has_header,
+                    on_batch=lambda done: status.caption(f"⏳ {done['imported']} terme(s) importé(s)..."),
+                )
+                lists_done = ", ".join(f"{k} ({v})" for k, v in stats["lists"].items()) or "—"
+                st.session_state.import_result = (
+                    f"✅ {stats['imported']} terme(s) importé(s) sur {stats['rows']} ligne(s) · "
+                    f"{stats['duplicates']} doublon(s), {stats['skipped']} ignorée(s) · Listes : {lists_done}"
+                )
+                st.rerun()
+
 # -------------- Enhanced Réviser --------------
 elif page == "Réviser":
-    if not current_list_path or not current_list_path.exists():
+    if not current_list_path or not DM.list_exists(current_list_path):
         st.warning("🎯 Choisissez une liste depuis l'accueil pour commencer à réviser.")
     else:
         # Header with list info
         st.markdown(f"## 🎯 Révision · {current_list_path.stem}")
         
         # Small controls: swap terms/defs, difficult filter
+        deck = get_study_deck()
         st.markdown("<div class='smallctl'>", unsafe_allow_html=True)
-        sc1, sc2 = st.columns(2)
+        sc1, sc2, sc3, sc4 = st.columns(4)
         with sc1:
             swap_label = "🔄 Inversé" if st.session_state.invert_mode else "🔄 Normal"
             if st.button(swap_label, key="swap_btn", help="Inverser terme/définition"):
                 st.session_state.invert_mode = not st.session_state.invert_mode
-                st.session_state.show_secondary = False
+                deck.state["show_back"] = False
         with sc2:
             filter_label = "🚩 Difficiles" if st.session_state.difficult_only else "📚 Toutes"
             if st.button(filter_label, key="filter_btn", help="Basculer filtre difficiles"):
                 st.session_state.difficult_only = not st.session_state.difficult_only
-                st.session_state.show_secondary = False
+                deck.state["show_back"] = False
+        with sc3:
+            mode_label = "⏰ Planifié" if st.session_state.scheduled_mode else "🎲 Aléatoire"
+            if st.button(mode_label, key="mode_btn", help="Cartes à revoir en premier (répétition espacée) ou tirage aléatoire"):
+                st.session_state.scheduled_mode = not st.session_state.scheduled_mode
+                deck.reset()
+        with sc4:
+            study_label = "⚡ Navigateur" if st.session_state.browser_study else "🖥️ Serveur"
+            if st.button(study_label, key="study_mode_btn", help="Réviser dans le navigateur : les notes sont envoyées par lots"):
+                st.session_state.browser_study = not st.session_state.browser_study
+                deck.reset()
         st.markdown("</div>", unsafe_allow_html=True)
 
-        terms = DM.load_terms_from_list_file(current_list_path)
-        if not terms:
-            st.info("📝 La liste est vide. Ajoutez des termes depuis l'éditeur.")
-        else:
-            progress = DM.load_progress(current_list_path)
-            definitions = DM.load_definitions(current_list_path)
-            percent, mastered, total, difficult = DM.calculate_progress(current_list_path)
-            
-            # Enhanced progress display
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("📈 Progression", f"{percent}%")
-            with col2:
-                st.metric("✅ Maîtrisés", f"{mastered}/{total}")
-            with col3:
-                st.metric("🚩 Difficiles", difficult)
-            with col4:
-                remaining = total - mastered
-                st.metric("⏳ Restants", remaining)
-
-            if st.session_state.current_term not in terms:
-                st.session_state.current_term = None
-
-            if st.session_state.current_term is None:
-                st.session_state.current_term = pick_next_term(
-                    terms, progress, definitions, st.session_state.difficult_only
-                )
-                st.session_state.show_secondary = False
-
-            current = st.session_state.current_term
-            if current is None:
-                st.success("🎉 Excellent ! Tout est maîtrisé pour les filtres actuels.")
-                st.balloons()
-            else:
-                primary = definitions.get(current, "") if st.session_state.invert_mode else current
-                secondary = current if st.session_state.invert_mode else definitions.get(current, "")
-
-                # Enhanced font sizing
-                def _fsize_class(txt: str) -> str:
-                    n = len(txt or "")
-                    if n <= 20:
-                        return 'base'
-                    elif n <= 90:
-                        return 'med'
-                    else:
-                        return 'long'
-                
-                front_cls = _fsize_class(primary)
-                back_cls = _fsize_class(secondary or '')
-                
-                # Enhanced card HTML
-                checked = "checked" if st.session_state.get("show_secondary", False) else ""
-                front_html = html_lib.escape(primary or "").replace("\n", "<br>")
-                back_html = html_lib.escape(secondary or "❓ Aucune définition").replace("\n", "<br>")
-
-                card_html = f"""
-                <div class="study">
-                  <input id="reveal" class="rev" type="checkbox" {checked} style="display: none;">
-                  <label for="reveal" class="flip">
-                    <div class="flip-inner">
-                      <div class="face front">
-                        <div class="content {front_cls}">
-                          <b>{front_html}</b>
-                        </div>
-                      </div>
-                      <div class="face back">
-                        <div class="content {back_cls}">
-                          {back_html}
-                        </div>
-                      </div>
-                    </div>
-                  </label>
-                </div>
-                """
-                st.markdown(card_html, unsafe_allow_html=True)
-
-                # Enhanced control buttons with better labels
-                st.markdown("<div class='btnrow'>", unsafe_allow_html=True)
-                c1, c2, c3, c4, c5 = st.columns([1,1,1,1,1])
-                with c1:
-                    if st.button("🔄", key="flip_btn", help="Retourner la carte"):
-                        st.session_state.show_secondary = not st.session_state.show_secondary
-                        st.rerun()
-                with c2:
-                    if st.button("✅", key="know_btn", help="Je savais - Réduire la priorité"):
-                        info = progress.get(current, {"score": 0, "is_difficult": False})
-                        info["score"] = score_known(int(info.get("score", 0)))
-                        progress[current] = info
-                        DM.save_progress(current_list_path, progress)
-                        st.session_state.show_secondary = False
-                        st.session_state.current_term = None
-                        st.session_state.just_advanced = True
-                        st.rerun()
-                with c3:
-                    if st.button("≈", key="almost_btn", help="Presque - Passer sans modifier"):
-                        st.session_state.show_secondary = False
-                        st.session_state.current_term = None
-                        st.session_state.just_advanced = True
-                        st.rerun()
-                with c4:
-                    if st.button("❌", key="dont_btn", help="Je ne savais pas - Augmenter la priorité"):
-                        info = progress.get(current, {"score": 0, "is_difficult": False})
-                        info["score"] = score_unknown(int(info.get("score", 0)))
-                        progress[current] = info
-                        DM.save_progress(current_list_path, progress)
-                        st.session_state.show_secondary = False
-                        st.session_state.current_term = None
-                        st.session_state.just_advanced = True
-                        st.rerun()
-                with c5:
-                    flag_status = "🚩" if progress.get(current, {}).get("is_difficult", False) else "🏳️"
-                    if st.button(flag_status, key="diff_btn", help="Basculer marqueur 'difficile'"):
-                        info = progress.get(current, {"score": 0, "is_difficult": False})
-                        info["is_difficult"] = not bool(info.get("is_difficult", False))
-                        progress[current] = info
-                        DM.save_progress(current_list_path, progress)
-                st.markdown("</div>", unsafe_allow_html=True)
+        study_area(current_list_path)
 
+        if DM.calculate_progress(current_list_path)[2]:
             # Enhanced reset actions
             with st.expander("🔧 Actions de réinitialisation"):
                 st.warning("⚠️ Ces actions sont irréversibles")
@@ -1182,31 +3738,38 @@ elif page == "Réviser":
 
 # -------------- Enhanced Parcourir --------------
 elif page == "Parcourir":
-    if not current_list_path or not current_list_path.exists():
+    if not current_list_path or not DM.list_exists(current_list_path):
         st.warning("🎯 Choisissez une liste depuis l'accueil.")
     else:
         st.markdown(f"## 📖 Parcourir · {current_list_path.stem}")
         
-        df = build_export_df(current_list_path)
+        full_df = build_export_df(current_list_path)
+        df = full_df
         
         # Enhanced search with filters
-        col1, col2 = st.columns([3, 1])
+        col1, col2, col3 = st.columns([3, 1, 1])
         with col1:
             q = st.text_input("🔍 Recherche", placeholder="Rechercher dans les termes et définitions...")
         with col2:
+            search_mode = st.selectbox("Mode", ["Contient", "Début du terme", "Approximative"], label_visibility="collapsed")
+        with col3:
             show_difficult_only = st.checkbox("🚩 Difficiles uniquement")
         
-        # Apply filters
+        # Apply filters (accents and case are ignored; approximate results come best match first)
         if q:
-            mask = df.apply(lambda row: q.lower() in str(row["Terme"]).lower() or q.lower() in str(row["Définition"]).lower(), axis=1)
-            df = df[mask]
+            index = get_search_index(current_list_path, full_df)
+            if search_mode == "Approximative":
+                rows, _ = index.fuzzy(q)
+                df = df.iloc[rows]
+            else:
+                df = df[index.search(q, prefix=search_mode == "Début du terme")]
         
         if show_difficult_only:
             df = df[df["Difficile"] == True]
         
         # Display results count
-        if len(df) != len(build_export_df(current_list_path)):
-            st.caption(f"📊 {len(df)} résultat(s) sur {len(build_export_df(current_list_path))} total")
+        if len(df) != len(full_df):
+            st.caption(f"📊 {len(df)} résultat(s) sur {len(full_df)} total")
         
         # Enhanced dataframe display
         st.dataframe(
@@ -1221,11 +3784,14 @@ elif page == "Parcourir":
             }
         )
         
-        # Export options
-        csv = df.to_csv(index=False).encode("utf-8")
+        # Export options: the whole list streams from the store, a filtered view comes from df
+        filtered = df
         st.download_button(
             "💾 Exporter en CSV",
-            data=csv,
+            data=(
+                functools.partial(export_file, current_list_path, "csv") if filtered is full_df
+                else lambda: filtered.to_csv(index=False).encode("utf-8")
+            ),
             file_name=f"{current_list_path.stem}_export.csv",
             mime="text/csv",
             use_container_width=True
@@ -1233,7 +3799,7 @@ elif page == "Parcourir":
 
 # -------------- Enhanced Éditer --------------
 elif page == "Éditer":
-    if not current_list_path or not current_list_path.exists():
+    if not current_list_path or not DM.list_exists(current_list_path):
         st.warning("🎯 Choisissez une liste depuis l'accueil.")
     else:
         st.markdown(f"## ✏️ Éditer · {current_list_path.stem}")
@@ -1243,8 +3809,29 @@ elif page == "Éditer":
         with tabs[0]:
             st.markdown("### 📚 Gestion des cartes")
             
-            rows = DM.load_table(current_list_path)
-            df = pd.DataFrame(rows)
+            df = build_export_df(current_list_path)
+            # Optimistic save: remember which version of the list the pending edits apply to
+            token_key = f"editor_token_{current_list_path.stem}"
+            editor_state = st.session_state.get(f"editor_{current_list_path.stem}") or {}
+            if token_key not in st.session_state or not any(editor_state.get(k) for k in ("edited_rows", "added_rows", "deleted_rows")):
+                st.session_state[token_key] = DM.table_token(current_list_path)
+
+            conflict_key = f"editor_conflict_{current_list_path.stem}"
+            if st.session_state.get(conflict_key):
+                st.error("⚠️ Cette liste a été modifiée par quelqu'un d'autre entre-temps. Rechargez-la avant de refaire vos changements.")
+                if st.button("🔄 Recharger la liste", key=f"reload_{current_list_path.stem}"):
+                    for key in (f"editor_{current_list_path.stem}", token_key, conflict_key):
+                        st.session_state.pop(key, None)
+                    st.rerun()
+
+            def save_edits(rows) -> bool:
+                try:
+                    DM.save_table(current_list_path, rows, expected=st.session_state[token_key])
+                except DM.TableConflictError:
+                    st.session_state[conflict_key] = True
+                    st.rerun()
+                st.session_state.pop(token_key, None)
+                return True
             
             # Quick stats
             col1, col2, col3 = st.columns(3)
@@ -1291,25 +3878,45 @@ elif page == "Éditer":
                     with ca5:
                         add_clicked = st.form_submit_button("➕ Ajouter la carte", use_container_width=True, type="primary")
                 
+                pending_key = f"pending_add_{current_list_path.stem}"
                 if add_clicked and new_term.strip():
-                    rows_out = edited.to_dict("records")
-                    rows_out.append({
+                    card = {
                         "Terme": new_term.strip(),
                         "Définition": new_def.strip(),
                         "Difficile": bool(new_diff),
                         "Score": int(new_score),
-                    })
-                    DM.save_table(current_list_path, rows_out)
-                    st.success("✅ Carte ajoutée avec succès !")
-                    st.rerun()
+                    }
+                    duplicates = possible_duplicates(current_list_path, df, card["Terme"])
+                    if duplicates:
+                        st.session_state[pending_key] = (card, duplicates)
+                    elif save_edits(pd.concat([edited, pd.DataFrame([card])], ignore_index=True)):
+                        st.success("✅ Carte ajoutée avec succès !")
+                        st.rerun()
+
+                # Near-duplicates wait for confirmation
+                pending = st.session_state.get(pending_key)
+                if pending:
+                    card, duplicates = pending
+                    st.warning(f"⚠️ « {card['Terme']} » ressemble à : {', '.join(duplicates)}")
+                    cd1, cd2 = st.columns([1, 1])
+                    with cd1:
+                        if st.button("➕ Ajouter quand même", use_container_width=True, key=f"confirm_add_{current_list_path.stem}"):
+                            del st.session_state[pending_key]
+                            if save_edits(pd.concat([edited, pd.DataFrame([card])], ignore_index=True)):
+                                st.success("✅ Carte ajoutée avec succès !")
+                                st.rerun()
+                    with cd2:
+                        if st.button("✖️ Ne pas ajouter", use_container_width=True, key=f"cancel_add_{current_list_path.stem}"):
+                            del st.session_state[pending_key]
+                            st.rerun()
 
             # Save/Cancel buttons
             col1, col2 = st.columns([1,1])
             with col1:
                 if st.button("💾 Enregistrer les modifications", type="primary", use_container_width=True):
-                    DM.save_table(current_list_path, edited.to_dict("records"))
-                    st.success("✅ Modifications enregistrées !")
-                    st.rerun()
+                    if save_edits(edited):
+                        st.success("✅ Modifications enregistrées !")
+                        st.rerun()
             with col2:
                 if st.button("↩️ Annuler les modifications", use_container_width=True):
                     st.info("🔄 Modifications annulées")
@@ -1373,22 +3980,19 @@ elif page == "Éditer":
         with tabs[2]:
             st.markdown("### 💾 Export et sauvegarde")
             
-            df = build_export_df(current_list_path)
-            
-            # Export preview
+            # Export preview, reusing the table loaded for the Cartes tab
             st.markdown("#### 👁️ Aperçu des données")
             st.dataframe(df, use_container_width=True, hide_index=True)
             
             # Export options
             st.markdown("#### 📤 Options d'export")
             
-            col1, col2 = st.columns(2)
+            col1, col2, col3 = st.columns(3)
             with col1:
                 # CSV export
-                csv = df.to_csv(index=False).encode("utf-8")
                 st.download_button(
                     "📊 Télécharger CSV",
-                    data=csv,
+                    data=functools.partial(export_file, current_list_path, "csv"),
                     file_name=f"{current_list_path.stem}_export.csv",
                     mime="text/csv",
                     use_container_width=True,
@@ -1396,24 +4000,29 @@ elif page == "Éditer":
                 )
             
             with col2:
+                # JSON Lines, one card per line
+                st.download_button(
+                    "📄 Télécharger JSON Lines",
+                    data=functools.partial(export_file, current_list_path, "jsonl"),
+                    file_name=f"{current_list_path.stem}_export.jsonl",
+                    mime="application/x-ndjson",
+                    use_container_width=True,
+                    help="Une carte par ligne, pratique pour les scripts"
+                )
+
+            with col3:
                 # JSON export for backup
-                backup_data = {
-                    "list_name": current_list_path.stem,
-                    "export_date": datetime.now().isoformat(),
-                    "terms": DM.load_terms_from_list_file(current_list_path),
-                    "definitions": DM.load_definitions(current_list_path),
-                    "progress": DM.load_progress(current_list_path)
-                }
-                json_data = json.dumps(backup_data, ensure_ascii=False, indent=2).encode("utf-8")
                 st.download_button(
                     "💾 Sauvegarde JSON",
-                    data=json_data,
+                    data=functools.partial(export_file, current_list_path, "backup"),
                     file_name=f"{current_list_path.stem}_backup.json",
                     mime="application/json",
                     use_container_width=True,
                     help="Sauvegarde complète avec progression"
                 )
 
+_PROFILER.lap(f"page {page}")
+
 # -----------------------------
 # Enhanced Global FAB + Create List modal
 # -----------------------------
@@ -1477,4 +4086,54 @@ if page == "Accueil":
             <p>🧠 <strong>FlashLet</strong> - Révision intelligente par cartes mémoire</p>
             <p style='font-size: 0.875rem;'>Développé avec ❤️ pour l'apprentissage efficace</p>
         </div>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    """, unsafe_allow_html=True)
+
+# Started once the page is drawn, so the run that starts it does not compete with it
+_PRELOAD = _preload()
+
+# -----------------------------
+# Profiling panel (FLASHLET_PROFILE=1)
+# -----------------------------
+_PROFILER.lap("footer")
+_profile = _PROFILER.end(page=page, user=st.session_state.user_name, list=st.session_state.current_list)
+if _profile is not None:
+    with st.sidebar.expander(f"⏱️ Profilage : {_profile['total'] * 1000:.0f} ms", expanded=False):
+        st.caption("Exécution qui vient de s'afficher, panneau non compris")
+        st.dataframe(
+            pd.DataFrame({"Section": list(_profile["sections"]), "ms": [round(v * 1000, 1) for v in _profile["sections"].values()]}),
+            hide_index=True, use_container_width=True,
+        )
+        if _profile["calls"]:
+            st.dataframe(
+                pd.DataFrame({
+                    "Appel": list(_profile["calls"]),
+                    "n": [c["n"] for c in _profile["calls"].values()],
+                    "ms": [round(c["s"] * 1000, 1) for c in _profile["calls"].values()],
+                }),
+                hide_index=True, use_container_width=True,
+            )
+        _preloaded = _PRELOAD and _PRELOAD["report"]
+        if _preloaded:
+            st.caption(
+                f"🔥 Préchargement : {_preloaded['lists']} liste(s) en {_preloaded['seconds'] * 1000:.0f} ms "
+                f"({_preloaded['workers']} threads, la plus lente {_preloaded['slowest'] * 1000:.0f} ms)"
+            )
+        elif _PRELOAD is not None:
+            st.caption("🔥 Préchargement en cours…")
+        _io = _profile["io"]
+        st.caption(
+            f"📂 {_io['reads']} lecture(s), {_io['read_bytes'] / 1024:.0f} Ko · "
+            f"💾 {_io['writes']} écriture(s), {_io['write_bytes'] / 1024:.0f} Ko · "
+            f"journal : {_PROFILER.log_path.name}"
+        )
+        if "cprofile" in _profile:
+            st.session_state._cprofile_last = _profile["cprofile"]
+        if st.session_state.get("_cprofile_last"):
+            st.code(st.session_state._cprofile_last["text"], language=None)
+            st.download_button(
+                "⬇️ Télécharger le .prof", data=st.session_state._cprofile_last["data"],
+                file_name="flashlet_rerun.prof", mime="application/octet-stream", use_container_width=True,
+            )
+        if st.button("🔬 Profiler la prochaine exécution (cProfile)", key="cprofile_next", use_container_width=True):
+            st.session_state._cprofile_next = True
+            st.rerun()
@@ -0,0 +1,57 @@
+import importlib.util
+import logging
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+HERE = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory):
+    """The app module, imported from a copy so its bare script run works on an empty tree"""
+    base = tmp_path_factory.mktemp("app")
+    shutil.copy2(HERE / "streamlit_app.py", base / "streamlit_app.py")
+    shutil.copytree(HERE / "components", base / "components")
+    os.environ["FLASHLET_WATCH"] = "off"
+    os.environ["FLASHLET_DURABILITY"] = "none"
+    logging.disable(logging.WARNING)
+    return _load(base / "streamlit_app.py", "streamlit_app")
+
+
+@pytest.fixture
+def rerun_app(app):
+    """Another module from the same script, as Streamlit makes on every rerun"""
+    return _load(Path(app.__file__), "streamlit_app_rerun")
+
+
+def _load(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def write_list(tmp_path):
+    """Create Liste/<stem>.txt under tmp_path and return its path"""
+    def write(stem, terms):
+        path = tmp_path / "Liste" / f"{stem}.txt"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text("\n".join(terms) + "\n", encoding="utf-8")
+        return path
+    return write
+
+
+@pytest.fixture
+def make_manager(app, tmp_path, monkeypatch):
+    """DataManager over tmp_path; `write_behind_ms=0` writes grades before returning"""
+    def make(storage="files", write_behind_ms=0):
+        monkeypatch.delenv("FLASHLET_DB", raising=False)
+        monkeypatch.setenv("FLASHLET_WRITE_BEHIND_MS", str(write_behind_ms))
+        return app.DataManager(tmp_path, storage)
+    return make
@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def syscalls(app, monkeypatch):
+    """fsync and replace calls in order; an fsync is recorded as the inode it synced"""
+    calls = []
+    fsync, replace = os.fsync, os.replace
+
+    def record_fsync(fd):
+        calls.append(("fsync", os.fstat(fd).st_ino))
+        fsync(fd)
+
+    def record_replace(src, dst):
+        calls.append(("replace", os.stat(src).st_ino))
+        replace(src, dst)
+
+    monkeypatch.setattr(app.os, "fsync", record_fsync)
+    monkeypatch.setattr(app.os, "replace", record_replace)
+    return calls
+
+
+def _ino(path):
+    return os.stat(path).st_ino
+
+
+def test_group_mode_syncs_the_file_before_renaming_it(app, tmp_path, syscalls):
+    writer = app._DurableWriter("group", interval_ms=60_000)
+    path = tmp_path / "verbs_progress.json"
+    path.write_text("old", encoding="utf-8")
+    writer.write_text(path, "new")
+
+    assert path.read_text(encoding="utf-8") == "new"
+    assert syscalls == [("fsync", _ino(path)), ("replace", _ino(path))]
+    assert os.listdir(tmp_path) == ["verbs_progress.json"]
+
+    # only the directory entry is left for the group commit
+    writer.flush()
+    assert syscalls[2:] == [("fsync", _ino(tmp_path))]
+    writer.flush()
+    assert len(syscalls) == 3
+
+
+def test_group_mode_batches_appends(app, tmp_path, syscalls):
+    writer = app._DurableWriter("group", interval_ms=60_000)
+    journal = tmp_path / "verbs_progress.journal"
+    writer.append_text(journal, "a\n")
+    writer.append_text(journal, "b\n")
+    assert syscalls == []
+
+    writer.flush()
+    assert journal.read_text(encoding="utf-8") == "a\nb\n"
+    assert syscalls == [("fsync", _ino(journal)), ("fsync", _ino(tmp_path))]
+
+
+def test_fsync_mode_syncs_before_returning(app, tmp_path, syscalls):
+    writer = app._DurableWriter("fsync")
+    path = tmp_path / "verbs.txt"
+    writer.write_text(path, "ser\n")
+    assert syscalls == [("fsync", _ino(path)), ("replace", _ino(path)), ("fsync", _ino(tmp_path))]
+    writer.append_text(path, "ir\n")
+    assert syscalls[3:] == [("fsync", _ino(path)), ("fsync", _ino(tmp_path))]
+
+
+def test_none_mode_never_syncs(app, tmp_path, syscalls):
+    writer = app._DurableWriter("none")
+    writer.write_text(tmp_path / "verbs.txt", "ser\n")
+    writer.append_text(tmp_path / "verbs.txt", "ir\n")
+    writer.flush()
+    assert [name for name, _ in syscalls] == ["replace"]
+
+
+def test_a_failed_write_keeps_the_old_file(app, tmp_path, monkeypatch):
+    writer = app._DurableWriter("group", interval_ms=60_000)
+    path = tmp_path / "verbs.txt"
+    path.write_text("ser\n", encoding="utf-8")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(app.os, "replace", fail)
+    with pytest.raises(OSError):
+        writer.write_text(path, "ir\n")
+    assert path.read_text(encoding="utf-8") == "ser\n"
+    assert os.listdir(tmp_path) == ["verbs.txt"]
+
+
+def test_unknown_mode(app):
+    with pytest.raises(ValueError):
+        app._DurableWriter("sometimes")
@@ -0,0 +1,56 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(params=["files", "sqlite"])
+def verbs(request, app, make_manager, write_list, monkeypatch):
+    """A list with awkward definitions, a progress-only term and a grade still waiting to be written"""
+    list_path = write_list("verbs", ["ser", "estar", 'dire "oui"', "ir", "ñandú"])
+    dm = make_manager(request.param, write_behind_ms=60_000)
+    dm.save_definitions(list_path, {"ser": "être, exister", "estar": 'être "là"\nou ici', "ñandú": "nandou; oiseau"})
+    dm.update_progress_many(list_path, {
+        "ser": app.schedule_review({}, app.QUALITY_KNOWN),
+        "ir": {"score": -1, "is_difficult": True},
+        "volver": {"score": 2, "is_difficult": False},
+    })
+    monkeypatch.setattr(app, "DM", dm)
+    return list_path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+def test_streamed_csv_matches_the_table(app, verbs, chunk_size):
+    streamed = b"".join(app.iter_export_csv(verbs, chunk_size))
+    assert streamed == app.build_export_df(verbs).to_csv(index=False, lineterminator="\n").encode("utf-8")
+    assert pd.read_csv(io.BytesIO(streamed), keep_default_na=False)["Terme"].tolist() == [
+        "ser", "estar", 'dire "oui"', "ir", "ñandú", "volver",
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+def test_streamed_jsonl_matches_the_table(app, verbs, chunk_size):
+    lines = b"".join(app.iter_export_jsonl(verbs, chunk_size)).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == app.build_export_df(verbs).to_dict("records")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+def test_streamed_backup_matches_a_plain_dump(app, verbs, chunk_size):
+    dm = app.DM
+    backup = json.loads(b"".join(app.iter_backup_json(verbs, chunk_size)))
+    assert backup.pop("list_name") == "verbs" and backup.pop("export_date")
+    assert backup == {
+        "terms": dm.load_terms_from_list_file(verbs),
+        "definitions": dm.load_definitions(verbs),
+        "progress": dm.load_progress(verbs),
+    }
+    assert backup["progress"]["ser"]["due"]
+
+
+def test_empty_list_exports(app, make_manager, write_list, monkeypatch):
+    list_path = write_list("empty", [])
+    monkeypatch.setattr(app, "DM", make_manager())
+    assert app.export_file(list_path, "csv").getvalue() == b"Terme,D\xc3\xa9finition,Score,Difficile\n"
+    assert app.export_file(list_path, "jsonl").getvalue() == b""
+    assert json.loads(app.export_file(list_path, "backup").getvalue())["terms"] == []
@@ -0,0 +1,62 @@
+import io
+
+import pytest
+
+
+@pytest.mark.parametrize("delimiter", [";", "\t", ","])
+def test_sniff_delimiter(app, delimiter):
+    text = "\n".join(delimiter.join(row) for row in [["term", "definition"], ["ser", "être, exister"], ["ir", "aller"]])
+    if delimiter == ",":
+        text = text.replace("être, exister", '"être; exister"')
+    assert app.sniff_delimiter(io.StringIO(text)) == delimiter
+
+
+def test_sniff_delimiter_skips_the_bom_and_falls_back_to_comma(app):
+    assert app.sniff_delimiter(io.StringIO("﻿ser\tto be\nir\tto go\n")) == "\t"
+    assert app.sniff_delimiter(io.StringIO("ser\nir\n")) == ","
+
+
+def test_map_row_follows_the_column_roles(app):
+    mapping = {0: "definition", 1: "term", 2: "ignore", 3: "tags", 4: "list"}
+    row = ["être", " ser ", "x", "verbe; irrégulier,  ", "Verbes"]
+    assert app.map_row(row, mapping, "import") == {
+        "term": "ser", "definition": "être", "list": "Verbes", "tags": ["verbe", "irrégulier"],
+    }
+    # a blank list cell keeps the default list
+    assert app.map_row(["être", "ser", "", "", " "], mapping, "import")["list"] == "import"
+
+
+def test_map_row_short_and_malformed_rows(app):
+    mapping = {0: "term", 1: "definition", 2: "list"}
+    assert app.map_row(["ser"], mapping, "import") == {"term": "ser", "list": "import"}
+    assert app.map_row([], mapping, "import") is None
+    assert app.map_row(["  ", "être"], mapping, "import") is None
+
+
+def test_import_rows_routes_and_deduplicates(app, make_manager, write_list, monkeypatch):
+    write_list("Verbes", ["ser"])
+    dm = make_manager()
+    monkeypatch.setattr(app, "DM", dm)
+    text = (
+        "Définition;Terme;Liste\n"
+        "être;ser;Verbes\n"             # already in the list
+        "aller;ir;Verbes\n"
+        "aller encore;ir;Verbes\n"      # repeated in the file
+        "maison;casa;\n"                # default list
+        ";;\n"                          # no term
+        "seul\n"                        # short row: the term column is missing
+        "chat;gato;Noms/Animaux\n"      # list name made safe for a file name
+    )
+    rows = app.iter_delimited(io.StringIO(text, newline=""), app.sniff_delimiter(io.StringIO(text)))
+    batches = []
+    stats = app.import_rows(rows, {0: "definition", 1: "term", 2: "list"}, "import", batch_size=1, on_batch=batches.append)
+
+    assert stats["rows"] == 7 and stats["imported"] == 3
+    assert stats["duplicates"] == 2 and stats["skipped"] == 2
+    assert stats["lists"] == {"Verbes": 1, "import": 1, "Noms_Animaux": 1}
+    assert len(batches) == 3
+    verbes = dm.get_list_file_path("Verbes")
+    assert dm.load_terms_from_list_file(verbes) == ["ser", "ir"]
+    assert dm.load_definitions(verbes) == {"ir": "aller"}
+    assert dm.load_terms_from_list_file(dm.get_list_file_path("import")) == ["casa"]
+    assert dm.load_definitions(dm.get_list_file_path("Noms_Animaux")) == {"gato": "chat"}
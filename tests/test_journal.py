@@ -0,0 +1,27 @@
+def test_journal_is_replayed_after_a_crash(app, tmp_path, write_list):
+    list_path = write_list("verbs", ["ser", "estar", "ir"])
+    files = app.FileBackend(tmp_path, journal_max=50)
+    files.save_progress(list_path, {"ser": {"score": 1, "is_difficult": False}})
+    files.update_progress(list_path, "ser", {"score": 3, "is_difficult": False})
+    files.update_progress(list_path, "estar", {"score": -1, "is_difficult": True})
+    # killed halfway through the next append
+    with open(files.get_journal_file_path(list_path), "a", encoding="utf-8") as f:
+        f.write('{"t":"ir","s":')
+
+    progress = app.FileBackend(tmp_path).load_progress(list_path)
+    assert progress["ser"]["score"] == 3
+    assert progress["estar"] == {"score": -1, "is_difficult": True}
+    assert "ir" not in progress
+
+
+def test_journal_of_an_older_snapshot_is_ignored(app, tmp_path, write_list):
+    list_path = write_list("verbs", ["ser"])
+    files = app.FileBackend(tmp_path, journal_max=50)
+    files.save_progress(list_path, {})
+    files.update_progress(list_path, "ser", {"score": 3, "is_difficult": False})
+    journal = files.get_journal_file_path(list_path).read_text(encoding="utf-8")
+    # a new snapshot was written, then the crash left the previous journal behind
+    files.save_progress(list_path, {"ser": {"score": 5, "is_difficult": False}})
+    files.get_journal_file_path(list_path).write_text(journal, encoding="utf-8")
+
+    assert app.FileBackend(tmp_path).load_progress(list_path)["ser"]["score"] == 5
@@ -0,0 +1,54 @@
+import random
+from collections import Counter
+
+
+class _Every:
+    """Stands in for random: hands out each target of randrange in turn"""
+
+    def __init__(self):
+        self.targets = iter(())
+
+    def draws(self, sampler):
+        self.targets = iter(range(sampler.total))
+        return Counter(sampler.sample(self) for _ in range(sampler.total))
+
+    def randrange(self, stop):
+        return next(self.targets)
+
+
+def test_every_term_is_drawn_in_proportion_to_its_weight(app):
+    weights = {f"t{i}": w for i, w in enumerate([3, 1, 0, 7, 2, 5, 1, 4, 6, 2, 9])}
+    sampler = app.WeightedSampler(list(weights), list(weights.values()))
+    assert _Every().draws(sampler) == {t: w for t, w in weights.items() if w}
+
+    rng = random.Random(0)
+    counts = Counter(sampler.sample(rng) for _ in range(20_000))
+    for term, weight in weights.items():
+        assert abs(counts[term] / 20_000 - weight / sampler.total) < 0.02
+
+
+def test_set_updates_the_draws(app):
+    sampler = app.WeightedSampler(["ser", "estar", "ir", "ser"], [2, 3, 4, 100])
+    assert sampler.terms == ["ser", "estar", "ir"]  # duplicates keep their first weight
+
+    sampler.set("estar", 0)
+    sampler.set("ir", 1)
+    sampler.set("unknown", 5)
+    assert sampler.total == 3
+    assert _Every().draws(sampler) == {"ser": 2, "ir": 1}
+
+    sampler.set("ser", 0)
+    sampler.set("ir", 0)
+    assert sampler.sample() is None
+    sampler.set("estar", 1)
+    assert {sampler.sample() for _ in range(50)} == {"estar"}
+
+
+def test_card_weights_follow_the_scores(app):
+    cards = app.CardTable(app.CardLayout(["a", "b", "c", "d"], {}), {
+        "a": {"score": -2, "is_difficult": True},
+        "b": {"score": 0, "is_difficult": False},
+        "c": {"score": 4, "is_difficult": True},
+    })
+    assert app.card_weights(cards) == [0, 3, 7, 3]
+    assert app.card_weights(cards, difficult_only=True) == [0, 0, 7, 0]
@@ -0,0 +1,98 @@
+import pytest
+
+
+def _rows(dm, list_path):
+    return [(t, d, s, diff) for t, d, s, diff in dm.load_table(list_path).itertuples(index=False)]
+
+
+@pytest.mark.parametrize("storage", ["files", "sqlite"])
+def test_renaming_a_term_keeps_every_users_progress(make_manager, write_list, storage):
+    list_path = write_list("verbs", ["ser", "estar"])
+    dm = make_manager(storage)
+    alice, bob = dm.for_user("alice"), dm.for_user("bob")
+    bob.update_progress(list_path, "ser", {"score": 5, "is_difficult": True})
+    alice.update_progress(list_path, "estar", {"score": 2, "is_difficult": False})
+
+    table = alice.load_table(list_path)
+    table.loc[0, "Terme"] = "ser (être)"
+    alice.save_table(list_path, table)
+
+    assert alice.load_terms_from_list_file(list_path) == ["ser (être)", "estar"]
+    assert bob.load_progress(list_path) == {"ser (être)": {"score": 5, "is_difficult": True}}
+    assert bob.calculate_progress(list_path)[3] == 1
+    assert alice.load_progress(list_path) == {"estar": {"score": 2, "is_difficult": False}}
+
+
+@pytest.fixture(params=["files", "sqlite"])
+def verbs(request, make_manager, write_list):
+    """(manager, list path) of a three-term list with a definition and some progress"""
+    list_path = write_list("verbs", ["ser", "estar", "ir"])
+    dm = make_manager(request.param)
+    dm.save_definitions(list_path, {"ser": "to be", "ir": "to go"})
+    dm.update_progress(list_path, "estar", {"score": 3, "is_difficult": True})
+    return dm, list_path
+
+
+def _save(dm, list_path, rows):
+    dm.save_table(list_path, [dict(zip(("Terme", "Définition", "Score", "Difficile"), r)) for r in rows])
+
+
+def test_unchanged_table_writes_nothing(verbs):
+    dm, list_path = verbs
+    version = dm.list_version(list_path)
+    dm.save_table(list_path, dm.load_table(list_path))
+    assert dm.list_version(list_path) == version
+
+
+def test_add_delete_and_edit(verbs):
+    dm, list_path = verbs
+    _save(dm, list_path, [
+        ("ser", "to be (permanent)", 0, False),
+        ("estar", "", 1, True),
+        ("tener", "to have", 0, False),
+    ])
+    assert _rows(dm, list_path) == [
+        ("ser", "to be (permanent)", 0, False),
+        ("estar", "", 1, True),
+        ("tener", "to have", 0, False),
+    ]
+    assert dm.load_definitions(list_path) == {"ser": "to be (permanent)", "tener": "to have"}
+    assert set(dm.load_progress(list_path)) == {"estar"}
+    assert dm.calculate_progress(list_path) == (0, 0, 3, 1)
+
+
+def test_rename_keeps_definition_and_progress(verbs):
+    dm, list_path = verbs
+    _save(dm, list_path, [("ser", "to be", 0, False), ("estar (be)", "", 3, True), ("ir", "to go", 0, False)])
+    assert dm.load_terms_from_list_file(list_path) == ["ser", "estar (be)", "ir"]
+    progress = dm.load_progress(list_path)
+    assert "estar" not in progress and progress["estar (be)"]["score"] == 3
+
+
+def test_reorder(verbs):
+    dm, list_path = verbs
+    rows = _rows(dm, list_path)[::-1]
+    _save(dm, list_path, rows)
+    assert _rows(dm, list_path) == rows
+    assert dm.load_progress(list_path)["estar"]["is_difficult"] is True
+
+
+def test_duplicates_and_blank_terms_are_dropped(verbs):
+    dm, list_path = verbs
+    _save(dm, list_path, [
+        ("ser", "to be", 0, False),
+        ("ser", "duplicate", 4, True),
+        ("", "no term", 0, False),
+        (None, None, None, None),
+        ("estar", "", 3, True),
+    ])
+    assert _rows(dm, list_path) == [("ser", "to be", 0, False), ("estar", "", 3, True)]
+    assert dm.load_definitions(list_path) == {"ser": "to be"}
+
+
+def test_a_fresh_manager_reads_back_the_same_table(app, verbs, make_manager):
+    dm, list_path = verbs
+    _save(dm, list_path, [("ir", "to go", 2, False), ("tener", "to have", 0, True), ("estar", "", 3, True)])
+    expected = _rows(dm, list_path)
+    fresh = make_manager("sqlite" if isinstance(dm.store, app.SQLiteBackend) else "files")
+    assert _rows(fresh, list_path) == expected
@@ -0,0 +1,22 @@
+def test_intervals_grow_with_each_good_review(app):
+    info, now, intervals = {"score": 0, "is_difficult": False}, 1_000_000, []
+    for _ in range(4):
+        info = app.schedule_review(info, app.QUALITY_KNOWN, now=now)
+        intervals.append(info["interval"])
+        assert info["due"] == now + int(info["interval"] * 86400)
+        now = info["due"]
+    assert intervals[:2] == [1.0, 6.0]
+    assert intervals[2] == round(6.0 * info["ease"], 2)
+    assert intervals == sorted(intervals) and len(set(intervals)) == 4
+    assert info["reps"] == 4
+
+
+def test_a_lapse_starts_over(app):
+    info = {"score": 0, "is_difficult": False}
+    for _ in range(3):
+        info = app.schedule_review(info, app.QUALITY_KNOWN, now=0)
+    lapsed = app.schedule_review(info, app.QUALITY_UNKNOWN, now=100)
+    assert lapsed["reps"] == 0 and lapsed["interval"] == 0
+    assert lapsed["due"] == 100 + app.RELEARN_DELAY
+    assert lapsed["ease"] < info["ease"]
+    assert app.schedule_review(lapsed, app.QUALITY_KNOWN, now=100)["interval"] == 1.0
@@ -0,0 +1,69 @@
+import random
+
+import numpy as np
+
+TERMS = ["Être", "étudier", "estar", "ser", "Ir", "irse", "hablar", "habitación", "Cañón", "cancion", "casa", "cosa", "a"]
+DEFINITIONS = ["to be", "to study", "to be (state)", "to be", "to go", "to leave", "to speak", "room", "canyon", "song", "", "thing", "to"]
+
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a | b else 0.0
+
+
+def test_search_matches_a_plain_scan(app):
+    index = app.SearchIndex(TERMS, DEFINITIONS)
+    folded = [(app.fold_text(t), app.fold_text(d)) for t, d in zip(TERMS, DEFINITIONS)]
+    for query in ["", "a", "ET", "etu", "tud", "to be", "cañ", "canon", "ion", "xyz", " ir "]:
+        q = app.fold_text(query).strip()
+        contains = [not q or q in t or q in d for t, d in folded]
+        prefix = [t.startswith(q) for t, _ in folded]
+        assert index.search(query).tolist() == contains, query
+        assert index.search(query, prefix=True).tolist() == prefix, query
+
+
+def test_fuzzy_scores_are_trigram_jaccard(app):
+    index = app.SearchIndex(TERMS, DEFINITIONS)
+    for query in ["etudiar", "abitacion", "canon", "to bee", "zz"]:
+        grams = app._trigrams(f"  {app.fold_text(query)} ")
+        expected = {
+            i: max(_jaccard(grams, app._trigrams(f"  {app.fold_text(t)} ")), _jaccard(grams, app._trigrams(f"  {app.fold_text(d)} ")))
+            for i, (t, d) in enumerate(zip(TERMS, DEFINITIONS))
+        }
+        rows, scores = index.fuzzy(query, threshold=0.2, limit=len(TERMS))
+        assert sorted(rows.tolist()) == sorted(i for i, s in expected.items() if s >= 0.2), query
+        assert np.allclose(scores, [expected[i] for i in rows])
+        assert list(scores) == sorted(scores, reverse=True)
+
+    rows, _ = index.fuzzy("habitacion", definitions=False)
+    assert TERMS[rows[0]] == "habitación"
+    # "song" only matches a definition
+    assert index.fuzzy("song")[0].tolist() == [9] and not len(index.fuzzy("song", definitions=False)[0])
+
+
+def test_search_on_a_larger_list(app):
+    rng = random.Random(3)
+    words = ["".join(rng.choice("abcdeé") for _ in range(rng.randint(1, 8))) for _ in range(2000)]
+    index = app.SearchIndex(words, [""] * len(words))
+    for query in ["abc", "éa", "dd", "bad", "eee"]:
+        q = app.fold_text(query)
+        assert np.flatnonzero(index.search(query)).tolist() == [i for i, w in enumerate(words) if q in app.fold_text(w)]
+
+
+def test_each_table_shape_keeps_its_own_index(app, make_manager, write_list, monkeypatch):
+    list_path = write_list("verbs", ["ser", "estar"])
+    dm = make_manager()
+    # bob has progress on a term that is no longer in the list: his table has one more row
+    dm.for_user("bob").update_progress(list_path, "ir", {"score": 1, "is_difficult": False})
+
+    monkeypatch.setattr(app, "DM", dm.for_user("ana"))
+    ana = app.get_search_index(list_path, app.DM.load_table(list_path))
+    monkeypatch.setattr(app, "DM", dm.for_user("bob"))
+    bob_table = app.DM.load_table(list_path)
+    bob = app.get_search_index(list_path, bob_table)
+    assert (ana.size, bob.size) == (2, 3)
+    assert bob_table["Terme"].iloc[np.flatnonzero(bob.search("ir"))].tolist() == ["ir"]
+
+    # both stay cached: switching back does not rebuild either
+    assert app.get_search_index(list_path, bob_table) is bob
+    monkeypatch.setattr(app, "DM", dm.for_user("ana"))
+    assert app.get_search_index(list_path, app.DM.load_table(list_path)) is ana
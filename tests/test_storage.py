@@ -0,0 +1,121 @@
+import pytest
+
+
+def test_migration_copies_every_user(app, tmp_path, write_list):
+    list_path = write_list("verbs", ["ser", "estar", "ir"])
+    files = app.FileBackend(tmp_path, journal_max=50)
+    files.save_progress(list_path, {"ser": {"score": 3, "is_difficult": False}})
+    ana = files.for_user("ana")
+    ana.save_progress(list_path, {"estar": {"score": 1, "is_difficult": True}})
+    # still in the journal, not folded into the snapshot
+    ana.update_progress(list_path, "ir", {"score": -2, "is_difficult": False})
+    assert ana.get_journal_file_path(list_path).exists()
+
+    db = app.SQLiteBackend(tmp_path / "flashlet.db", tmp_path / "Liste")
+    assert db.migrate_from(files) == 1
+    assert db.load_progress(list_path)["ser"]["score"] == 3
+    migrated = db.for_user("ana").load_progress(list_path)
+    assert migrated["estar"]["is_difficult"] is True
+    assert migrated["ir"]["score"] == -2
+    assert "ser" not in migrated
+
+
+def test_users_are_migrated_into_older_databases(app, tmp_path, write_list):
+    list_path = write_list("verbs", ["ser"])
+    files = app.FileBackend(tmp_path)
+    db = app.SQLiteBackend(tmp_path / "flashlet.db", tmp_path / "Liste")
+    db.migrate_from(files)
+    # a database migrated before the per-user copy existed
+    with db._transaction():
+        db._conn.execute("DELETE FROM meta WHERE key = 'migrated_users_from_files'")
+    files.for_user("ana").save_progress(list_path, {"ser": {"score": 2, "is_difficult": False}})
+
+    assert db.migrate_from(files) == 0
+    assert db.for_user("ana").load_progress(list_path)["ser"]["score"] == 2
+
+
+def test_rename_moves_journal_and_delete_drops_lock_file(app, tmp_path, write_list):
+    list_path = write_list("verbs", ["ser", "estar"])
+    files = app.FileBackend(tmp_path)
+    files.update_progress(list_path, "ser", {"score": 4, "is_difficult": False})
+
+    new_path = files.rename_list("verbs", "verbos")
+    assert not list(tmp_path.glob("Save/verbs_progress.*"))
+    assert files.load_progress(new_path)["ser"]["score"] == 4
+
+    files.delete_list("verbos")
+    assert not files.list_exists(new_path)
+    assert not (tmp_path / "Save" / ".verbos.lock").exists()
+    assert not (tmp_path / "Save" / "verbos_progress.journal").exists()
+
+
+@pytest.mark.parametrize("storage", ["files", "sqlite"])
+def test_save_over_someone_elses_edit_is_refused(app, make_manager, write_list, storage):
+    list_path = write_list("verbs", ["ser", "estar"])
+    dm = make_manager(storage)
+    token = dm.table_token(list_path)
+    mine = dm.load_table(list_path)
+    theirs = dm.load_table(list_path)
+    theirs.loc[0, "Définition"] = "to be"
+    dm.save_table(list_path, theirs, expected=token)
+
+    mine.loc[1, "Définition"] = "to be (state)"
+    with pytest.raises(app.TableConflictError):
+        dm.save_table(list_path, mine, expected=token)
+    assert dm.load_definitions(list_path) == {"ser": "to be"}
+    # reloaded, the same edit goes through
+    token, mine = dm.table_token(list_path), dm.load_table(list_path)
+    mine.loc[1, "Définition"] = "to be (state)"
+    dm.save_table(list_path, mine, expected=token)
+    assert dm.load_definitions(list_path) == {"ser": "to be", "estar": "to be (state)"}
+
+
+def test_conflict_is_caught_from_a_later_rerun(app, rerun_app, make_manager, write_list, tmp_path):
+    list_path = write_list("verbs", ["ser"])
+    dm = make_manager()  # cached from the first run
+    token = dm.table_token(list_path)
+    dm.save_terms_to_list_file(list_path, ["ser", "estar"])
+
+    profiler = rerun_app._Profiler(True, tmp_path / "profile.jsonl")
+    DM = rerun_app._TimedProxy(dm, "DM", profiler)
+    assert DM.TableConflictError is not rerun_app.TableConflictError
+    with pytest.raises(DM.TableConflictError):
+        DM.save_table(list_path, [{"Terme": "ir"}], expected=token)
+
+
+@pytest.mark.parametrize("storage", ["files", "sqlite"])
+def test_home_totals_read_every_list_at_once(app, make_manager, write_list, storage, monkeypatch):
+    lists = [write_list("verbs", ["ser", "estar", "ir"]), write_list("nouns", ["casa"]), write_list("empty", [])]
+    dm = make_manager(storage)
+    dm.update_progress(lists[0], "ser", {"score": -2, "is_difficult": False})
+    dm.update_progress(lists[1], "casa", {"score": -3, "is_difficult": False})
+    assert dm.overview(lists) == (4, (33 + 100 + 0) // 3)
+    assert dm.for_user("ana").overview(lists) == (4, 0)
+    assert dm.store.list_users() == [""]
+
+    # a new server: no list is parsed, the stored aggregates of all of them are read once
+    fresh = make_manager(storage)
+    reads = []
+    monkeypatch.setattr(fresh.store, "load_progress", lambda *a: pytest.fail("parsed a list"))
+    monkeypatch.setattr(fresh.store, "load_stats", lambda *a: pytest.fail("read one list's aggregates"))
+    monkeypatch.setattr(fresh.store, "load_all_stats", lambda load=fresh.store.load_all_stats: reads.append(1) or load())
+    assert fresh.overview(lists) == (4, 44)
+    assert fresh.overview(lists) == (4, 44)
+    assert reads == [1]
+
+
+def test_stale_home_totals_are_recomputed(app, make_manager, write_list, monkeypatch):
+    verbs = write_list("verbs", ["ser", "estar"])
+    nouns = write_list("nouns", ["casa"])
+    dm = make_manager()
+    dm.update_progress(verbs, "ser", {"score": -2, "is_difficult": False})
+    assert dm.overview([verbs, nouns]) == (3, 25)
+
+    # edited behind the server's back: only that list is read again
+    write_list("verbs", ["ser", "estar", "ir", "ver"])
+    fresh = make_manager()
+    parsed = []
+    load = fresh.store.load_progress
+    monkeypatch.setattr(fresh.store, "load_progress", lambda list_path: parsed.append(list_path.stem) or load(list_path))
+    assert fresh.overview([verbs, nouns]) == (5, 12)
+    assert parsed == ["verbs"]
@@ -0,0 +1,27 @@
+def test_batches_of_a_previous_session_are_ignored(app, make_manager, write_list, monkeypatch):
+    list_path = write_list("verbs", ["ser", "estar", "ir"])
+    dm = make_manager()
+    session = app.st.session_state
+    session.clear()
+
+    monkeypatch.setattr(app, "DM", dm.for_user("ana"))
+    state = app.study_session(list_path)
+    session["study_component"] = {
+        "session": state["session"], "chunk": state["chunk"],
+        "events": [{"n": 1, "term": "ser", "grade": "unknown"}],
+    }
+    state = app.study_session(list_path)
+    assert state["acked"] == 1
+    assert dm.for_user("ana").load_progress(list_path)["ser"]["score"] == 2
+
+    # another student; the frame still holds ana's last batch, now with one more grade
+    session.pop("_study")
+    session["study_component"] = {
+        "session": state["session"], "chunk": state["chunk"],
+        "events": [{"n": 1, "term": "ser", "grade": "unknown"}, {"n": 2, "term": "estar", "grade": "unknown"}],
+    }
+    monkeypatch.setattr(app, "DM", dm.for_user("bob"))
+    state = app.study_session(list_path)
+    assert state["acked"] == 0
+    assert dm.for_user("bob").load_progress(list_path) == {}
+    session.clear()
@@ -0,0 +1,85 @@
+import threading
+
+import pytest
+
+
+def _in_thread(fn, timeout=10):
+    """Run fn on a thread; fail instead of hanging the suite if it deadlocks"""
+    errors = []
+
+    def run():
+        try:
+            fn()
+        except Exception as e:  # reported below
+            errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "deadlocked"
+    if errors:
+        raise errors[0]
+
+
+@pytest.mark.parametrize("storage", ["files", "sqlite"])
+def test_import_while_a_grade_is_pending(make_manager, write_list, storage):
+    write_list("verbs", ["ser", "estar"])
+    dm = make_manager(storage, write_behind_ms=60_000)
+    verbs = dm.get_list_file_path("verbs")
+    dm.update_progress(verbs, "ser", {"score": 4, "is_difficult": False})
+    assert dm._pending_progress(verbs)
+
+    # the write-behind thread flushing at the same time as the import
+    stop = threading.Event()
+
+    def flusher():
+        while not stop.is_set():
+            dm.flush_progress()
+            dm.update_progress(verbs, "estar", {"score": 1, "is_difficult": False})
+
+    background = threading.Thread(target=flusher, daemon=True)
+    background.start()
+    try:
+        for i in range(20):
+            _in_thread(lambda: dm.import_terms(dm.get_list_file_path(f"new{i}"), ["hola"], {"hola": "hello"}))
+    finally:
+        stop.set()
+        background.join(10)
+    assert not background.is_alive(), "deadlocked"
+
+    _in_thread(dm._writes.flush)  # what atexit runs
+    assert dm.load_terms_from_list_file(dm.get_list_file_path("new0")) == ["hola"]
+    assert dm.store.load_progress(verbs)["ser"]["score"] == 4
+
+
+def test_grades_of_one_card_coalesce_into_one_write(make_manager, write_list):
+    list_path = write_list("verbs", ["ser", "estar"])
+    dm = make_manager(write_behind_ms=60_000)
+    for score in (1, 2, 3):
+        dm.update_progress(list_path, "ser", {"score": score, "is_difficult": False})
+    dm.update_progress(list_path, "estar", {"score": -1, "is_difficult": True})
+
+    # served right away, written later
+    assert dm.get_term_progress(list_path, "ser")["score"] == 3
+    assert dm.calculate_progress(list_path)[2] == 2
+    assert dm.store.load_progress(list_path) == {}
+
+    dm.flush_progress(list_path)
+    assert dm._pending_progress(list_path) == {}
+    _, entries, _ = dm.store._journal_state(list_path)
+    progress = dm.store.load_progress(list_path)
+    assert entries == 2
+    assert progress["ser"]["score"] == 3 and progress["estar"]["is_difficult"] is True
+
+
+def test_queued_grades_are_written_at_exit(app, make_manager, write_list, monkeypatch):
+    at_exit = []
+    monkeypatch.setattr(app.atexit, "register", at_exit.append)
+    list_path = write_list("verbs", ["ser"])
+    dm = make_manager("sqlite", write_behind_ms=60_000)
+    dm.update_progress(list_path, "ser", {"score": 4, "is_difficult": False})
+    assert dm.store.load_progress(list_path) == {}
+
+    assert dm._writes.flush in at_exit
+    _in_thread(dm._writes.flush)
+    assert dm.store.load_progress(list_path)["ser"]["score"] == 4